@@ -7,13 +7,14 @@ import warnings
 import click
 
 from checkQC.qc_engine import QCEngine
-from checkQC.config import ConfigFactory
+from checkQC.config import Config, ConfigFactory
 from checkQC.run_type_recognizer import RunTypeRecognizer
 from checkQC.run_type_summarizer import RunTypeSummarizer
 from checkQC.exceptions import CheckQCException, RunfolderNotFoundError
 from checkQC import __version__ as checkqc_version
 from checkQC.qc_data import QCData
 from checkQC.qc_reporter import QCReporter
+from checkQC.profiler import Profiler
 
 
 SUPPORTED_DEMUXERS = [
@@ -60,6 +61,29 @@ log = logging.getLogger(__name__)
     default="bcl2fastq",
     help="Specify which demultiplexer was used to generate the data",
 )
+@click.option(
+    "--parser-workers",
+    type=click.IntRange(min=1), default=None,
+    help="Run up to this many parsers concurrently (only used when the demultiplexer is bcl2fastq)",
+)
+@click.option(
+    "--parser-executor",
+    type=click.Choice(["thread", "process"]),
+    default="thread",
+    help="Run the CPU-bound parsers (InterOp) in a pool of threads or processes, used together with --parser-workers",
+)
+@click.option(
+    "--fail-fast",
+    is_flag=True, default=False,
+    help="Stop at the first fatal qc error, running the cheapest checks first",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Record the time and memory used by each stage of the run, add it to the output and write it as json "
+         "to this file",
+)
 @click.version_option(checkqc_version)
 @click.argument(
     "runfolder",
@@ -71,6 +95,10 @@ def start(
     downgrade_errors,
     use_closest_read_length,
     demultiplexer,
+    parser_workers,
+    parser_executor,
+    fail_fast,
+    profile,
     runfolder,
 ):
     """
@@ -85,6 +113,8 @@ def start(
     if json_mode:
         warnings.warn("`--json` is being deprecated in favor of custom views and only works when the demultiplexer is bcl2fastq.", DeprecationWarning)
 
+    profiler = Profiler() if profile else None
+
     if demultiplexer == 'bcl2fastq':
         app = App(
             runfolder,
@@ -92,8 +122,15 @@ def start(
             json_mode,
             downgrade_errors,
             use_closest_read_length,
+            parser_workers=parser_workers,
+            parser_executor=parser_executor,
+            fail_fast=fail_fast,
+            profiler=profiler,
         )
         app.run()
+        if profiler:
+            profiler.stop()
+            profiler.write(profile)
         sys.exit(app.exit_status)
     else:
         log.info("------------------------")
@@ -107,6 +144,8 @@ def start(
             downgrade_errors,
             use_closest_read_length,
             demultiplexer,
+            fail_fast=fail_fast,
+            profiler=profiler,
         )
 
         if exit_status == 0:
@@ -116,6 +155,10 @@ def start(
 
         print(reports)
 
+        if profiler:
+            profiler.stop()
+            profiler.write(profile)
+
         sys.exit(exit_status)
 
 
@@ -125,28 +168,53 @@ def run_new_checkqc(
     downgrade_errors_for,
     use_closest_read_length,
     demultiplexer,
+    fail_fast=False,
+    profiler=None,
 ):
     runfolder_path = Path(runfolder_path)
     assert runfolder_path.is_dir()
+    profiler = profiler or Profiler.disabled()
 
-    config = ConfigFactory.from_config_path(config)._config
+    with profiler.stage("config"):
+        if not isinstance(config, Config):
+            config = ConfigFactory.from_config_path(config)
+        config = config._config
+    qc_reporter = QCReporter(config)
 
-    qc_data_constructor = getattr(QCData, f"from_{demultiplexer}")
-    qc_data = qc_data_constructor(
-        runfolder_path=runfolder_path,
-        parser_config=(
-            config
-            .get("parser_configurations", {})
-            .get(f"from_{demultiplexer}", {})
-        ),
+    # Knowing which checkers will run allows the QCData constructor to skip
+    # loading data that none of them needs.
+    with profiler.stage("run_type_recognition"):
+        run_type_recognizer = RunTypeRecognizer(runfolder_path)
+        instrument = run_type_recognizer.instrument_and_reagent_version()
+        # NOTE: For now, only symetric read length is supported
+        read_length = int(run_type_recognizer.read_length().split("-")[0])
+    checkers = qc_reporter.select_checkers(
+        instrument,
+        read_length,
+        use_closest_read_len=use_closest_read_length,
     )
 
-    qc_reporter = QCReporter(config)
+    # The sections of the sequencing metrics are computed on demand, the
+    # time spent computing them is therefore part of the checker stages.
+    qc_data_constructor = getattr(QCData, f"from_{demultiplexer}")
+    with profiler.stage("qc_data"):
+        qc_data = qc_data_constructor(
+            runfolder_path=runfolder_path,
+            parser_config=(
+                config
+                .get("parser_configurations", {})
+                .get(f"from_{demultiplexer}", {})
+            ),
+            checkers=checkers,
+            load_on_demand=fail_fast,
+        )
 
     exit_status, reports = qc_reporter.gather_reports(
         qc_data,
         use_closest_read_len=use_closest_read_length,
         downgrade_errors_for=downgrade_errors_for,
+        fail_fast=fail_fast,
+        profiler=profiler,
     )
 
     return exit_status, reports
@@ -164,12 +232,22 @@ class App(object):
         json_mode=False,
         downgrade_errors_for=(),
         use_closest_read_length=False,
+        parser_workers=None,
+        parser_executor="thread",
+        fail_fast=False,
+        profiler=None,
+        config=None,
     ):
         self._runfolder = runfolder
         self._config_file = config_file
+        self._config = config
         self._json_mode = json_mode
         self._downgrade_errors_for = downgrade_errors_for
         self._use_closest_read_length = use_closest_read_length
+        self._parser_workers = parser_workers
+        self._parser_executor = parser_executor
+        self._fail_fast = fail_fast
+        self._profiler = profiler or Profiler.disabled()
         self.exit_status = 0
 
     def configure_and_run(self):
@@ -179,18 +257,20 @@ class App(object):
 
         :returns: The reports of the application as a dict
         """
-        config = ConfigFactory.from_config_path(self._config_file)
+        with self._profiler.stage("config"):
+            config = self._config or ConfigFactory.from_config_path(self._config_file)
         parser_configurations = config.get("parser_configurations", None)
 
         if not Path(self._runfolder).is_dir():
             raise RunfolderNotFoundError("Could not find runfolder: {}. Are you "
                                          "sure the path is correct?".format(self._runfolder))
 
-        run_type_recognizer = RunTypeRecognizer(runfolder=self._runfolder)
-        instrument_and_reagent_version = run_type_recognizer.instrument_and_reagent_version()
+        with self._profiler.stage("run_type_recognition"):
+            run_type_recognizer = RunTypeRecognizer(runfolder=self._runfolder)
+            instrument_and_reagent_version = run_type_recognizer.instrument_and_reagent_version()
 
-        # TODO For now assume symmetric read lengths
-        both_read_lengths = run_type_recognizer.read_length()
+            # TODO For now assume symmetric read lengths
+            both_read_lengths = run_type_recognizer.read_length()
         read_length = int(both_read_lengths.split("-")[0])
         handler_config = config.get_handler_configs(instrument_and_reagent_version, read_length,
                                                     self._downgrade_errors_for, self._use_closest_read_length)
@@ -199,9 +279,15 @@ class App(object):
 
         qc_engine = QCEngine(runfolder=self._runfolder,
                              parser_configurations=parser_configurations,
-                             handler_config=handler_config)
+                             handler_config=handler_config,
+                             parser_workers=self._parser_workers,
+                             parser_executor=self._parser_executor,
+                             fail_fast=self._fail_fast,
+                             profiler=self._profiler)
         reports = qc_engine.run()
         reports["run_summary"] = run_type_summary
+        if self._profiler.enabled:
+            reports["profile"] = self._profiler.as_dict()
         self.exit_status = qc_engine.exit_status
         return reports
 
@@ -59,3 +59,7 @@ class ConfigEntryMissing(ConfigurationError):
 
 class RunfolderNotFoundError(CheckQCException):
     pass
+
+
+class QCQueueFullError(CheckQCException):
+    pass
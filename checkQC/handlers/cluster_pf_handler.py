@@ -21,6 +21,9 @@ class ClusterPFHandler(QCHandler):
         """
         return StatsJsonParser
 
+    def subscribed_keys(self):
+        return ["ConversionResults"]
+
     def collect(self, signal):
         key, value = signal
         if key == "ConversionResults":
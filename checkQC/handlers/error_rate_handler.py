@@ -26,6 +26,9 @@ class ErrorRateHandler(QCHandler):
         """
         return InteropParser
 
+    def subscribed_keys(self):
+        return ["error_rate"]
+
     def collect(self, signal):
         key, value = signal
         if key == "error_rate":
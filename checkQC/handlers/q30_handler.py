@@ -21,6 +21,9 @@ class Q30Handler(QCHandler):
         """
         return InteropParser
 
+    def subscribed_keys(self):
+        return ["percent_q30"]
+
     def collect(self, signal):
         key, value = signal
         if key == "percent_q30":
@@ -124,6 +124,21 @@ class Subscriber(object):
         """
         raise NotImplementedError("Implementing class must provide this method.")
 
+    def subscribed_keys(self):
+        """
+        The keys of the signals which this Subscriber will make use of. Parsers can use this to avoid
+        loading and computing data that no subscriber is interested in. Override this in the implementing
+        subclass, e.g.
+
+        .. code-block :: python
+
+            def subscribed_keys(self):
+                return ["my_key"]
+
+        :returns: a collection of signal keys, or None if the Subscriber wants to receive all signals
+        """
+        return None
+
     def send(self, value):
         """
         Will send the specified value to the subscriber
@@ -133,6 +148,22 @@ class Subscriber(object):
         """
         self.subscriber.send(value)
 
+    def send_batch(self, key, values):
+        """
+        Will send a number of signals with the same key to the subscriber, one at a time through `send`, so
+        that they reach `subscribe` just as signals sent one by one would.
+
+        Note that parsers sending batches (e.g. the InteropParser) send all signals with one key before the
+        signals with the next key, e.g. all "error_rate" signals before any "percent_q30" signal, where they
+        used to be interleaved by lane and read. Subscribers should not depend on the order between keys.
+
+        :param key: the key of the signals
+        :param values: list of the data of the signals
+        :returns: None
+        """
+        for value in values:
+            self.send((key, value))
+
 
 class QCHandler(Subscriber):
     """
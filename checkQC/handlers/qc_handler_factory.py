@@ -1,6 +1,8 @@
 
 import importlib
+import importlib.metadata
 import pkgutil
+import threading
 
 import checkQC.handlers
 from checkQC.handlers.qc_handler import QCHandler
@@ -12,28 +14,101 @@ class QCHandlerFactory(object):
     This class provides way of finding and instantiating a concrete QCHandler implementation.
     This allows QCHandlers to be instantiated dynamically at runtime e.g. based on what is
     specified in a config file.
+
+    The QCHandlers in the `checkQC.handlers` module are found the first time a handler is requested, and are
+    then kept in a registry shared by all instances. QCHandlers provided by other packages can be registered
+    through the `checkQC.handlers` entry point group, e.g. in setup.py:
+
+    .. code-block :: python
+
+        entry_points={
+            'checkQC.handlers': ['my_package.MyHandler = my_package.my_module:MyHandler']
+        }
+
+    The configuration schema only accepts the names of the built-in handlers, and names namespaced by a package
+    like the one above.
+
+    These are only imported if a configuration asks for a handler with that name. Names which could not be
+    found are remembered as well, so that they are not looked up again until `clear_registry` is called.
     """
 
+    ENTRY_POINT_GROUP = "checkQC.handlers"
+
+    _registry = None
+    _not_found = set()
+    _registry_lock = threading.Lock()
+
     @staticmethod
     def create_subclass_instance(class_name, class_config):
         """
-        This method will look for a class with the given `class_name` in the `checkQC.handlers` module.
-        If it can find a class with a matching name it will return a instance of that class.
+        This method will look for a class with the given `class_name` in the `checkQC.handlers` module,
+        or among the QCHandlers registered as entry points. If it can find a class with a matching name
+        it will return a instance of that class.
 
         :param class_name: the name of the class to instantiate
         :param class_config: dictionary with configuration for the class
         :returns: A instance of the class represented by class_name
         """
+        return QCHandlerFactory.get_handler_class(class_name)(qc_config=class_config)
+
+    @classmethod
+    def get_handler_class(cls, class_name):
+        """
+        Find the QCHandler class with the given name
+
+        :param class_name: the name of the class
+        :returns: the QCHandler subclass
+        :raises: QCHandlerNotFound if there is no QCHandler with that name
+        """
+        with cls._registry_lock:
+            if cls._registry is None:
+                cls._registry = {}
+                cls._not_found = set()
+                cls._import_handler_modules()
+                cls._register_subclasses()
+
+            if class_name not in cls._registry and class_name not in cls._not_found:
+                # The handler might have been defined after the registry was built
+                cls._register_subclasses()
+
+                if class_name not in cls._registry:
+                    handler_class = cls._load_entry_point(class_name)
+                    if handler_class:
+                        cls._registry[class_name] = handler_class
+                    else:
+                        cls._not_found.add(class_name)
+
+            try:
+                return cls._registry[class_name]
+            except KeyError:
+                raise QCHandlerNotFound("Could not identify a QCHandler with name: {}".format(class_name))
+
+    @classmethod
+    def clear_registry(cls):
+        """
+        Forget all QCHandlers found so far, they will be looked up again on the next request
+        """
+        with cls._registry_lock:
+            cls._registry = None
+            cls._not_found = set()
+
+    @staticmethod
+    def _import_handler_modules():
         package = checkQC.handlers
         prefix = package.__name__ + "."
 
-        modules = list(pkgutil.iter_modules(package.__path__, prefix))
-        for importer, modname, ispkg in modules:
+        for importer, modname, ispkg in pkgutil.iter_modules(package.__path__, prefix):
             importlib.import_module(modname)
-        qc_handler_subclasses = list(QCHandler.__subclasses__())
-        try:
-            i = list(map(lambda clazz: clazz.__name__, qc_handler_subclasses)).index(class_name)
-            return qc_handler_subclasses[i](qc_config=class_config)
-        except ValueError:
-            raise QCHandlerNotFound("Could not identify a QCHandler with name: {}".format(class_name))
 
+    @classmethod
+    def _register_subclasses(cls):
+        for handler_class in QCHandler.__subclasses__():
+            cls._registry.setdefault(handler_class.__name__, handler_class)
+
+    @classmethod
+    def _load_entry_point(cls, class_name):
+        for entry_point in importlib.metadata.entry_points(group=cls.ENTRY_POINT_GROUP, name=class_name):
+            handler_class = entry_point.load()
+            if isinstance(handler_class, type) and issubclass(handler_class, QCHandler):
+                return handler_class
+        return None
@@ -23,6 +23,9 @@ class ReadsPerSampleHandler(QCHandler):
         """
         return StatsJsonParser
 
+    def subscribed_keys(self):
+        return ["ConversionResults"]
+
     def collect(self, signal):
         key, value = signal
         if key == "ConversionResults":
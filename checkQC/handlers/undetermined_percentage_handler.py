@@ -26,6 +26,9 @@ class UndeterminedPercentageHandler(QCHandler):
         """
         return [StatsJsonParser, InteropParser]
 
+    def subscribed_keys(self):
+        return ["ConversionResults", "percent_phix"]
+
     def collect(self, signal):
         key, value = signal
         if key == "ConversionResults":
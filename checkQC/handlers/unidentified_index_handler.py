@@ -55,6 +55,9 @@ class UnidentifiedIndexHandler(QCHandler):
         """
         return [DemuxSummaryParser, StatsJsonParser, SamplesheetParser]
 
+    def subscribed_keys(self):
+        return ["ConversionResults", "samplesheet", "index_counts"]
+
     def collect(self, signal):
         key, value = signal
         if key == "ConversionResults":
@@ -303,6 +306,7 @@ class _SamplesheetSearcher(object):
 
     def __init__(self, samplesheet):
         self.samplesheet_dict = self.transform_samplesheet_to_dict(samplesheet)
+        self.component_dict = self.transform_samplesheet_dict_to_component_dict(self.samplesheet_dict)
 
     @staticmethod
     def transform_samplesheet_to_dict(samplesheet):
@@ -324,6 +328,21 @@ class _SamplesheetSearcher(object):
 
         return samplesheet_dict
 
+    @staticmethod
+    def transform_samplesheet_dict_to_component_dict(samplesheet_dict):
+        """
+        Transform samplesheet dict to a dict on form {single index -> [samplesheet indexes]}, where the
+        samplesheet indexes are all the (possibly dual) indexes in which the single index is one of the components.
+        :param samplesheet_dict: as created by `transform_samplesheet_to_dict`
+        :return: dict of single index and samplesheet indexes
+        """
+        component_dict = defaultdict(list)
+        for samplesheet_index in samplesheet_dict:
+            for component in dict.fromkeys(samplesheet_index.split('+')):
+                component_dict[component].append(samplesheet_index)
+
+        return component_dict
+
     def exact_index_in_samplesheet(self, index):
         """
         Search the sample sheet dict for an index to find which lane and which sample
@@ -344,7 +363,6 @@ class _SamplesheetSearcher(object):
         :return:
         """
 
-        for samplesheet_index in self.samplesheet_dict.keys():
-            if index in set(samplesheet_index.split('+')):
-                for lane, sample in self.samplesheet_dict[samplesheet_index].items():
-                    yield _SamplesheetSearcher.SearchHit(index, sample, lane)
+        for samplesheet_index in self.component_dict.get(index, []):
+            for lane, sample in self.samplesheet_dict[samplesheet_index].items():
+                yield _SamplesheetSearcher.SearchHit(index, sample, lane)
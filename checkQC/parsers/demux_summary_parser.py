@@ -15,6 +15,8 @@ class DemuxSummaryParser(Parser):
      ("index_counts", {"lane": <lane nbr>, "indices": [<{"index": <index string>, "count": <nbr>}>]}
     """
 
+    signal_keys = ["index_counts"]
+
     def __init__(self, runfolder, parser_configurations, *args, **kwargs):
         """
         Create a DemuxSummaryParser instance for the specified runfolder
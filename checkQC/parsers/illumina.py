@@ -1,118 +1,108 @@
+import concurrent.futures
 import csv
+import errno
+import functools
+import heapq
+import math
+import os
 import pathlib
 
 import interop
+import numpy as np
+import pandas as pd
 from samshee.sectionedsheet import read_sectionedsheet
 
+from checkQC.exceptions import ConfigurationError
 from checkQC.run_type_recognizer import RunTypeRecognizer
+from checkQC.parsers.interop_parser import interop_metrics_to_load
+from checkQC.parsers.utils import LazySections
+
+
+# Interop metric groups needed by each QC checker, in addition to the tile
+# metrics which are always loaded.
+INTEROP_METRICS_PER_CHECKER = {
+    "cluster_pf": [],
+    "error_rate": ["Error"],
+    "q30": ["Q", "QByLane", "QCollapsed"],
+    "reads_per_sample": ["Index"],
+    "undetermined_percentage": [],
+    "unidentified_index": [],
+}
+
+
+# Sections of the sequencing metrics of each lane. They are computed on first
+# access, so that only the inputs which are actually used are read.
+LANE_SECTIONS = [
+    "total_reads_pf",
+    "total_reads",
+    "raw_density",
+    "pf_density",
+    "yield",
+    "yield_undetermined",
+    "top_unknown_barcodes",
+    "reads",
+    "reads_per_sample",
+]
 
 
 @classmethod
-def from_bclconvert(cls, runfolder_path, parser_config):
+def from_bclconvert(cls, runfolder_path, parser_config, checkers=None,
+                    load_on_demand=False):
+    """
+    Create QCData from a runfolder demultiplexed with bclconvert.
+
+    `checkers` is the configuration of the QC checkers which will be run,
+    keyed by checker name (see `QCReporter.select_checkers`). If given, only
+    the Interop metrics needed by those QC checkers are loaded (see
+    `INTEROP_METRICS_PER_CHECKER`), and only the unknown barcodes that
+    `unidentified_index` could find significant are kept. Sequencing metrics
+    which are not needed will then be missing or NaN.
+
+    The reports and InterOp metrics needed by the checkers are read here, so
+    that errors reading them are raised when QCData is created. The sections
+    of the sequencing metrics of each lane (see `LANE_SECTIONS`) are then
+    computed from them on first access and memoized, so that e.g. the
+    samples of a lane are only looked up if "reads_per_sample" is used.
+
+    If `load_on_demand` is set, the reports and the InterOp index summary are
+    instead only read when a section needing them is first accessed, and
+    errors reading them are raised then. This is used by fail-fast runs, so
+    that the inputs of the checkers which are skipped are never read.
+
+    The `top_unknown_barcodes_per_lane` parser configuration can be used to
+    only keep the N most common unknown barcodes of each lane. N must be at
+    least 1, or a ConfigurationError is raised.
+
+    If the `loader_workers` parser configuration is set, the InterOp files,
+    the reports needed by the checkers, the samplesheet and the run metadata
+    are read concurrently by a pool of that many threads.
+
+    Whether or not the reports are needed, a FileNotFoundError is raised if
+    any of them is missing, as when all reports were read up front.
+    """
     runfolder_path = pathlib.Path(runfolder_path)
     assert runfolder_path.is_dir()
 
-    summary, index_summary, run_info = _read_interop_summary(runfolder_path)
-    quality_metrics = _read_demultiplexing_metrics(
-        runfolder_path
-        / parser_config["reports_location"]
-        / "Quality_Metrics.csv"
-    )
-    top_unknown_barcodes = _read_demultiplexing_metrics(
-        runfolder_path
-        / parser_config["reports_location"]
-        / "Top_Unknown_Barcodes.csv"
-    )
+    inputs = _BclConvertInputs(runfolder_path, parser_config, checkers)
 
-    demultiplex_stats = _read_demultiplexing_metrics(
-        runfolder_path
-        / parser_config["reports_location"]
-        / "Demultiplex_Stats.csv"
-    )
-    samplesheet = _read_samplesheet(runfolder_path)
-
-    instrument, read_length = _read_run_metadata(runfolder_path)
+    if loader_workers := parser_config.get("loader_workers"):
+        samplesheet, (instrument, read_length) = _load_concurrently(
+            inputs, loader_workers, load_inputs=not load_on_demand)
+    else:
+        inputs.interop_metrics  # InterOp is read first, as it always was
+        inputs.check_reports()
+        if not load_on_demand:
+            for name in inputs.needed_inputs():
+                getattr(inputs, name)
+        samplesheet = _read_samplesheet(runfolder_path)
+        instrument, read_length = _read_run_metadata(runfolder_path)
 
     sequencing_metrics = {
-        lane + 1: {
-            "total_reads_pf": summary.at(0).at(lane).reads_pf(),
-            "total_reads": summary.at(0).at(lane).reads(),
-            "raw_density":summary.at(0).at(lane).density().mean(),
-            "pf_density":summary.at(0).at(lane).density_pf().mean(),
-            "yield": sum(
-                int(row["Yield"])
-                for row in quality_metrics
-                if row["Lane"] == str(lane + 1)
-            ),
-            "yield_undetermined": next(
-                int(row["Yield"])
-                for row in quality_metrics
-                if (
-                    row["Lane"] == str(lane + 1)
-                    and row["SampleID"] == "Undetermined"
-                )
-            ),
-            "top_unknown_barcodes": [
-                {
-                    "index": row["index"],
-                    "index2": row["index2"],
-                    "count": int(row["# Reads"]),
-                }
-                for row in top_unknown_barcodes
-                if row["Lane"] == str(lane + 1)
-            ],
-            "reads": {
-                i_read + 1: {
-                    "mean_error_rate": (
-                        lane_summary := summary.at(i_read).at(lane)
-                    ).error_rate().mean(),
-                    "percent_q30": lane_summary.percent_gt_q30(),
-                    "is_index": summary.at(i_read).read().is_index(),
-                    "mean_percent_phix_aligned": lane_summary.percent_aligned().mean()
-                }
-                for i_read in range(summary.size())
-            },
-            "reads_per_sample": [
-                {
-                    "sample_id": (
-                        sample_summary := index_summary.at(lane).at(sample_no)
-                    ).sample_id(),
-                    "cluster_count": sample_summary.cluster_count(),
-                    "percent_of_lane": next(
-                        round(float(sample_stat["% Reads"]) * 100, 2)
-                        for sample_stat in demultiplex_stats
-                        if sample_stat["Lane"] == str(lane + 1) and
-                        sample_stat["SampleID"] == sample_summary.sample_id()
-                    ),
-                    "percent_perfect_index_reads": next(
-                        round(float(sample_stat["% Perfect Index Reads"]) * 100, 2)
-                        for sample_stat in demultiplex_stats
-                        if sample_stat["Lane"] == str(lane + 1) and
-                        sample_stat["SampleID"] == sample_summary.sample_id()
-                    ),
-                    "mean_q30": next(
-                        float(row["Mean Quality Score (PF)"])
-                        for row in quality_metrics
-                        if (
-                            row["Lane"] == str(lane + 1)
-                            and row["SampleID"] == sample_summary.sample_id()
-                        )
-                    ),
-                    "percent_q30": next(
-                        float(row["% Q30"]) * 100
-                        for row in quality_metrics
-                        if (
-                            row["Lane"] == str(lane + 1)
-                            and row["SampleID"] == sample_summary.sample_id()
-                        )
-                    )
-
-
-                }
-                for sample_no in range(index_summary.at(lane).size())
-            ],
-        }
-        for lane in range(summary.lane_count())
+        lane + 1: LazySections(
+            LANE_SECTIONS,
+            functools.partial(inputs.lane_section, lane + 1),
+        )
+        for lane in range(inputs.summary.lane_count())
     }
 
     return cls(
@@ -123,10 +113,306 @@ def from_bclconvert(cls, runfolder_path, parser_config):
     )
 
 
-def _read_interop_summary(runfolder_path):
+def _load_concurrently(inputs, max_workers, load_inputs=True):
+    """
+    Read the independent inputs of a runfolder with a pool of threads.
+    Errors are raised in the same order as if the inputs had been read one
+    after another.
+
+    :param inputs: the _BclConvertInputs to load
+    :param max_workers: number of threads
+    :param load_inputs: if False, the inputs needed by the checkers are left
+                        to be read on demand
+    :returns: the samplesheet and the run metadata (instrument, read length)
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        interop_future = executor.submit(lambda: inputs.summary)
+
+        def load_input(name):
+            if name in _BclConvertInputs.INTEROP_DEPENDENT_INPUTS:
+                interop_future.result()
+            return getattr(inputs, name)
+
+        samplesheet_future = executor.submit(
+            _read_samplesheet, inputs.runfolder_path)
+        run_metadata_future = executor.submit(
+            _read_run_metadata, inputs.runfolder_path)
+        futures = (
+            [interop_future, executor.submit(inputs.check_reports)]
+            + [
+                executor.submit(load_input, name)
+                for name in (inputs.needed_inputs() if load_inputs else [])
+            ]
+            + [samplesheet_future, run_metadata_future]
+        )
+
+        for future in futures:
+            future.result()
+
+        return samplesheet_future.result(), run_metadata_future.result()
+
+
+class _BclConvertInputs:
+    """
+    The inputs of a runfolder demultiplexed with bclconvert. Each input is
+    read on first access and then cached.
+    """
+
+    # All inputs, in the order they have always been read.
+    INPUTS = [
+        "index_summary", "quality_metrics", "top_unknown_barcodes",
+        "demultiplex_stats"]
+
+    # Inputs needed by each QC checker, besides the InterOp run summary.
+    INPUTS_PER_CHECKER = {
+        "cluster_pf": [],
+        "error_rate": [],
+        "q30": [],
+        "reads_per_sample": [
+            "index_summary", "quality_metrics", "demultiplex_stats"],
+        "undetermined_percentage": ["quality_metrics"],
+        "unidentified_index": ["top_unknown_barcodes"],
+    }
+    INTEROP_DEPENDENT_INPUTS = {"index_summary", "top_unknown_barcodes"}
+    # Reports which must exist, in the order they have always been read.
+    REPORTS = [
+        "Quality_Metrics.csv", "Top_Unknown_Barcodes.csv", "Demultiplex_Stats.csv"]
+
+    def __init__(self, runfolder_path, parser_config, checkers):
+        self.runfolder_path = runfolder_path
+        self.reports_path = runfolder_path / parser_config["reports_location"]
+        self.top_n_unknown_barcodes = parser_config.get("top_unknown_barcodes_per_lane")
+        if self.top_n_unknown_barcodes is not None and (
+                not isinstance(self.top_n_unknown_barcodes, int)
+                or isinstance(self.top_n_unknown_barcodes, bool)
+                or self.top_n_unknown_barcodes < 1):
+            raise ConfigurationError(
+                "top_unknown_barcodes_per_lane must be an integer of at least "
+                f"1, got: {self.top_n_unknown_barcodes!r}")
+        self.checkers = checkers
+
+    def needed_inputs(self):
+        """
+        List the inputs needed by the checkers, or all inputs if the
+        checkers are unknown.
+        """
+        if self.checkers is None or any(
+                checker not in self.INPUTS_PER_CHECKER for checker in self.checkers):
+            checkers = self.INPUTS_PER_CHECKER
+        else:
+            checkers = self.checkers
+
+        needed = {
+            name
+            for checker in checkers
+            for name in self.INPUTS_PER_CHECKER[checker]
+        }
+        return [name for name in self.INPUTS if name in needed]
+
+    def check_reports(self):
+        """
+        Raise a FileNotFoundError if any of the `REPORTS` is missing.
+        """
+        for report in self.REPORTS:
+            report_path = self.reports_path / report
+            if not report_path.exists():
+                raise FileNotFoundError(
+                    errno.ENOENT, os.strerror(errno.ENOENT), str(report_path))
+
+    @functools.cached_property
+    def interop_metrics(self):
+        run_metrics, summary, _ = _read_interop_metrics(
+            self.runfolder_path,
+            _interop_metric_groups(self.checkers),
+        )
+        return run_metrics, summary
+
+    @property
+    def summary(self):
+        return self.interop_metrics[1]
+
+    @property
+    def index_metrics_loaded(self):
+        """
+        Whether the InterOp index metrics are loaded, i.e. whether any of the
+        checkers needs them.
+        """
+        metric_groups = _interop_metric_groups(self.checkers)
+        return metric_groups is None or "Index" in metric_groups
+
+    @functools.cached_property
+    def index_summary(self):
+        index_summary = _summarize_index_metrics(self.interop_metrics[0])
+        # Missing index metrics raise an index_out_of_bounds_exception, as
+        # when the index summary of every lane was read up front.
+        for lane in range(self.summary.lane_count()):
+            index_summary.at(lane)
+        return index_summary
+
+    @functools.cached_property
+    def quality_metrics(self):
+        return _read_demultiplexing_metrics_columns(
+            self.reports_path / "Quality_Metrics.csv",
+            {
+                "Lane": "int64",
+                "SampleID": "str",
+                "Yield": "int64",
+                "Mean Quality Score (PF)": "float64",
+                "% Q30": "float64",
+            },
+        )
+
+    @functools.cached_property
+    def quality_metrics_per_sample(self):
+        return _first_row_per_lane_and_sample(self.quality_metrics)
+
+    @functools.cached_property
+    def yield_per_lane(self):
+        return _sum_per_lane(
+            self.quality_metrics["Lane"], self.quality_metrics["Yield"])
+
+    @functools.cached_property
+    def demultiplex_stats(self):
+        return _read_demultiplexing_metrics_columns(
+            self.reports_path / "Demultiplex_Stats.csv",
+            {
+                "Lane": "int64",
+                "SampleID": "str",
+                "% Reads": "float64",
+                "% Perfect Index Reads": "float64",
+            },
+        )
+
+    @functools.cached_property
+    def demultiplex_stats_per_sample(self):
+        return _first_row_per_lane_and_sample(self.demultiplex_stats)
+
+    @functools.cached_property
+    def top_unknown_barcodes(self):
+        return _read_top_unknown_barcodes(
+            self.reports_path / "Top_Unknown_Barcodes.csv",
+            min_count_per_lane=_min_unknown_barcode_count_per_lane(
+                self.summary, self.checkers),
+            top_n=self.top_n_unknown_barcodes,
+        )
+
+    def lane_section(self, lane, section):
+        """
+        Compute a section of the sequencing metrics of a lane.
+
+        :param lane: lane number, starting at 1
+        :param section: one of `LANE_SECTIONS`
+        """
+        lane_summary = self.summary.at(0).at(lane - 1)
+
+        match section:
+            case "total_reads_pf":
+                return lane_summary.reads_pf()
+            case "total_reads":
+                return lane_summary.reads()
+            case "raw_density":
+                return lane_summary.density().mean()
+            case "pf_density":
+                return lane_summary.density_pf().mean()
+            case "yield":
+                return self.yield_per_lane.get(lane, 0)
+            case "yield_undetermined":
+                return int(self.quality_metrics["Yield"][
+                    self.quality_metrics_per_sample[(lane, "Undetermined")]
+                ])
+            case "top_unknown_barcodes":
+                return self.top_unknown_barcodes.get(lane, [])
+            case "reads":
+                return self._lane_reads(lane)
+            case "reads_per_sample":
+                return self._lane_reads_per_sample(lane)
+            case _:
+                raise KeyError(section)
+
+    def _lane_reads(self, lane):
+        return {
+            i_read + 1: {
+                "mean_error_rate": (
+                    lane_summary := self.summary.at(i_read).at(lane - 1)
+                ).error_rate().mean(),
+                "percent_q30": lane_summary.percent_gt_q30(),
+                "is_index": self.summary.at(i_read).read().is_index(),
+                "mean_percent_phix_aligned": lane_summary.percent_aligned().mean()
+            }
+            for i_read in range(self.summary.size())
+        }
+
+    def _lane_reads_per_sample(self, lane):
+        if not self.index_metrics_loaded:
+            return []
+
+        demultiplex_stats = self.demultiplex_stats
+        quality_metrics = self.quality_metrics
+
+        return [
+            {
+                "sample_id": (
+                    sample_summary := self.index_summary.at(lane - 1).at(sample_no)
+                ).sample_id(),
+                "cluster_count": sample_summary.cluster_count(),
+                "percent_of_lane": round(float(demultiplex_stats["% Reads"][
+                    (sample_stat := self.demultiplex_stats_per_sample[
+                        (lane, sample_summary.sample_id())
+                    ])
+                ]) * 100, 2),
+                "percent_perfect_index_reads": round(float(
+                    demultiplex_stats["% Perfect Index Reads"][sample_stat]
+                ) * 100, 2),
+                "mean_q30": float(quality_metrics["Mean Quality Score (PF)"][
+                    (sample_quality := self.quality_metrics_per_sample[
+                        (lane, sample_summary.sample_id())
+                    ])
+                ]),
+                "percent_q30": float(quality_metrics["% Q30"][sample_quality]) * 100,
+            }
+            for sample_no in range(self.index_summary.at(lane - 1).size())
+        ]
+
+
+def _interop_metric_groups(checkers):
+    """
+    List the Interop metric groups needed by the given QC checkers. Returns
+    None, i.e. all metric groups, if checkers is None or if any of the
+    checkers is not listed in `INTEROP_METRICS_PER_CHECKER`.
+    """
+    if checkers is None:
+        return None
+
+    metric_groups = []
+    for checker in checkers:
+        if checker not in INTEROP_METRICS_PER_CHECKER:
+            return None
+        metric_groups.extend(INTEROP_METRICS_PER_CHECKER[checker])
+
+    return metric_groups
+
+
+def _read_interop_summary(runfolder_path, metric_groups=None):
     """
     Read interop files and return interop objects for run_summary and index
     summary.
+
+    Only the given metric groups are loaded, or all of them if metric_groups
+    is None.
+    """
+    run_metrics, run_summary, run_info = _read_interop_metrics(
+        runfolder_path, metric_groups)
+
+    return run_summary, _summarize_index_metrics(run_metrics), run_info
+
+
+def _read_interop_metrics(runfolder_path, metric_groups=None):
+    """
+    Read interop files and return the interop run_metrics, together with
+    the run_summary and run_info computed from them.
+
+    Only the given metric groups are loaded, or all of them if metric_groups
+    is None.
     """
 
     runfolder_path = str(runfolder_path)  # interop does not handle Path objects
@@ -135,15 +421,22 @@ def _read_interop_summary(runfolder_path):
     run_info.read(runfolder_path)
 
     run_metrics = interop.py_interop_run_metrics.run_metrics()
-    run_metrics.read(runfolder_path)
+    run_metrics.read(runfolder_path, interop_metrics_to_load(metric_groups))
 
     run_summary = interop.py_interop_summary.run_summary()
     interop.py_interop_summary.summarize_run_metrics(run_metrics, run_summary)
 
+    return run_metrics, run_summary, run_info
+
+
+def _summarize_index_metrics(run_metrics):
+    """
+    Compute the interop index summary from run_metrics.
+    """
     index_summary = interop.py_interop_summary.index_flowcell_summary()
     interop.py_interop_summary.summarize_index_metrics(run_metrics, index_summary)
 
-    return run_summary, index_summary, run_info
+    return index_summary
 
 
 def _read_demultiplexing_metrics(metrics_path):
@@ -154,6 +447,148 @@ def _read_demultiplexing_metrics(metrics_path):
         return list(csv.DictReader(csvfile))
     
 
+def _read_demultiplexing_metrics_columns(metrics_path, columns):
+    """
+    Read the given columns of a demultiplexing metrics file into NumPy
+    arrays. Missing values (e.g. "NaN" or empty cells) of float columns are
+    read as NaN, while string columns are kept as they are written.
+
+    :param metrics_path: path to the csv file
+    :param columns: dict of column name -> dtype, e.g. {"Lane": "int64"}
+    :returns: dict of column name -> NumPy array
+    :raises KeyError: if a column is missing, as csv.DictReader rows would
+    """
+    metrics = pd.read_csv(
+        metrics_path,
+        usecols=lambda column: column in columns,
+        dtype={
+            column: dtype
+            for column, dtype in columns.items()
+            if dtype != "str"
+        },
+        converters={
+            column: str
+            for column, dtype in columns.items()
+            if dtype == "str"
+        },
+        float_precision="round_trip",
+        encoding="utf-8",
+    )
+    for column in columns:
+        if column not in metrics:
+            raise KeyError(column)
+    return {
+        column: metrics[column].to_numpy()
+        for column in columns
+    }
+
+
+def _sum_per_lane(lanes, values):
+    """
+    Sum values per lane in one grouped reduction.
+
+    :returns: dict of lane -> sum
+    """
+    unique_lanes, lane_index = np.unique(lanes, return_inverse=True)
+    sums = np.zeros(len(unique_lanes), dtype=values.dtype)
+    np.add.at(sums, lane_index, values)
+    return dict(zip(unique_lanes.tolist(), sums.tolist()))
+
+
+def _first_row_per_lane_and_sample(metrics):
+    """
+    Map (Lane, SampleID) to the index of the first row with that key in
+    columnar demultiplexing metrics. If several rows share the same key
+    (e.g. one per read), the first one is kept.
+    """
+    rows_per_sample = {}
+    for i, key in enumerate(zip(
+            metrics["Lane"].tolist(), metrics["SampleID"].tolist())):
+        rows_per_sample.setdefault(key, i)
+    return rows_per_sample
+
+
+def _min_unknown_barcode_count_per_lane(summary, checkers):
+    """
+    Compute the lowest read count an unknown barcode can have on each lane
+    and still be significant to the `unidentified_index` checker.
+
+    :returns: dict of lane -> count, or None if all barcodes should be kept
+    """
+    if checkers is None:
+        return None
+
+    if "unidentified_index" not in checkers:
+        return {
+            lane + 1: math.inf
+            for lane in range(summary.lane_count())
+        }
+
+    significance_threshold = checkers["unidentified_index"]["significance_threshold"]
+    return {
+        lane + 1: math.floor(
+            summary.at(0).at(lane).reads_pf() * significance_threshold / 100.
+        )
+        for lane in range(summary.lane_count())
+    }
+
+
+def _read_top_unknown_barcodes(metrics_path, min_count_per_lane=None, top_n=None):
+    """
+    Stream Top_Unknown_Barcodes.csv and group the barcodes by lane.
+
+    :param metrics_path: path to Top_Unknown_Barcodes.csv
+    :param min_count_per_lane: dict of lane -> minimum read count. Barcodes
+                               with fewer reads are skipped without being
+                               stored.
+    :param top_n: only keep the top_n barcodes with the most reads on each lane
+    :returns: dict of lane -> list of barcodes with keys "index", "index2" and
+              "count", sorted as in the file, or by count if top_n is given
+    """
+    barcodes_per_lane = {}
+    with open(metrics_path, encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile)
+        header = next(reader)
+        lane_col = header.index("Lane")
+        index_col = header.index("index")
+        index2_col = header.index("index2")
+        count_col = header.index("# Reads")
+
+        for row_nbr, row in enumerate(reader):
+            lane = int(row[lane_col])
+            count = int(row[count_col])
+            if min_count_per_lane and count < min_count_per_lane.get(lane, 0):
+                continue
+
+            barcode = {
+                "index": row[index_col],
+                "index2": row[index2_col],
+                "count": count,
+            }
+            lane_barcodes = barcodes_per_lane.setdefault(lane, [])
+            if top_n is None:
+                lane_barcodes.append(barcode)
+            else:
+                # Bounded min-heap on (count, -row_nbr), so that for equal
+                # counts the barcodes appearing first in the file are kept.
+                item = (count, -row_nbr, barcode)
+                if len(lane_barcodes) < top_n:
+                    heapq.heappush(lane_barcodes, item)
+                elif item[:2] > lane_barcodes[0][:2]:
+                    heapq.heapreplace(lane_barcodes, item)
+
+    if top_n is not None:
+        barcodes_per_lane = {
+            lane: [
+                barcode
+                for _, _, barcode in sorted(lane_barcodes, key=lambda item: item[:2], reverse=True)
+            ]
+            for lane, lane_barcodes in barcodes_per_lane.items()
+        }
+
+    return barcodes_per_lane
+
+
 def _read_run_metadata(runfolder_path):
     """
     Read intrument, reagent and read_length
@@ -9,6 +9,26 @@ import math
 import numpy
 
 
+def interop_metrics_to_load(metric_groups):
+    """
+    Create a vector for the `valid_to_load` argument of the Interop
+    `run_metrics.read` method, which will load only the given metric groups.
+    Tile metrics are always loaded, since the run summary can not be computed
+    without them.
+
+    :param metric_groups: names of Interop metric groups, e.g. ["Error", "Q"],
+    or None to load all metric groups
+    :returns: a py_interop_run.uchar_vector
+    """
+    if metric_groups is None:
+        return py_interop_run.uchar_vector(py_interop_run.MetricCount, 1)
+
+    valid_to_load = py_interop_run.uchar_vector(py_interop_run.MetricCount, 0)
+    for metric_group in set(metric_groups) | {"Tile"}:
+        valid_to_load[getattr(py_interop_run, metric_group)] = 1
+    return valid_to_load
+
+
 class InteropParser(Parser):
     """
     This Parser will get data from the Illumina Interop binary files, 
@@ -34,8 +54,26 @@ class InteropParser(Parser):
                                            ...,
                                            n: <q30 cycle n>}})
 
+    Each kind of signal is sent as one batch, covering all lanes and reads, in
+    the order of `signal_keys`. All "error_rate" signals are therefore sent
+    before the first "percent_q30" signal.
+
+    The per cycle %Q30 requires loading the per tile Q-metrics, so it is only
+    computed and sent if at least one subscriber consumes it (see
+    `Subscriber.subscribed_keys`). In the same way, only the Interop metric
+    groups listed in `METRICS_PER_SIGNAL` for the consumed signals are read.
     """
 
+    signal_keys = ["error_rate", "percent_q30", "percent_phix", "percent_q30_per_cycle"]
+    can_run_in_process = True
+    cost = 3
+
+    METRICS_PER_SIGNAL = {
+        "error_rate": ["Error"],
+        "percent_q30": ["Q", "QByLane", "QCollapsed"],
+        "percent_phix": ["Tile"],
+    }
+
     def __init__(self, 
                  runfolder, 
                  parser_configurations, 
@@ -98,87 +136,162 @@ class InteropParser(Parser):
         :returns: {int: float}
         """
 
+        index_reads = [read_nr] if is_index_read else []
+        return InteropParser.get_percent_q30_per_cycle_for_all_reads(
+            q_metrics,
+            index_reads,
+        ).get((lane_nr, read_nr), {})
+
+    @staticmethod
+    def get_percent_q30_per_cycle_for_all_reads(q_metrics, index_reads):
+        """
+        Get the mean percent_q30 per cycle for all lanes and reads at once,
+        using the same selection of cycles as `get_percent_q30_per_cycle`.
+        The Q-metrics are only converted into a data frame once, and are
+        grouped by lane, read and cycle with a single sort. The means are
+        identical to those of `get_percent_q30_per_cycle`. Missing values
+        are ignored, and cycles without any values get a mean of NaN.
+        :param q_metrics: A rectangular array containing values of the
+        following 'Lane', 'Tile', 'Cycle', 'Read', 'Cycle Within Read',
+        '%>= Q20', '%>= Q30', 'Surface', 'Swath', and 'Tile Number'.
+        :param index_reads: the (0-indexed) read numbers which are index
+        reads
+        :returns: {(int, int): {int: float}} where the key is the
+        (0-indexed) lane and read number
+        """
         q30_cycle_df = pd.DataFrame(q_metrics)
-        q30_lane_read = q30_cycle_df[
-                (q30_cycle_df["Lane"] == lane_nr+1) &\
-                (q30_cycle_df["Read"] == read_nr+1)]
+        if q30_cycle_df.empty:
+            return {}
 
-        if is_index_read:
-            end_cycle = int(max(q30_lane_read["Cycle Within Read"]))
-            start_cycle = 1
-        else:
-            #Remove the last 90% of all cycles since 
-            #they are expected to drop in q30
-            end_cycle = math.ceil(
-                max(q30_lane_read["Cycle Within Read"])*0.9
-            )
+        lanes = q30_cycle_df["Lane"].to_numpy(dtype=numpy.int64)
+        reads = q30_cycle_df["Read"].to_numpy(dtype=numpy.int64)
+        cycles = q30_cycle_df["Cycle Within Read"].to_numpy(dtype=numpy.int64)
+        percent_q30 = q30_cycle_df["%>= Q30"].to_numpy()
 
-            #Remove first 5 cycles since they are expected
-            #to have a lower q30
-            start_cycle = 6
+        # Encode lane, read and cycle into a single key so that the values
+        # of each group can be made contiguous with a single stable sort.
+        nbr_of_cycles = int(cycles.max()) + 1
+        nbr_of_reads = int(reads.max()) + 1
+        keys = (lanes * nbr_of_reads + reads) * nbr_of_cycles + cycles
+        # Small integers are stable sorted with a radix sort
+        keys = keys.astype(numpy.min_scalar_type(int(keys.max())))
+        order = numpy.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        group_starts = numpy.concatenate((
+            [0], numpy.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1))
+        group_ends = numpy.append(group_starts[1:], len(sorted_keys))
+        group_keys = sorted_keys[group_starts]
 
+        # The means are computed as pandas' mean of each group would: the
+        # valid values are summed in their own dtype, in file order, and
+        # divided by their count.
+        is_valid = ~numpy.isnan(percent_q30)
+        values = numpy.where(is_valid, percent_q30, percent_q30.dtype.type(0))[order]
+        counts = numpy.add.reduceat(is_valid[order].astype(numpy.int64), group_starts)
+        sums = numpy.array([
+            values[start:end].sum()
+            for start, end in zip(group_starts.tolist(), group_ends.tolist())
+        ], dtype=values.dtype)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts.astype(values.dtype)
 
-        return {
-            cycle: q30_lane_read[
-                (q30_lane_read["Cycle Within Read"] == cycle)
-            ]["%>= Q30"].mean()
-            for cycle in range(start_cycle, end_cycle+1)
-        }
+        group_lane_reads, group_cycles = numpy.divmod(group_keys, nbr_of_cycles)
+
+        percent_q30_per_cycle = {}
+        for lane_read in numpy.unique(group_lane_reads):
+            lane, read = divmod(int(lane_read), nbr_of_reads)
+            in_lane_read = group_lane_reads == lane_read
+            means_per_cycle = dict(zip(
+                group_cycles[in_lane_read].tolist(),
+                means[in_lane_read].tolist(),
+            ))
+            last_cycle = max(means_per_cycle)
+
+            if read - 1 in index_reads:
+                end_cycle = last_cycle
+                start_cycle = 1
+            else:
+                #Remove the last 90% of all cycles since
+                #they are expected to drop in q30
+                end_cycle = math.ceil(last_cycle*0.9)
 
+                #Remove first 5 cycles since they are expected
+                #to have a lower q30
+                start_cycle = 6
+
+            percent_q30_per_cycle[(lane - 1, read - 1)] = {
+                cycle: means_per_cycle.get(cycle, numpy.nan)
+                for cycle in range(start_cycle, end_cycle+1)
+            }
+
+        return percent_q30_per_cycle
 
     def run(self):
         run_metrics = py_interop_run_metrics.run_metrics()
         run_metrics.run_info()
 
-        valid_to_load = py_interop_run.uchar_vector(
-            py_interop_run.MetricCount,
-            0
-        )
-
-        py_interop_run_metrics.list_summary_metrics_to_load(
-            valid_to_load
-        )
+        valid_to_load = interop_metrics_to_load([
+            metric_group
+            for signal, metric_groups in self.METRICS_PER_SIGNAL.items()
+            if self._has_subscribers_for(signal)
+            for metric_group in metric_groups
+        ])
         run_metrics.read(self.runfolder, valid_to_load)
-        
-        q_metrics = imaging(self.runfolder, valid_to_load=['Q'])
+
+        # The per tile and cycle Q-metrics are expensive to load on large
+        # flowcells, so only load them if a subscriber will make use of them.
+        compute_q30_per_cycle = self._has_subscribers_for("percent_q30_per_cycle")
 
         summary = py_interop_summary.run_summary()
         py_interop_summary.summarize_run_metrics(run_metrics, summary)
 
+        if compute_q30_per_cycle:
+            index_reads = [
+                read_nbr for read_nbr in range(summary.size())
+                if summary.at(read_nbr).read().is_index()
+            ]
+            percent_q30_per_cycle_for_all_reads = self.get_percent_q30_per_cycle_for_all_reads(
+                imaging(self.runfolder, valid_to_load=['Q']),
+                index_reads,
+            )
+
+        signals = {
+            key: []
+            for key in self.signal_keys
+            if self._has_subscribers_for(key)
+        }
+
         lanes = summary.lane_count()
 
         for lane in range(lanes):
             for read_nbr in range(summary.size()):
                 read = summary.at(read_nbr).at(lane)
-                error_rate = read.error_rate().mean()
-                percent_q30 = read.percent_gt_q30()
-                percent_phix_aligned = read.percent_aligned().mean()
                 is_index_read = summary.at(read_nbr).read().is_index()
-                percent_q30_per_cycle = self.get_percent_q30_per_cycle(
-                                        q_metrics,
-                                        lane,
-                                        read_nbr,
-                                        is_index_read)
-                
-                self._send_to_subscribers(("error_rate",
-                                        {"lane": lane+1, 
-                                         "read": read_nbr+1, 
-                                         "error_rate": error_rate,
-                                         "is_index_read":is_index_read}))
-                self._send_to_subscribers(("percent_q30",
-                                        {"lane": lane+1, 
-                                         "read": read_nbr+1, 
-                                         "percent_q30": percent_q30, 
-                                         "is_index_read":is_index_read}))
-                self._send_to_subscribers(("percent_phix",
-                                        {"lane": lane+1, 
-                                         "read": read_nbr+1, 
-                                         "percent_phix": percent_phix_aligned}))
-                self._send_to_subscribers(("percent_q30_per_cycle",
-                                        {"lane": lane+1,
-                                         "read": read_nbr+1, 
-                                         "percent_q30_per_cycle": percent_q30_per_cycle,
-                                         "is_index_read": is_index_read}))
+
+                if "error_rate" in signals:
+                    signals["error_rate"].append({"lane": lane+1,
+                                                  "read": read_nbr+1,
+                                                  "error_rate": read.error_rate().mean(),
+                                                  "is_index_read": is_index_read})
+                if "percent_q30" in signals:
+                    signals["percent_q30"].append({"lane": lane+1,
+                                                   "read": read_nbr+1,
+                                                   "percent_q30": read.percent_gt_q30(),
+                                                   "is_index_read": is_index_read})
+                if "percent_phix" in signals:
+                    signals["percent_phix"].append({"lane": lane+1,
+                                                    "read": read_nbr+1,
+                                                    "percent_phix": read.percent_aligned().mean()})
+                if "percent_q30_per_cycle" in signals:
+                    percent_q30_per_cycle = percent_q30_per_cycle_for_all_reads.get(
+                                            (lane, read_nbr), {})
+                    signals["percent_q30_per_cycle"].append({"lane": lane+1,
+                                                             "read": read_nbr+1,
+                                                             "percent_q30_per_cycle": percent_q30_per_cycle,
+                                                             "is_index_read": is_index_read})
+
+        for key, values in signals.items():
+            self._send_batch_to_subscribers(key, values)
 
     def __eq__(self, other):
         if isinstance(other, self.__class__) and self.runfolder == other.runfolder:
@@ -4,8 +4,7 @@ class Parser(object):
     Parser is the base class for all parser implementations.
 
     A Parser will parse data and send it to its subscribers. Exactly what an item of data is depends on the particular
-    implementation. The subscribers are then responsible for deciding if they are interested in that particular datum
-    or not.
+    implementation.
 
     Parsers should be connected to their subscribing handlers by a third class, an example of how this can
     be accomplished can be found in the QCEngine.
@@ -16,10 +15,25 @@ class Parser(object):
     Furthermore in order for Parsers to be identifiable it is necessary to implement a custom version
     of `__eq__` and `__hash__`, which provides a custom definition of equivalence, this can e.g. be based on
     which runfolder the parser is setup to get its data from.
+
+    Signals are sent as (key, data) tuples, and are only routed to the subscribers which have declared an
+    interest in that key (see `Subscriber.subscribed_keys`). Parsers should list the keys they send in
+    `signal_keys`, or leave it as None if the keys depend on the data being parsed.
+
+    Parsers which are CPU-bound, and whose instances and signals can be pickled, can set `can_run_in_process`
+    to allow the QCEngine to run them in a separate process.
+
+    `cost` is a rough, relative, measure of how expensive the parser is to run. It is used to run the cheapest
+    handlers first when the QCEngine should stop at the first fatal error.
     """
 
+    signal_keys = None
+    can_run_in_process = False
+    cost = 1
+
     def __init__(self):
         self.subscribers = []
+        self._routes = {}
 
     def add_subscribers(self, new_subscribers):
         """
@@ -32,17 +46,89 @@ class Parser(object):
             self.subscribers = self.subscribers + new_subscribers
         else:
             self.subscribers.append(new_subscribers)
+        self._routes = {}
+
+    def subscribers_for(self, key):
+        """
+        The subscribers which will receive signals with the given key, i.e. the subscribers which have declared
+        an interest in the key (see `Subscriber.subscribed_keys`) and the subscribers which want all signals.
+
+        :param key: the key of the signal
+        :returns: list of subscribers
+        """
+        if key not in self._routes:
+            self._routes[key] = [
+                subscriber for subscriber in self.subscribers
+                if _accepts(subscriber, key)
+            ]
+        return self._routes[key]
+
+    def subscriptions(self, keys):
+        """
+        Describe which subscribers will receive which signals, e.g. to inspect how handlers are connected to
+        a parser.
+
+        :param keys: the keys of the signals to describe
+        :returns: a dict with the key of each signal and the list of subscribers receiving it
+        """
+        return {key: self.subscribers_for(key) for key in keys}
+
+    def _has_subscribers_for(self, key):
+        """
+        Check if any of the subscribers will make use of signals with the given key. Subscribers which do not
+        declare which keys they are interested in are assumed to want all signals.
+
+        :param key: the key of the signal
+        :returns: True if at least one subscriber consumes the signal, else False
+        """
+        return bool(self.subscribers_for(key))
+
+    def _subscribed_keys(self):
+        """
+        Collect the keys of the signals that the subscribers will make use of.
+
+        :returns: a set of keys, or None if any subscriber wants all signals
+        """
+        keys = set()
+        for subscriber in self.subscribers:
+            subscribed_keys = _subscribed_keys(subscriber)
+            if subscribed_keys is None:
+                return None
+            keys.update(subscribed_keys)
+        return keys
 
     def _send_to_subscribers(self, value):
         """
-        Calling this method will send `value` to all subscribers
+        Calling this method will send `value` to the subscribers. If `value` is a (key, data) tuple it is only
+        sent to the subscribers of that key, otherwise it is sent to all subscribers.
 
         :param value: The value to send to the subscribers
         :returns: None
         """
-        for subscriber in self.subscribers:
+        if isinstance(value, tuple) and len(value) == 2:
+            subscribers = self.subscribers_for(value[0])
+        else:
+            subscribers = self.subscribers
+        for subscriber in subscribers:
             subscriber.send(value)
 
+    def _send_batch_to_subscribers(self, key, values):
+        """
+        Send a number of signals with the same key to the subscribers of that key. This is equivalent to
+        calling `_send_to_subscribers((key, value))` for each value, but subscribers implementing `send_batch`
+        receive all values at once.
+
+        :param key: the key of the signals
+        :param values: list of the data of the signals
+        :returns: None
+        """
+        for subscriber in self.subscribers_for(key):
+            if hasattr(subscriber, "send_batch"):
+                subscriber.send_batch(key, values)
+            else:
+                for value in values:
+                    subscriber.send((key, value))
+
     def run(self):
         """
         All Parsers must implement this method. Calling it should parse the data, what ever that means in the
@@ -59,3 +145,12 @@ class Parser(object):
 
     def __hash__(self):
         raise NotImplementedError
+
+
+def _subscribed_keys(subscriber):
+    return getattr(subscriber, "subscribed_keys", lambda: None)()
+
+
+def _accepts(subscriber, key):
+    subscribed_keys = _subscribed_keys(subscriber)
+    return subscribed_keys is None or key in subscribed_keys
@@ -12,6 +12,8 @@ class SamplesheetParser(Parser):
     TODO
     """
 
+    signal_keys = ["samplesheet"]
+
     def __init__(self, runfolder, parser_configurations, *args, **kwargs):
         """
         Create a SamplesheetParser instance for the specified runfolder
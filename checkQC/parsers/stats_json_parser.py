@@ -1,9 +1,9 @@
 
-import json
 import os
 import logging
 
 from checkQC.parsers.parser import Parser
+from checkQC.parsers.utils import JsonObjectStream
 from checkQC.exceptions import StatsJsonNotFound, ConfigurationError
 
 log = logging.getLogger(__name__)
@@ -18,7 +18,9 @@ class StatsJsonParser(Parser):
         ('RunNumber', 303)
         ('RunId', '170726_D00118_0303_BCB1TVANXX')
 
-    The subscribers decide which of these values they are iterested in.
+    The subscribers decide which of these values they are iterested in. Top level keys which none of the
+    subscribers have declared an interest in (see `Subscriber.subscribed_keys`) are skipped without being
+    decoded, so that e.g. the large `UnknownBarcodes` section does not need to be held in memory.
     """
 
     def __init__(self, runfolder, parser_configurations, *args, **kwargs):
@@ -55,9 +57,8 @@ class StatsJsonParser(Parser):
             raise StatsJsonNotFound("Could not find a Stats.json file at: {}".format(self.file_path))
 
     def run(self):
-        with open(self.file_path, "r") as f:
-            data = json.load(f)
-            for key_value in data.items():
+        with open(self.file_path, "rb") as f:
+            for key_value in JsonObjectStream(f).items(self._subscribed_keys()):
                 self._send_to_subscribers(key_value)
 
     def __eq__(self, other):
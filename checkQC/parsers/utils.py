@@ -0,0 +1,226 @@
+import itertools
+import json
+import re
+from collections.abc import Mapping
+
+
+class LazySections(Mapping):
+    """
+    Read-only mapping whose values are computed on first access and then
+    memoized. This makes it possible to only load the parts of the data
+    which are actually used, while keeping dict-style access.
+
+    Membership tests and `get` only look at the keys, so that an error
+    computing a section, even a KeyError, is never taken for a missing key.
+    """
+
+    def __init__(self, keys, load_section):
+        """
+        :param keys: the keys (section names) of the mapping
+        :param load_section: callable computing the value of a section from
+                             its key
+        """
+        self._keys = list(keys)
+        self._load_section = load_section
+        self._sections = {}
+
+    def __getitem__(self, key):
+        if key not in self._sections:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._sections[key] = self._load_section(key)
+        return self._sections[key]
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def get(self, key, default=None):
+        if key not in self._keys:
+            return default
+        return self[key]
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return "{}(loaded={})".format(self.__class__.__name__, list(self._sections))
+
+
+class JsonObjectStream:
+    """
+    Incremental reader of the top level items of a JSON object. The file is
+    read in chunks, and values of keys which are not wanted are scanned over
+    without being decoded. Memory use is therefore bounded by the size of the
+    largest wanted value rather than by the size of the file.
+    """
+
+    _WHITESPACE = re.compile(rb"\s*")
+    _STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+    _NOT_BRACKET = bytes(set(range(256)) - set(b"{}[]"))
+    _STRING_OR_BRACKET = re.compile(_STRING.pattern + rb"|([{}\[\]])")
+    _SCALAR_END = re.compile(rb"[\s,}\]]")
+    _DEPTH_CHANGE = {ord("{"): 1, ord("["): 1, ord("}"): -1, ord("]"): -1}
+
+    def __init__(self, f, chunk_size=2**20):
+        """
+        :param f: seekable file object opened in binary mode, containing
+                  UTF-8 encoded JSON
+        :param chunk_size: number of bytes to read at a time
+        """
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buffer = b""
+        self._pos = 0
+        # File offset of the start of the buffer
+        self._offset = f.tell()
+
+    def items(self, keys=None):
+        """
+        Yield the (key, value) pairs of the top level object, in file order.
+
+        :param keys: collection of the keys to decode, or None for all keys
+        :returns: generator of (key, value) tuples
+        """
+        self._expect(b"{")
+        if self._peek() == b"}":
+            return
+        while True:
+            if self._peek() != b'"':
+                self._error("Expecting property name enclosed in double quotes")
+            key = self._read_value()
+            self._expect(b":")
+            if keys is None or key in keys:
+                yield key, self._read_value()
+            else:
+                self._skip_value()
+            char = self._peek()
+            if char == b"}":
+                return
+            if char != b",":
+                self._error("Expecting ',' delimiter")
+            self._pos += 1
+
+    def _read_more(self):
+        """
+        Read the next chunk of the file, dropping the part of the buffer
+        before the current position. Returns False at the end of the file.
+        """
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message):
+        raise json.JSONDecodeError(message, self._buffer.decode("latin-1"), self._pos)
+
+    def _peek(self):
+        """
+        Skip whitespace and return the next character, or an empty bytes
+        object at the end of the file.
+        """
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos:self._pos + 1]
+            if not self._read_more():
+                return b""
+
+    def _expect(self, char):
+        if self._peek() != char:
+            self._error("Expecting '{}'".format(char.decode()))
+        self._pos += 1
+
+    def _skip_string(self):
+        while True:
+            match = self._STRING.match(self._buffer, self._pos)
+            if match:
+                self._pos = match.end()
+                return
+            if not self._read_more():
+                self._error("Unterminated string")
+
+    def _strip_strings(self, text):
+        """
+        Remove the strings from `text`. A string which continues in the next
+        chunk is removed along with the rest of the text, and the length of
+        this tail is returned as well.
+        """
+        if b"\\" not in text:
+            # Without escapes, every other quote starts a string
+            parts = text.split(b'"')
+            tail = len(parts[-1]) + 1 if len(parts) % 2 == 0 else 0
+            return b"".join(parts[::2]), tail
+        text = self._STRING.sub(b"", text)
+        unterminated = text.find(b'"')
+        if unterminated == -1:
+            return text, 0
+        return text[:unterminated], len(text) - unterminated
+
+    def _skip_container(self):
+        """
+        Skip an object or array, one buffer at a time. Once the strings are
+        removed from the buffer, the depth after each bracket can be computed
+        without looping over the characters in Python.
+        """
+        depth = 0
+        while True:
+            text, tail = self._strip_strings(self._buffer[self._pos:])
+            depths = list(itertools.accumulate(
+                map(self._DEPTH_CHANGE.__getitem__, text.translate(None, self._NOT_BRACKET)),
+                initial=depth))
+            try:
+                closing = depths.index(0, 1)
+            except ValueError:
+                depth = depths[-1]
+                self._pos = len(self._buffer) - tail
+                if not self._read_more():
+                    self._error("Unterminated object or array")
+                continue
+            brackets = (match for match in self._STRING_OR_BRACKET.finditer(self._buffer, self._pos)
+                        if match.group(1))
+            self._pos = next(itertools.islice(brackets, closing - 1, None)).end()
+            return
+
+    def _skip_value(self):
+        char = self._peek()
+        if char == b'"':
+            self._skip_string()
+        elif char in (b"{", b"["):
+            self._skip_container()
+        elif char:
+            while True:
+                match = self._SCALAR_END.search(self._buffer, self._pos)
+                if match:
+                    self._pos = match.start()
+                    return
+                self._pos = len(self._buffer)
+                if not self._read_more():
+                    return
+        else:
+            self._error("Expecting value")
+
+    def _read_value(self):
+        self._peek()
+        start = self._offset + self._pos
+        self._skip_value()
+        return json.loads(self._read_span(start, self._offset + self._pos).decode("utf-8"))
+
+    def _read_span(self, start, end):
+        """
+        Return the bytes between the file offsets `start` and `end`. A span
+        which no longer is in the buffer is read back from the file in one
+        piece, rather than being collected from the chunks as they are read.
+        """
+        if start >= self._offset:
+            return self._buffer[start - self._offset:end - self._offset]
+        resume_at = self._f.tell()
+        self._f.seek(start)
+        data = self._f.read(end - start)
+        self._f.seek(resume_at)
+        return data
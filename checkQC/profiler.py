@@ -0,0 +1,141 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Memory tracing is global to the process, so the stages open in all threads (and in all profilers) have to be
+# told of the peak memory use before the peak is reset by a new stage.
+_open_stages_lock = threading.Lock()
+_open_stages = set()
+
+
+class Profiler(object):
+    """
+    The Profiler records the wall time, CPU time and peak memory use (as traced by tracemalloc) of the stages of
+    a CheckQC run, e.g.:
+
+    .. code-block :: python
+
+        profiler = Profiler()
+        with profiler.stage("config"):
+            config = ConfigFactory.from_config_path(config_file)
+        profiler.stop()
+        profiler.as_dict()
+
+    Stages can be nested, and can be run in several threads at once. The CPU time is that of the thread running
+    the stage. The peak memory is that of the whole process while the stage was running, as memory allocations
+    are not traced per thread. A disabled profiler (see `Profiler.disabled`) records nothing, so that code can always
+    go through a profiler without checking whether profiling was asked for.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Create a Profiler. Memory tracing is started if it is not already running.
+
+        :param enabled: if False the profiler will not record anything
+        """
+        self.enabled = enabled
+        self._stages = []
+        self._started_tracemalloc = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @classmethod
+    def disabled(cls):
+        """
+        :returns: a Profiler which does not record anything
+        """
+        return cls(enabled=False)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Context manager recording the time and memory used by the code it wraps
+
+        :param name: name of the stage, e.g. "parser:InteropParser"
+        """
+        if not self.enabled:
+            yield
+            return
+
+        stage = {"stage": name}
+        self._stages.append(stage)
+        open_stage = _OpenStage()
+
+        with _open_stages_lock:
+            _fold_peak_into_open_stages()
+            tracemalloc.reset_peak()
+            _open_stages.add(open_stage)
+        start_memory = tracemalloc.get_traced_memory()[0]
+        start_wall_time = time.perf_counter()
+        start_cpu_time = time.thread_time()
+        try:
+            yield
+        finally:
+            stage["wall_time"] = time.perf_counter() - start_wall_time
+            stage["cpu_time"] = time.thread_time() - start_cpu_time
+            with _open_stages_lock:
+                peak = max(tracemalloc.get_traced_memory()[1], open_stage.child_peak)
+                _open_stages.remove(open_stage)
+            stage["peak_memory"] = max(peak - start_memory, 0)
+
+    def add_stages(self, stages):
+        """
+        Add stages recorded by another profiler, e.g. one running in a separate process
+
+        :param stages: list of stages, as returned by `as_dict`
+        """
+        if self.enabled:
+            self._stages.extend(dict(stage) for stage in stages)
+
+    def stop(self):
+        """
+        Stop tracing memory allocations, if they were started by this profiler
+        """
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def as_dict(self):
+        """
+        :returns: a dict with a list of the stages recorded so far, in the order they were started. The time is
+                  given in seconds and the peak memory in bytes.
+        """
+        return {"stages": [dict(stage) for stage in self._stages]}
+
+    def write(self, path):
+        """
+        Write the profile as json
+
+        :param path: the file to write to
+        """
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=4)
+
+
+class _OpenStage(object):
+    __slots__ = ("child_peak",)
+
+    def __init__(self):
+        # The highest peak memory use seen before the peak was reset by other stages
+        self.child_peak = 0
+
+
+def _fold_peak_into_open_stages():
+    peak = tracemalloc.get_traced_memory()[1]
+    for open_stage in _open_stages:
+        open_stage.child_peak = max(open_stage.child_peak, peak)
+
+
+def _reset_open_stages():
+    # A process forked while another thread held the lock would otherwise never be able to take it
+    global _open_stages_lock, _open_stages
+    _open_stages_lock = threading.Lock()
+    _open_stages = set()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_open_stages)
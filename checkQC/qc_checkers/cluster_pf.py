@@ -1,4 +1,7 @@
+import numpy as np
+
 from checkQC.handlers.qc_handler import QCErrorFatal, QCErrorWarning
+from checkQC.qc_checkers.utils import ERROR, evaluate_thresholds
 
 
 def cluster_pf(
@@ -20,30 +23,24 @@ def cluster_pf(
     def format_msg(total_reads_pf, threshold, lane, **kwargs):
         return f"Clusters PF {total_reads_pf / 10**6}M < {threshold / 10**6}M on lane {lane}"
 
-    def _qualify_error(total_reads_pf, lane):
+    lanes = list(qc_data.sequencing_metrics)
+    total_reads_pf = [
+        qc_data.sequencing_metrics[lane]["total_reads_pf"]
+        for lane in lanes
+    ]
+    levels = evaluate_thresholds(
+        total_reads_pf, error_threshold, warning_threshold)
+
+    def _report(i):
         data = {
-            "lane": lane,
-            "total_reads_pf": total_reads_pf,
+            "lane": lanes[i],
+            "total_reads_pf": total_reads_pf[i],
             "qc_checker": "cluster_pf",
         }
+        if levels[i] == ERROR:
+            data["threshold"] = error_threshold
+            return QCErrorFatal(format_msg(**data), data=data)
+        data["threshold"] = warning_threshold
+        return QCErrorWarning(format_msg(**data), data=data)
 
-        match total_reads_pf:
-            case total_reads_pf if (
-                    error_threshold != "unknown"
-                    and total_reads_pf < error_threshold
-                ):
-                    data["threshold"] = error_threshold
-                    return QCErrorFatal(format_msg(**data), data=data)
-            case total_reads_pf if (
-                    warning_threshold != "unknown"
-                    and total_reads_pf < warning_threshold
-                ):
-                    data["threshold"] = warning_threshold
-                    return QCErrorWarning(format_msg(**data), data=data)
-
-    return [
-        qc_report
-        for lane, lane_data in qc_data.sequencing_metrics.items()
-        if (qc_report := _qualify_error(lane_data["total_reads_pf"], lane))
-    ]
-
+    return [_report(i) for i in np.flatnonzero(levels)]
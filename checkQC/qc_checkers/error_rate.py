@@ -1,6 +1,7 @@
 import numpy as np
 
 from checkQC.handlers.qc_handler import QCErrorFatal, QCErrorWarning
+from checkQC.qc_checkers.utils import ERROR, evaluate_thresholds
 
 
 def error_rate(
@@ -21,7 +22,21 @@ def error_rate(
         or error_threshold > warning_threshold
     )
 
-    def _qualify_error(error, lane, read):
+    reads = [
+        (lane, read, read_data["mean_error_rate"])
+        for lane, lane_data in qc_data.sequencing_metrics.items()
+        for read, read_data in lane_data["reads"].items()
+        if not read_data["is_index"]
+    ]
+    errors = np.array([error for _, _, error in reads], dtype=float)
+    levels = evaluate_thresholds(
+        errors, error_threshold, warning_threshold, higher_is_worse=True)
+    missing = np.isnan(errors) | (errors == 0.)
+    if not allow_missing_error_rate:
+        levels[missing] = ERROR
+
+    def _report(i):
+        lane, read, error = reads[i]
         data = {
             "lane": lane,
             "read": read,
@@ -30,27 +45,17 @@ def error_rate(
         }
         msg = "Error rate {error} > {threshold} on lane {lane} for read {read}."
 
-        match error:
-            case error if (np.isnan(error) or error == 0.) and not allow_missing_error_rate:
-                return QCErrorFatal(
-                    f"Error rate is {error} on lane {lane} for read {read}. "
-                    "This may be because no PhiX was loaded on this lane. "
-                    "Use \"allow_missing_error_rate: true\" to disable this error message.",
-                    data=data,
-                )
-            case error if error_threshold != "unknown" and error > error_threshold:
-                data["threshold"] = error_threshold
-                return QCErrorFatal(msg.format(**data), data=data)
-            case error if warning_threshold != "unknown" and error > warning_threshold:
-                data["threshold"] = warning_threshold
-                return QCErrorWarning(msg.format(**data), data=data)
-
-    return [
-        qc_report
-        for lane, lane_data in qc_data.sequencing_metrics.items()
-        for read, read_data in lane_data["reads"].items()
-        if not read_data["is_index"] and
-           (qc_report := _qualify_error(read_data["mean_error_rate"], lane, read))
-    ]
-
-
+        if missing[i] and not allow_missing_error_rate:
+            return QCErrorFatal(
+                f"Error rate is {error} on lane {lane} for read {read}. "
+                "This may be because no PhiX was loaded on this lane. "
+                "Use \"allow_missing_error_rate: true\" to disable this error message.",
+                data=data,
+            )
+        if levels[i] == ERROR:
+            data["threshold"] = error_threshold
+            return QCErrorFatal(msg.format(**data), data=data)
+        data["threshold"] = warning_threshold
+        return QCErrorWarning(msg.format(**data), data=data)
+
+    return [_report(i) for i in np.flatnonzero(levels)]
@@ -1,4 +1,7 @@
+import numpy as np
+
 from checkQC.handlers.qc_handler import QCErrorFatal, QCErrorWarning
+from checkQC.qc_checkers.utils import ERROR, OK, evaluate_thresholds
 
 
 def q30(
@@ -16,42 +19,42 @@ def q30(
         or error_threshold < warning_threshold
     )
 
-    def _qualify_q30(q30, lane, read, is_index_read):
+    reads = [
+        (lane, read, read_data)
+        for lane, lane_data in qc_data.sequencing_metrics.items()
+        for read, read_data in lane_data["reads"].items()
+    ]
+    q30s = np.array(
+        [read_data["percent_q30"] for _, _, read_data in reads], dtype=float)
+    levels = evaluate_thresholds(q30s, error_threshold, warning_threshold)
+    # A %Q30 of 0 means that it is missing, it is not reported
+    levels[q30s == 0] = OK
+
+    def _report(level, lane, read, read_data):
         data = {
             "lane": lane,
             "read": read,
-            "q30": q30,
+            "q30": read_data["percent_q30"],
             "qc_checker": "q30",
         }
 
-        read_or_index_text = "read (I)" if is_index_read else "read"
+        read_or_index_text = "read (I)" if read_data["is_index"] else "read"
         msg = ("%Q30 {q30} was too low on lane: {lane} "
                "for {read_or_index_text}: {read}")
 
-        if (q30 and error_threshold != "unknown" and
-                q30 < error_threshold):
+        if level == ERROR:
             data["threshold"] = error_threshold
             return QCErrorFatal(
                 msg.format(**data, read_or_index_text=read_or_index_text),
                 data=data
             )
-        if (q30 and warning_threshold != "unknown"  and
-                q30 < warning_threshold):
-            data["threshold"] = warning_threshold
-            return QCErrorWarning(
-                msg.format(**data, read_or_index_text=read_or_index_text),
-                data=data
-            )
-
+        data["threshold"] = warning_threshold
+        return QCErrorWarning(
+            msg.format(**data, read_or_index_text=read_or_index_text),
+            data=data
+        )
 
     return [
-        qc_report
-        for lane, lane_data in qc_data.sequencing_metrics.items()
-        for read, read_data in lane_data["reads"].items()
-        if (qc_report := _qualify_q30(
-            read_data["percent_q30"], lane, read, read_data["is_index"]
-            )
-        )
+        _report(levels[i], *reads[i])
+        for i in np.flatnonzero(levels)
     ]
-
-
@@ -1,4 +1,7 @@
+import numpy as np
+
 from checkQC.handlers.qc_handler import QCErrorFatal, QCErrorWarning
+from checkQC.qc_checkers.utils import ERROR, evaluate_thresholds
 
 
 def reads_per_sample(
@@ -15,46 +18,49 @@ def reads_per_sample(
         or error_threshold < warning_threshold
     )
 
-    def _qualify_error(lane, number_of_samples, sample_id, cluster_count):
-        sample_reads = cluster_count / 10**6
+    samples = [
+        (lane, len(lane_data["reads_per_sample"]), sample_data)
+        for lane, lane_data in qc_data.sequencing_metrics.items()
+        for sample_data in lane_data["reads_per_sample"]
+    ]
+    sample_reads = np.array(
+        [sample_data["cluster_count"] for _, _, sample_data in samples],
+        dtype=float,
+    ) / 10**6
+    number_of_samples = np.array(
+        [number_of_samples for _, number_of_samples, _ in samples],
+        dtype=float,
+    )
+
+    def _per_sample(threshold):
+        if threshold == "unknown":
+            return threshold
+        return float(threshold) / number_of_samples
+
+    levels = evaluate_thresholds(
+        sample_reads,
+        _per_sample(error_threshold),
+        _per_sample(warning_threshold),
+    )
+
+    def _report(level, lane, number_of_samples, sample_data):
         data = {
             "lane": lane,
             "number_of_samples": number_of_samples,
-            "sample_id": sample_id,
-            "sample_reads": sample_reads,
+            "sample_id": sample_data["sample_id"],
+            "sample_reads": sample_data["cluster_count"] / 10**6,
             "qc_checker": "reads_per_sample",
         }
         msg = "Number of reads for sample {sample_id} on lane {lane} were too low: "\
               "{sample_reads} M (threshold: {threshold} M)"
 
-        match sample_reads:
-            case sample_reads if (
-                error_threshold != "unknown"
-                and sample_reads < (
-                    threshold := float(error_threshold) / number_of_samples
-                    )
-            ):
-                data["threshold"] = threshold
-                return QCErrorFatal(msg.format(**data), data=data)
-            case sample_reads if (
-                warning_threshold != "unknown"
-                and sample_reads < (
-                    threshold := float(warning_threshold) / number_of_samples
-                    )
-            ):
-                data["threshold"] = threshold
-                return QCErrorWarning(msg.format(**data), data=data)
+        threshold = error_threshold if level == ERROR else warning_threshold
+        data["threshold"] = float(threshold) / number_of_samples
+        if level == ERROR:
+            return QCErrorFatal(msg.format(**data), data=data)
+        return QCErrorWarning(msg.format(**data), data=data)
 
     return [
-        qc_report
-        for lane, lane_data in qc_data.sequencing_metrics.items()
-        for sample_data in lane_data["reads_per_sample"]
-        if (
-            qc_report := _qualify_error(
-                lane,
-                len(lane_data["reads_per_sample"]),
-                sample_data["sample_id"],
-                sample_data["cluster_count"],
-            )
-        )
+        _report(levels[i], *samples[i])
+        for i in np.flatnonzero(levels)
     ]
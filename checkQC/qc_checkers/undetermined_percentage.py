@@ -1,6 +1,7 @@
 import numpy as np
 
 from checkQC.handlers.qc_handler import QCErrorFatal, QCErrorWarning
+from checkQC.qc_checkers.utils import ERROR, evaluate_thresholds
 
 
 def undetermined_percentage(
@@ -17,12 +18,42 @@ def undetermined_percentage(
         or error_threshold > warning_threshold
     )
 
-    def _qualify_error(lane_data, lane):
+    lanes = list(qc_data.sequencing_metrics.items())
+    no_yield = np.array(
+        [lane_data["yield"] == 0 for _, lane_data in lanes], dtype=bool)
+
+    mean_percent_phix_aligned = np.array([
+        np.nan_to_num(np.nanmean(
+            [
+                read_data["mean_percent_phix_aligned"]
+                for read_data in lane_data["reads"].values()
+            ]
+        ), nan=0.0) if not lane_no_yield else np.nan
+        for (_, lane_data), lane_no_yield in zip(lanes, no_yield)
+    ], dtype=float)
+
+    # NOTE this includes the mean percentage phiX
+    percentage_undetermined = np.array([
+        lane_data["yield_undetermined"] / lane_data["yield"] * 100
+        if not lane_no_yield else np.nan
+        for (_, lane_data), lane_no_yield in zip(lanes, no_yield)
+    ], dtype=float)
+
+    levels = evaluate_thresholds(
+        percentage_undetermined - mean_percent_phix_aligned,
+        error_threshold,
+        warning_threshold,
+        higher_is_worse=True,
+    )
+    levels[no_yield] = ERROR
+
+    def _report(i):
+        lane = lanes[i][0]
         data = {
             "lane": lane,
             "qc_checker": "undetermined_percentage",
         }
-        if lane_data["yield"] == 0:
+        if no_yield[i]:
             data["percentage_undetermined"] = None
             return QCErrorFatal(
                 f"Yield for lane {lane} was 0. "
@@ -30,20 +61,8 @@ def undetermined_percentage(
                 data=data,
             )
 
-        mean_percent_phix_aligned = np.nan_to_num(np.nanmean(
-            [
-                read_data["mean_percent_phix_aligned"]
-                for read_data in lane_data["reads"].values()
-            ]
-        ), nan=0.0)
-
-        # NOTE this includes the mean percentage phiX
-        percentage_undetermined = (
-            lane_data["yield_undetermined"] / lane_data["yield"] * 100
-        )
-
-        data["percentage_undetermined"] = percentage_undetermined
-        data["mean_percent_phix_aligned"] = mean_percent_phix_aligned
+        data["percentage_undetermined"] = percentage_undetermined[i]
+        data["mean_percent_phix_aligned"] = mean_percent_phix_aligned[i]
 
         msg = (
             "Percentage of undetermined indices "
@@ -52,22 +71,10 @@ def undetermined_percentage(
             "on lane {lane}."
         )
 
-        match percentage_undetermined:
-            case percentage_undetermined if (
-                error_threshold != "unknown"
-                and percentage_undetermined - mean_percent_phix_aligned > error_threshold
-            ):
-                data["threshold"] = error_threshold
-                return QCErrorFatal(msg.format(**data), data=data)
-            case percentage_undetermined if (
-                warning_threshold != "unknown"
-                and percentage_undetermined - mean_percent_phix_aligned > warning_threshold
-            ):
-                data["threshold"] = warning_threshold
-                return QCErrorWarning(msg.format(**data), data=data)
+        if levels[i] == ERROR:
+            data["threshold"] = error_threshold
+            return QCErrorFatal(msg.format(**data), data=data)
+        data["threshold"] = warning_threshold
+        return QCErrorWarning(msg.format(**data), data=data)
 
-    return [
-        qc_report
-        for lane, lane_data in qc_data.sequencing_metrics.items()
-        if (qc_report := _qualify_error(lane_data, lane))
-    ]
+    return [_report(i) for i in np.flatnonzero(levels)]
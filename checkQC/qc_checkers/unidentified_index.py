@@ -8,6 +8,7 @@ def unidentified_index(
     qc_data,
     significance_threshold,
     white_listed_indexes=None,
+    max_mismatches=0,
 ):
     """
     Identify unidentified indices with are significantly overrepresented
@@ -18,6 +19,8 @@ def unidentified_index(
     - the index is present on another lane
     - the index complement, reverse or reverse complement is found in the
     samplesheet.
+    - the index is within `max_mismatches` mismatches of an index in the
+    samplesheet.
 
     Parameters:
     -----------
@@ -29,8 +32,12 @@ def unidentified_index(
     white_listed_indexes: [str]
         list of regexes. Indices matching this regex will be reported as
         warnings instead of errors.
+    max_mismatches: int
+        report samplesheet indices with at most this many mismatches to the
+        unknown barcode. Near matches are not looked for if set to 0.
     """
-    samplesheet_matcher = SamplesheetMatcher(qc_data.samplesheet)
+    samplesheet_matcher = SamplesheetMatcher(
+        qc_data.samplesheet, max_mismatches=max_mismatches)
 
     white_listed_indexes = [
         re.compile(re_index)
@@ -89,12 +96,22 @@ class SamplesheetMatcher:
     """
     A class to identify potential index mismatches.
     """
-    def __init__(self, samplesheet):
+    # Variations of an index that could explain an unknown barcode. Each of
+    # them is its own inverse, so the variation of a samplesheet index is the
+    # barcode it would explain.
+    INDEX_VARIATIONS = [
+        ("reverse", lambda index: index[::-1]),
+        ("complement", get_complement),
+        ("reverse complement", lambda index: get_complement(index)[::-1]),
+    ]
+
+    def __init__(self, samplesheet, max_mismatches=0):
         """
         Build SamplesheetMatcher from samplesheet object
 
         Builds an index of all the indices in the samplesheet in order to
-        quickly look them up.
+        quickly look them up. If `max_mismatches` is greater than 0, indices
+        with at most that many mismatches to a barcode are also looked for.
         """
         self.samplesheet_single_indices = {}
         self.samplesheet_dual_indices = {}
@@ -110,6 +127,37 @@ class SamplesheetMatcher:
                 self.samplesheet_single_indices.setdefault(
                     row["index"], []).append(row)
 
+        self.single_index_variations = self._build_variation_index(
+            self.samplesheet_single_indices)
+        self.dual_index_variations = self._build_variation_index(
+            self.samplesheet_dual_indices)
+
+        self.max_mismatches = max_mismatches
+        if max_mismatches > 0:
+            self.single_index_mismatches = MismatchIndex(
+                self.samplesheet_single_indices, max_mismatches)
+            self.dual_index_mismatches = MismatchIndex(
+                [
+                    index for index in self.samplesheet_dual_indices
+                    if "+" in index
+                ],
+                max_mismatches,
+            )
+
+    @classmethod
+    def _build_variation_index(cls, samplesheet_indices):
+        """
+        Build an inverted index from every variation of the samplesheet
+        indices to the (cause, variation, row) it would point to, so that a
+        barcode is matched against all variations with a single lookup.
+        """
+        variation_index = {}
+        for cause, variation_of in cls.INDEX_VARIATIONS:
+            for variation, rows in samplesheet_indices.items():
+                matches = variation_index.setdefault(variation_of(variation), [])
+                matches.extend((cause, variation, row) for row in rows)
+        return variation_index
+
     def list_causes(self, barcode_data):
         """
         returns a list of causes (msg + data)
@@ -119,6 +167,8 @@ class SamplesheetMatcher:
         causes.extend(self.check_lane_swap(barcode_data))
         if barcode_data["barcode"].get("index2"):
             causes.extend(self.check_dual_index_swap(barcode_data))
+        if self.max_mismatches > 0:
+            causes.extend(self.check_near_match(barcode_data))
 
         return causes
 
@@ -134,25 +184,20 @@ class SamplesheetMatcher:
         if barcode.get("index2"):
             indices.append(barcode["index2"])
 
-        samplesheet_indices = (
-            self.samplesheet_dual_indices
+        variation_index = (
+            self.dual_index_variations
             if barcode.get("index2")
-            else self.samplesheet_single_indices
+            else self.single_index_variations
         )
 
         for index in indices:
-            for cause, variation in [
-                ("reverse", index[::-1]),
-                ("complement", get_complement(index)),
-                ("reverse complement", get_complement(index)[::-1]),
-            ]:
-                for row in samplesheet_indices.get(variation, []):
-                    msg = (
-                        f"{cause} index swap: \"{variation}\" found in samplesheet"
-                        f" for sample \"{row['Sample_ID']}\", lane {row['Lane']}"
-                    )
-                    data = (cause, row)
-                    causes.append((msg, data))
+            for cause, variation, row in variation_index.get(index, []):
+                msg = (
+                    f"{cause} index swap: \"{variation}\" found in samplesheet"
+                    f" for sample \"{row['Sample_ID']}\", lane {row['Lane']}"
+                )
+                data = (cause, row)
+                causes.append((msg, data))
 
         return causes
 
@@ -202,3 +247,106 @@ class SamplesheetMatcher:
             causes.append((msg, data))
 
         return causes
+
+    def check_near_match(self, barcode_data):
+        """
+        Check if indices with a few mismatches to the barcode exist in the
+        samplesheet, e.g. because of synthesis errors. Exact matches are
+        covered by the lane swap check.
+        """
+        barcode = barcode_data["barcode"]
+        if barcode.get("index2"):
+            index = f"{barcode['index']}+{barcode['index2']}"
+            mismatch_index = self.dual_index_mismatches
+            samplesheet_indices = self.samplesheet_dual_indices
+        else:
+            index = barcode["index"]
+            mismatch_index = self.single_index_mismatches
+            samplesheet_indices = self.samplesheet_single_indices
+
+        causes = []
+        for match, mismatches in mismatch_index.search(index):
+            for row in samplesheet_indices[match]:
+                msg = (
+                    f"near match: index \"{match}\" ({mismatches} mismatch"
+                    f"{'es' if mismatches > 1 else ''}) found in samplesheet "
+                    f"for sample \"{row['Sample_ID']}\", lane {row['Lane']}"
+                )
+                data = ("near match", row)
+                causes.append((msg, data))
+
+        return causes
+
+
+class MismatchIndex:
+    """
+    An index of sequences which finds all sequences of the same length within
+    a given number of mismatches (Hamming distance) of a query.
+
+    The index uses the pigeonhole principle: each sequence is split into
+    `max_mismatches + 1` segments, and a sequence with at most
+    `max_mismatches` mismatches to the query must share at least one of these
+    segments exactly. Only the sequences sharing a segment with the query are
+    compared to it, by XOR-ing their byte-packed representations and counting
+    the bytes that differ.
+    """
+    def __init__(self, sequences, max_mismatches):
+        self.max_mismatches = max_mismatches
+        self._segments = {}
+        seen = set()
+        for order, sequence in enumerate(sequences):
+            if sequence in seen:
+                continue
+            seen.add(sequence)
+            candidate = (order, sequence, self._pack(sequence))
+            for key in self._segment_keys(sequence):
+                self._segments.setdefault(key, []).append(candidate)
+
+    def _segment_keys(self, sequence):
+        length = len(sequence)
+        n_segments = self.max_mismatches + 1
+        bounds = [length * i // n_segments for i in range(n_segments + 1)]
+        return [
+            (length, i, sequence[start:end])
+            for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+        ]
+
+    @staticmethod
+    def _pack(sequence):
+        return int.from_bytes(sequence.encode(), byteorder="big")
+
+    @staticmethod
+    def _mismatches(packed_a, packed_b, low_bits):
+        diff = packed_a ^ packed_b
+        # Fold each differing byte onto its lowest bit
+        diff |= diff >> 4
+        diff |= diff >> 2
+        diff |= diff >> 1
+        return (diff & low_bits).bit_count()
+
+    def search(self, query):
+        """
+        Find the indexed sequences with between 1 and `max_mismatches`
+        mismatches to the query.
+
+        Returns a list of (sequence, mismatches), sorted by the number of
+        mismatches and then in the order the sequences were indexed.
+        """
+        packed_query = self._pack(query)
+        low_bits = int.from_bytes(b"\x01" * len(query), byteorder="big")
+
+        compared = set()
+        matches = []
+        for key in self._segment_keys(query):
+            for order, sequence, packed in self._segments.get(key, []):
+                if order in compared:
+                    continue
+                compared.add(order)
+                mismatches = self._mismatches(packed_query, packed, low_bits)
+                if 0 < mismatches <= self.max_mismatches:
+                    matches.append((mismatches, order, sequence))
+
+        return [
+            (sequence, mismatches)
+            for mismatches, _, sequence in sorted(matches)
+        ]
@@ -1,5 +1,7 @@
 import re
 
+import numpy as np
+
 
 def handler2checker(s):
     """
@@ -24,10 +26,67 @@ def handler2checker(s):
 
     return "_".join(words)
 
-def get_complement(index):
-    conv_table = {
-        "A": "T", "T": "A",
-        "C": "G", "G": "C",
-    }
+# Relative cost of loading the data each QC checker needs, used to run the
+# cheapest checkers first when stopping at the first fatal error. The InterOp
+# run summary is always loaded, while the bclconvert reports are only read
+# when a checker asks for them.
+CHECKER_INPUT_COST = {
+    "cluster_pf": 1,
+    "error_rate": 1,
+    "q30": 1,
+    "undetermined_percentage": 2,
+    "reads_per_sample": 3,
+    "unidentified_index": 4,
+}
+
+
+def checker_input_cost(checker):
+    """
+    The relative cost of loading the data needed by a QC checker. Unknown
+    checkers are assumed to be the most expensive ones.
+    """
+    return CHECKER_INPUT_COST.get(
+        handler2checker(checker), max(CHECKER_INPUT_COST.values()) + 1)
+
+
+OK, WARNING, ERROR = 0, 1, 2
+
+
+def evaluate_thresholds(
+    values,
+    error_threshold,
+    warning_threshold,
+    higher_is_worse=False,
+):
+    """
+    Compare all values with the error and warning thresholds at once.
+
+    A threshold can be a number, an array with one threshold per value, or
+    "unknown" in which case it is not evaluated. Values are violating a
+    threshold if they are below it, or above it if `higher_is_worse` is set.
+    NaN never violates a threshold.
+
+    Returns an array with the level (OK, WARNING or ERROR) of each value, the
+    indices of the violating values are given by `np.flatnonzero(levels)`.
+    """
+    values = np.asarray(values, dtype=float)
+    levels = np.full(values.shape, OK, dtype=np.int8)
+
+    for level, threshold in [
+        (WARNING, warning_threshold),
+        (ERROR, error_threshold),
+    ]:
+        if isinstance(threshold, str) and threshold == "unknown":
+            continue
+        threshold = np.asarray(threshold, dtype=float)
+        violating = values > threshold if higher_is_worse else values < threshold
+        levels[violating] = level
 
-    return ''.join(conv_table.get(c, c) for c in index)
+    return levels
+
+
+_COMPLEMENT_TABLE = str.maketrans("ATCG", "TAGC")
+
+
+def get_complement(index):
+    return index.translate(_COMPLEMENT_TABLE)
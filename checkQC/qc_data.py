@@ -4,6 +4,10 @@ class QCData:
 
     Various constructors are available, depending on which demultiplexer
     was used to process the runfolder.
+
+    `sequencing_metrics` maps each lane to its metrics. Constructors may
+    provide the metrics of a lane as a read-only mapping which computes each
+    section on first access (see `checkQC.parsers.utils.LazySections`).
     """
     def __init__(
         self,
@@ -1,8 +1,12 @@
 
 from collections import defaultdict
+import concurrent.futures
+import contextlib
+import copy
 import logging
 
 from checkQC.handlers.qc_handler_factory import QCHandlerFactory
+from checkQC.profiler import Profiler
 from checkQC.exceptions import ConfigurationError
 
 log = logging.getLogger(__name__)
@@ -23,9 +27,21 @@ class QCEngine(object):
 
     The QCEngine has a `exit_status` field which can be checked after calling the `run` method,
     to determine if all handlers were successful or not (zero indicates success, 1 indicates failure)
+
+    If `parser_workers` is set the parsers are run concurrently in a pool of threads. If `parser_executor` is
+    "process", parsers which support it (see `Parser.can_run_in_process`) are instead run in a pool of processes.
+    The signals of each parser are recorded and delivered to the handlers from the calling thread, in the same
+    order as when the parsers are run one after another.
+
+    If `fail_fast` is set, the handlers are instead checked one at a time, cheapest first (according to the `cost`
+    of their parsers), only running the parsers needed by each handler. The QCEngine stops at the first handler
+    which finds a fatal QC error, so that the remaining, more expensive, parsers do not have to be run.
     """
 
-    def __init__(self, runfolder, parser_configurations, handler_config, qc_handler_factory=None):
+    PARSER_EXECUTORS = ["thread", "process"]
+
+    def __init__(self, runfolder, parser_configurations, handler_config, qc_handler_factory=None,
+                 parser_workers=None, parser_executor="thread", fail_fast=False, profiler=None):
         """
         Create a instance of QCEngine
 
@@ -33,10 +49,22 @@ class QCEngine(object):
         :param parser_configurations: dict containing configurations for the parsers
         :param handler_config: a dict which configurations for the handlers
         :param qc_handler_factory: A QCHandlerFactory, if None default QCHandlerFactory will be used
+        :param parser_workers: number of parsers to run concurrently, if None the parsers are run one at a time
+        :param parser_executor: "thread" or "process", the kind of pool to run the parsers in
+        :param fail_fast: stop at the first handler finding a fatal QC error
+        :param profiler: a Profiler recording the time and memory used by each parser and handler
         """
+        if parser_executor not in self.PARSER_EXECUTORS:
+            raise ConfigurationError("Unknown parser executor: {}. Valid options are: {}".format(
+                parser_executor, ", ".join(self.PARSER_EXECUTORS)))
+
         self.runfolder = runfolder
         self.parser_configurations = parser_configurations
         self.handlers_config = handler_config
+        self.parser_workers = parser_workers
+        self.parser_executor = parser_executor
+        self.fail_fast = fail_fast
+        self._profiler = profiler or Profiler.disabled()
         self._handlers = []
         self._parsers_and_handlers = defaultdict(list)
         self.exit_status = 0
@@ -57,6 +85,8 @@ class QCEngine(object):
             self._validate_configurations()
             self._initiate_parsers()
             self._subscribe_handlers_to_parsers()
+            if self.fail_fast:
+                return self._run_parsers_and_compile_reports_fail_fast()
             self._run_parsers()
             reports = self._compile_reports()
             return reports
@@ -94,16 +124,150 @@ class QCEngine(object):
             parser.add_subscribers(handlers)
 
     def _run_parsers(self):
-        for parser in self._parsers_and_handlers.keys():
+        if self.parser_workers:
+            with self._profiler.stage("parsers"):
+                self._run_parsers_concurrently()
+        else:
+            for parser in self._parsers_and_handlers.keys():
+                self._run_parser(parser)
+
+    def _run_parser(self, parser):
+        with self._profiler.stage("parser:{}".format(type(parser).__name__)):
             parser.run()
 
+    def _run_parsers_concurrently(self):
+        parsers = list(self._parsers_and_handlers.keys())
+        use_processes = self.parser_executor == "process" and any(parser.can_run_in_process for parser in parsers)
+
+        with contextlib.ExitStack() as stack:
+            thread_pool = stack.enter_context(
+                concurrent.futures.ThreadPoolExecutor(max_workers=self.parser_workers))
+            if use_processes:
+                process_pool = stack.enter_context(
+                    concurrent.futures.ProcessPoolExecutor(max_workers=self.parser_workers))
+
+            futures = []
+            for parser in parsers:
+                executor = process_pool if use_processes and parser.can_run_in_process else thread_pool
+                futures.append((parser, executor.submit(
+                    _record_signals, _detach_subscribers(parser), self._profiler.enabled)))
+
+            for parser, future in futures:
+                batches, stages = future.result()
+                self._profiler.add_stages(stages)
+                for key, signals in batches:
+                    if key is None:
+                        for signal in signals:
+                            parser._send_to_subscribers(signal)
+                    else:
+                        parser._send_batch_to_subscribers(key, signals)
+
+    def subscription_graph(self):
+        """
+        Describe how the handlers are connected to the parsers, i.e. which handlers will receive which signals
+        from each parser. Only available once the parsers have been initiated.
+
+        :returns: a dict with the class name of each parser and, for each signal key sent, the class names
+                  of the handlers receiving it. Handlers which receive all signals are listed under "*".
+        """
+        graph = {}
+        for parser, handlers in self._parsers_and_handlers.items():
+            if parser.signal_keys is not None:
+                keys = parser.signal_keys
+            else:
+                keys = sorted({key for handler in handlers for key in (handler.subscribed_keys() or [])})
+            subscriptions = {
+                key: [type(handler).__name__ for handler in subscribers]
+                for key, subscribers in parser.subscriptions(keys).items()
+            }
+            catch_all = [type(handler).__name__ for handler in handlers if handler.subscribed_keys() is None]
+            if catch_all:
+                subscriptions["*"] = catch_all
+            graph[type(parser).__name__] = subscriptions
+        return graph
+
+    def _run_parsers_and_compile_reports_fail_fast(self):
+        parsers_of_handler = defaultdict(list)
+        for parser, handlers in self._parsers_and_handlers.items():
+            for handler in handlers:
+                parsers_of_handler[handler].append(parser)
+
+        def handler_cost(handler):
+            return sum(parser.cost for parser in parsers_of_handler[handler])
+
+        reports = {"exit_status": 0}
+        parsers_run = set()
+        for handler in sorted(self._handlers, key=handler_cost):
+            for parser in parsers_of_handler[handler]:
+                if parser not in parsers_run:
+                    self._run_parser(parser)
+                    parsers_run.add(parser)
+
+            self._add_handler_report(reports, handler)
+            if reports["exit_status"] != 0:
+                log.info("Fatal QC error found by {}, skipping the remaining handlers.".format(
+                    type(handler).__name__))
+                break
+        return reports
+
     def _compile_reports(self):
         reports = {"exit_status": 0}
         for handler in self._handlers:
-            handler_report = handler.report()
-            if handler_report:
-                reports[type(handler).__name__] = list(map(lambda x: x.as_dict(), handler_report))
-            if handler.exit_status() != 0:
-                self.exit_status = 1
-                reports["exit_status"] = 1
+            self._add_handler_report(reports, handler)
         return reports
+
+    def _add_handler_report(self, reports, handler):
+        with self._profiler.stage("handler:{}".format(type(handler).__name__)):
+            handler_report = handler.report()
+        if handler_report:
+            reports[type(handler).__name__] = list(map(lambda x: x.as_dict(), handler_report))
+        if handler.exit_status() != 0:
+            self.exit_status = 1
+            reports["exit_status"] = 1
+
+
+class _SignalRecorder(object):
+    """
+    Stands in for the subscribers of a parser run by a worker, recording the signals it sends
+    """
+
+    def __init__(self, subscribed_keys):
+        self._subscribed_keys = subscribed_keys
+        # List of (key, signals) tuples, where the key is None for signals which were not sent as a batch
+        self.batches = []
+
+    def subscribed_keys(self):
+        return self._subscribed_keys
+
+    def send(self, value):
+        self.batches.append((None, [value]))
+
+    def send_batch(self, key, values):
+        self.batches.append((key, list(values)))
+
+
+def _detach_subscribers(parser):
+    """
+    Copy a parser, replacing its subscribers by a _SignalRecorder, so that it can be run (and, if needed, pickled)
+    without touching the handlers.
+    """
+    detached = copy.copy(parser)
+    detached.subscribers = []
+    detached._routes = {}
+    detached.add_subscribers(_SignalRecorder(parser._subscribed_keys()))
+    return detached
+
+
+def _record_signals(parser, profile=False):
+    """
+    Run a parser detached by `_detach_subscribers`, as a worker.
+
+    :returns: a tuple of the signals sent by the parser and the profiler stages of the parser run (empty unless
+              `profile` is True). The stages are returned, as the profiler of the QCEngine is not available in
+              a worker process.
+    """
+    profiler = Profiler(enabled=profile)
+    with profiler.stage("parser:{}".format(type(parser).__name__)):
+        parser.run()
+    profiler.stop()
+    return parser.subscribers[0].batches, profiler.as_dict()["stages"]
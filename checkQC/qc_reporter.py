@@ -3,7 +3,8 @@ import logging
 
 import checkQC.qc_checkers
 import checkQC.views
-from checkQC.qc_checkers.utils import handler2checker
+from checkQC.profiler import Profiler
+from checkQC.qc_checkers.utils import checker_input_cost, handler2checker
 
 
 log = logging.getLogger(__name__)
@@ -24,7 +25,26 @@ class QCReporter:
         qc_data,
         use_closest_read_len=False,
         downgrade_errors_for=[],
+        fail_fast=False,
+        profiler=None,
     ):
+        """
+        Run the QC checkers configured for the run and render their reports.
+
+        If `fail_fast` is set, the checkers are run cheapest first (see
+        `CHECKER_INPUT_COST`) and no more checkers are run once a fatal error
+        has been found. Since the QCData sections are computed on demand,
+        the sections only used by the skipped checkers are never computed,
+        and their inputs are never read if QCData was created with
+        `load_on_demand`.
+
+        If a `profiler` is given, the time and memory used by each checker and
+        by the view is recorded, and the profile is added to the view. In
+        order for the added profile to include the view stage, the view is
+        rendered a second time, outside of the stage, once the profile is
+        complete.
+        """
+        profiler = profiler or Profiler.disabled()
         config = self._select_configs(
             qc_data,
             use_closest_read_len,
@@ -32,26 +52,70 @@ class QCReporter:
         )
         checker_configs = config["checkers"]
 
-        qc_reports = [
-            qc_report
-            for checker, checker_config in checker_configs.items()
-            for qc_report in getattr(checkQC.qc_checkers, handler2checker(checker))(
-                qc_data,
-                **checker_config
-            )
-        ]
+        checkers = list(checker_configs.items())
+        if fail_fast:
+            checkers.sort(key=lambda item: checker_input_cost(item[0]))
+
+        qc_reports = []
+        for checker, checker_config in checkers:
+            with profiler.stage(f"checker:{handler2checker(checker)}"):
+                checker_reports = getattr(checkQC.qc_checkers, handler2checker(checker))(
+                    qc_data,
+                    **checker_config
+                )
+            qc_reports.extend(checker_reports)
+            if fail_fast and any(
+                qc_report.type() == "error" for qc_report in checker_reports
+            ):
+                log.info(
+                    f"Fatal QC error found by {checker}, skipping the "
+                    "remaining checkers."
+                )
+                break
 
         if any(qc_report.type() == "error" for qc_report in qc_reports):
             exit_status = 1
         else:
             exit_status = 0
 
-        return exit_status, getattr(checkQC.views, config["view"])(
-            checker_configs,
-            qc_data,
-            qc_reports,
+        view = getattr(checkQC.views, config["view"])
+        with profiler.stage("view"):
+            rendered_view = view(checker_configs, qc_data, qc_reports)
+        if profiler.enabled:
+            rendered_view = view(
+                checker_configs,
+                qc_data,
+                qc_reports,
+                profile=profiler.as_dict(),
+            )
+
+        return exit_status, rendered_view
+
+    def select_checkers(
+        self,
+        instrument,
+        read_length,
+        use_closest_read_len=False,
+    ):
+        """
+        Get the configuration of the QC checkers which will be run for the
+        given instrument and read length, keyed by checker name.
+        """
+        best_match_read_len = self._select_read_len(
+            instrument,
+            read_length,
+            use_closest_read_len,
         )
 
+        return {
+            handler2checker(checker): checker_config
+            for checker, checker_config in self._get_checker_configs(
+                instrument,
+                best_match_read_len,
+                downgrade_errors_for=[],
+            ).items()
+        }
+
     def _select_configs(
         self,
         qc_data,
@@ -60,12 +124,13 @@ class QCReporter:
     ):
 
         best_match_read_len = self._select_read_len(
-            qc_data,
+            qc_data.instrument,
+            qc_data.read_length,
             use_closest_read_len,
         )
 
         checker_configs = self._get_checker_configs(
-            qc_data,
+            qc_data.instrument,
             best_match_read_len,
             downgrade_errors_for,
         )
@@ -76,34 +141,34 @@ class QCReporter:
                 "view", self.configs.get("default_view", "basic_view")),
         }
 
-    def _select_read_len(self, qc_data, use_closest_read_len):
+    def _select_read_len(self, instrument, read_length, use_closest_read_len):
         def dist(read_len):
             if mtch := re.match(r"(\d+)-(\d+)", str(read_len)):
                 low, high = (int(n) for n in mtch.groups())
                 return (
                     0
-                    if low <= qc_data.read_length <= high
+                    if low <= read_length <= high
                     else min(
-                        abs(low - qc_data.read_length),
-                        abs(high - qc_data.read_length)
+                        abs(low - read_length),
+                        abs(high - read_length)
                     )
                 )
             else:
-                return abs(int(read_len) - qc_data.read_length)
+                return abs(int(read_len) - read_length)
 
-        best_match_read_len = min(self.configs[qc_data.instrument], key=dist)
+        best_match_read_len = min(self.configs[instrument], key=dist)
 
         if not use_closest_read_len and dist(best_match_read_len) > 0:
             raise KeyError(
-                f"No config entry matching read length {qc_data.read_length}"
-                f" found for instrument {qc_data.instrument}."
+                f"No config entry matching read length {read_length}"
+                f" found for instrument {instrument}."
             )
 
         return best_match_read_len
 
     def _get_checker_configs(
         self,
-        qc_data,
+        instrument,
         best_match_read_len,
         downgrade_errors_for,
     ):
@@ -115,7 +180,7 @@ class QCReporter:
             }
             for checker_config in (
                 self.configs.get("default_handlers", [])
-                + self.configs[qc_data.instrument][best_match_read_len]["handlers"]
+                + self.configs[instrument][best_match_read_len]["handlers"]
             )
         }
 
@@ -11,8 +11,13 @@ class IlluminaInstrument(object):
     """
     Base class representing an Illumina instrument. The `name` and `reagent_version` needs to be implemented
     by the specific subclasses.
+
+    `run_parameters_fields` lists the paths of the [R|r]unParameters.xml elements which `reagent_version` reads,
+    so that only these need to be extracted from the file.
     """
 
+    run_parameters_fields = ()
+
     @staticmethod
     def name():
         """
@@ -44,6 +49,8 @@ class ISeq(IlluminaInstrument):
 
 class NovaSeq(IlluminaInstrument):
 
+    run_parameters_fields = ("RunParameters/RfidsInfo/FlowCellMode",)
+
     @staticmethod
     def name():
         return "novaseq"
@@ -59,6 +66,8 @@ class NovaSeq(IlluminaInstrument):
 
 class NovaSeqXPlus(IlluminaInstrument):
 
+    run_parameters_fields = ("RunParameters/ConsumableInfo",)
+
     @staticmethod
     def name():
         return "novaseqxplus"
@@ -98,6 +107,8 @@ class HiSeqX(IlluminaInstrument):
 
 class MiSeq(IlluminaInstrument):
 
+    run_parameters_fields = ("RunParameters/ReagentKitVersion", "RunParameters/Setup/NumTilesPerSwath")
+
     @staticmethod
     def name():
         return "miseq"
@@ -142,6 +153,8 @@ class MiSeq(IlluminaInstrument):
 
 class HiSeq2500(IlluminaInstrument):
 
+    run_parameters_fields = ("RunParameters/Setup/RunMode", "RunParameters/Setup/Sbs")
+
     @staticmethod
     def name():
         return "hiseq2500"
@@ -171,6 +184,8 @@ class HiSeq2500(IlluminaInstrument):
 
 class NextSeq500(IlluminaInstrument):
 
+    run_parameters_fields = ("RunParameters/Chemistry",)
+
     @staticmethod
     def name():
         return "nextseq500"
@@ -195,6 +210,8 @@ class NextSeq500(IlluminaInstrument):
 
 class NextSeq550(IlluminaInstrument):
 
+    run_parameters_fields = ("RunParameters/Chemistry",)
+
     @staticmethod
     def name():
         return "nextseq550"
@@ -235,7 +252,12 @@ class RunTypeRecognizer(object):
         """
         self._runfolder = runfolder
         self.run_info = runfolder_reader.read_run_info_xml(runfolder)
-        self.run_parameters = runfolder_reader.read_run_parameters_xml(runfolder)
+
+        try:
+            fields = self.instrument_type().run_parameters_fields
+        except (InstrumentTypeUnknown, KeyError, TypeError):
+            fields = None
+        self.run_parameters = runfolder_reader.read_run_parameters_xml(runfolder, fields=fields)
 
 
     def instrument_type(self):
@@ -1,38 +1,230 @@
 
 import xmltodict
+import collections
+import copy
 import os
 import logging
+import threading
+import xml.etree.ElementTree as ElementTree
 from checkQC.exceptions import RunParametersNotFound, RunInfoXMLNotFound
 
 log = logging.getLogger(__name__)
 
 
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _element_to_dict(element):
+    """
+    Convert an element to the same structure as xmltodict would produce
+    """
+    result = {"@" + _local_name(key): value for key, value in element.attrib.items()}
+    for child in element:
+        key = _local_name(child.tag)
+        value = _element_to_dict(child)
+        if key not in result:
+            result[key] = value
+        elif isinstance(result[key], list):
+            result[key].append(value)
+        else:
+            result[key] = [result[key], value]
+
+    text = (element.text or "").strip()
+    if not result:
+        return text or None
+    if text:
+        result["#text"] = text
+    return result
+
+
+def extract_xml_fields(path, fields):
+    """
+    Extract only some of the elements of an XML file, without building the full document in memory. The file is
+    read incrementally and reading stops as soon as all fields have been found.
+
+    :param path: path to the XML file
+    :param fields: iterable of element paths, e.g. ["RunParameters/Setup/RunMode"]
+    :returns: a nested dict with the same structure as xmltodict would give, only containing the fields found
+    """
+    pending = set(fields)
+    result = {}
+    tags = []
+    with open(path, "rb") as f:
+        if not pending:
+            return result
+        for event, element in ElementTree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                tags.append(_local_name(element.tag))
+                continue
+
+            element_path = "/".join(tags)
+            if element_path in pending:
+                pending.remove(element_path)
+                *parents, name = tags
+                node = result
+                for parent in parents:
+                    node = node.setdefault(parent, {})
+                node[name] = _element_to_dict(element)
+                if not pending:
+                    break
+            tags.pop()
+            if not any(element_path.startswith(field + "/") for field in pending):
+                element.clear()
+
+    return result
+
+
+
+class RunfolderMetadata(object):
+    """
+    The parsed RunInfo.xml and [R|r]unParameters.xml of a runfolder. Use `RunfolderMetadata.for_runfolder` to get
+    the instance shared by everything that reads the same runfolder within the process.
+
+    The files are parsed on first access and kept until their modification time or size changes, so that long
+    running processes (e.g. the web service) pick up files that have been rewritten. Only the
+    `MAX_RUNFOLDERS` most recently read runfolders are kept. Callers get their own copy of the parsed files.
+    """
+
+    MAX_RUNFOLDERS = 32
+    # Distinct (file, fields) combinations kept per runfolder
+    MAX_PARSED_FILES = 8
+
+    _instances = collections.OrderedDict()
+    _instances_lock = threading.Lock()
+
+    def __init__(self, runfolder):
+        self.runfolder = runfolder
+        self._parsed_files = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_runfolder(cls, runfolder):
+        """
+        Get the metadata object of a runfolder, creating it if this is the first time the runfolder is read
+
+        :param runfolder: path to the runfolder
+        :returns: a RunfolderMetadata instance
+        """
+        key = os.path.realpath(runfolder)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(runfolder)
+                while len(cls._instances) > cls.MAX_RUNFOLDERS:
+                    cls._instances.popitem(last=False)
+            cls._instances.move_to_end(key)
+            return cls._instances[key]
+
+    @classmethod
+    def clear_cache(cls):
+        """
+        Forget all runfolders read so far
+        """
+        with cls._instances_lock:
+            cls._instances.clear()
+
+    def _parse(self, path, fields=None):
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (path, fields)
+        with self._lock:
+            cached = self._parsed_files.get(key)
+            if cached and cached[0] == stamp:
+                self._parsed_files.move_to_end(key)
+                return cached[1]
+            if fields is None:
+                with open(path) as f:
+                    parsed = xmltodict.parse(f.read())
+            else:
+                parsed = extract_xml_fields(path, fields)
+            self._parsed_files[key] = (stamp, parsed)
+            self._parsed_files.move_to_end(key)
+            while len(self._parsed_files) > self.MAX_PARSED_FILES:
+                self._parsed_files.popitem(last=False)
+            return parsed
+
+    @property
+    def run_info(self):
+        """
+        :returns: a copy of the RunInfo.xml data as a dict
+        :raises: RunInfoXMLNotFound if there is no RunInfo.xml in the runfolder
+        """
+        return copy.deepcopy(self._run_info())
+
+    def _run_info(self):
+        run_info_path = os.path.join(self.runfolder, "RunInfo.xml")
+        try:
+            return self._parse(run_info_path)
+        except FileNotFoundError:
+            log.error("Could not find a RunInfo.xml in {}. Are you sure this is a runfolder?".format(run_info_path))
+            raise RunInfoXMLNotFound("Could not find RunInfo.xml at {}".format(run_info_path))
+
+    @property
+    def run_parameters(self):
+        """
+        :returns: the [R|r]unParameters.xml as a dict
+        :raises: RunParametersNotFound if no [R|r]unParameters.xml was found
+        """
+        return self.run_parameters_fields(None)
+
+    def run_parameters_fields(self, fields):
+        """
+        Read only some fields of the [R|r]unParameters.xml, see `extract_xml_fields`
+
+        :param fields: tuple of element paths, e.g. ("RunParameters/Setup/RunMode",), or None to read all of it
+        :returns: a copy of the [R|r]unParameters.xml fields as a nested dict
+        :raises: RunParametersNotFound if no [R|r]unParameters.xml was found
+        """
+        try:
+            return copy.deepcopy(self._parse(RunfolderReader.find_run_parameters_xml(self.runfolder), fields))
+        except FileNotFoundError:
+            raise RunParametersNotFound("Could not find [R|r]unParameters.xml for runfolder {}".format(self.runfolder))
+
+    @property
+    def lane_count(self):
+        return int(self._run_info()["RunInfo"]["Run"]["FlowcellLayout"]["@LaneCount"])
+
+    @property
+    def reads(self):
+        """
+        :returns: list of the read descriptions in RunInfo.xml, e.g. [{'@Number': '1', '@NumCycles': '51', ...}]
+        """
+        reads = copy.deepcopy(self._run_info()["RunInfo"]["Run"]["Reads"]["Read"])
+        return reads if isinstance(reads, list) else [reads]
+
+    @property
+    def instrument(self):
+        """
+        :returns: the instrument id, e.g. 'D00118'
+        """
+        return self._run_info()["RunInfo"]["Run"]["Instrument"]
+
+
 class RunfolderReader(object):
     """
     This class provides methods to read files such as the runParameters.xml and RunInfo.xml files, which
     often need to be read to pick up info about what type of run we are looking at etc.
+
+    The files are only parsed once per runfolder, see `RunfolderMetadata`.
     """
 
     @staticmethod
     def get_nbr_of_lanes(runfolder):
-        runinfo_xml = RunfolderReader.read_run_info_xml(runfolder)
-        return int(runinfo_xml["RunInfo"]["Run"]["FlowcellLayout"]["@LaneCount"])
+        return RunfolderMetadata.for_runfolder(runfolder).lane_count
 
     @staticmethod
-    def read_run_parameters_xml(runfolder):
+    def read_run_parameters_xml(runfolder, fields=None):
         """
         Read the run parameters of an Illumina instrument are recorded in a file called
         runParameters or RunParameters depending on the exact instrument type. This method
         will read it and return it as a dict.
         :param runfolder: to look in
+        :param fields: optional tuple of element paths, e.g. ("RunParameters/Setup/RunMode",). If given, only
+        these elements are extracted from the file.
         :return: the [R|r]unParameters.xml as a dict
         :raises: RunParametersNotFound if no [R|r]unParameters.xml was found
         """
-        try:
-            with open(RunfolderReader.find_run_parameters_xml(runfolder)) as f:
-                return xmltodict.parse(f.read())
-        except FileNotFoundError:
-            raise RunParametersNotFound("Could not find [R|r]unParameters.xml for runfolder {}".format(runfolder))
+        return RunfolderMetadata.for_runfolder(runfolder).run_parameters_fields(fields)
 
     @staticmethod
     def read_run_info_xml(runfolder):
@@ -41,15 +233,7 @@ class RunfolderReader(object):
         :param runfolder: to look in
         :return: RunInfo.xml data as a dict
         """
-        try:
-            run_info_path = os.path.join(runfolder, "RunInfo.xml")
-            if not os.path.exists(run_info_path):
-                log.error("Could not find a RunInfo.xml in {}. Are you sure this is a runfolder?".format(run_info_path))
-                raise FileNotFoundError("Could not find {}".format(run_info_path))
-            with open(run_info_path) as f:
-                return xmltodict.parse(f.read())
-        except FileNotFoundError:
-            raise RunInfoXMLNotFound("Could not find RunInfo.xml at {}".format(run_info_path))
+        return RunfolderMetadata.for_runfolder(runfolder).run_info
 
     @staticmethod
     def find_run_parameters_xml(runfolder):
@@ -1,7 +1,7 @@
 import json
 
 
-def basic_view(checker_configs, qc_data, qc_reports):
+def basic_view(checker_configs, qc_data, qc_reports, profile=None):
     """
     Return qc reports as well as basic info about the sequencing data.
     """
@@ -13,5 +13,7 @@ def basic_view(checker_configs, qc_data, qc_reports):
             "checkers": checker_configs,
         }
     }
+    if profile:
+        data["profile"] = profile
 
     return json.dumps(data, indent=True)
@@ -3,7 +3,7 @@ import json
 import yaml
 
 
-def illumina_data_view(checker_configs, qc_data, qc_reports):
+def illumina_data_view(checker_configs, qc_data, qc_reports, profile=None):
     """
     Output the report's data, grouped by lanes and checker type, in json
     format.
@@ -11,28 +11,33 @@ def illumina_data_view(checker_configs, qc_data, qc_reports):
     data = format_data(
         checker_configs, qc_data, qc_reports,
         format_report=lambda report: report.as_dict(),
+        profile=profile,
     )
 
     return json.dumps(data, indent=True)
 
 
-def illumina_short_view(checker_configs, qc_data, qc_reports):
+def illumina_short_view(checker_configs, qc_data, qc_reports, profile=None):
     """
     Output the report's messages, grouped by lanes and checker type, in yaml
     format.
     """
-    data = format_data(checker_configs, qc_data, qc_reports, format_report=str)
+    data = format_data(
+        checker_configs, qc_data, qc_reports, format_report=str, profile=profile)
 
     return yaml.safe_dump(data)
 
 
-def format_data(checker_configs, qc_data, qc_reports, format_report=str):
+def format_data(
+    checker_configs, qc_data, qc_reports, format_report=str, profile=None,
+):
     """
-    Group reports by lane and checker type.
+    Group reports by lane and checker type. The profile of the run, if any, is
+    added under the "profile" key.
     """
     assert all("lane" in report.data for report in qc_reports)
 
-    return {
+    data = {
         "lane_reports": {
             lane: {
                 qc_checker: [format_report(report) for report in reports]
@@ -52,6 +57,10 @@ def format_data(checker_configs, qc_data, qc_reports, format_report=str):
             "checkers": checker_configs,
         }
     }
+    if profile:
+        data["profile"] = profile
+
+    return data
 
 
 def group_reports(reports, key):
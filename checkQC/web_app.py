@@ -1,14 +1,24 @@
+import asyncio
+import collections
+import concurrent.futures
+import copy
+import hashlib
 import logging
 import logging.config
 import os
+import threading
+import time
 from pathlib import Path
 
 import click
 import json
+import jsonschema
+import yaml
 from json.decoder import JSONDecodeError
 
 import tornado.ioloop
 import tornado.web
+from tornado.iostream import StreamClosedError
 from tornado.web import url, HTTPError
 
 from checkQC.app import App, run_new_checkqc
@@ -22,31 +32,391 @@ log = logging.getLogger(__name__)
 from checkQC import __version__ as checkqc_version
 
 
+class QCExecutor(object):
+    """
+    The QCExecutor runs QC jobs in a pool of threads or processes, so that the IOLoop can keep serving
+    requests while a runfolder is being checked. At most `max_workers` jobs are run at the same time and at
+    most `max_queue` jobs wait for a worker, any further job is rejected with a QCQueueFullError.
+    """
+
+    EXECUTORS = {
+        "thread": concurrent.futures.ThreadPoolExecutor,
+        "process": concurrent.futures.ProcessPoolExecutor,
+    }
+
+    def __init__(self, executor="thread", max_workers=4, max_queue=16, retry_after=30):
+        """
+        Create a QCExecutor
+
+        :param executor: "thread" or "process"
+        :param max_workers: the number of QC jobs to run at the same time
+        :param max_queue: the number of QC jobs that can wait for a worker
+        :param retry_after: the number of seconds clients are asked to wait before retrying when the queue is full
+        """
+        if executor not in self.EXECUTORS:
+            raise ConfigurationError("Unknown executor: {}, choose one of: {}".format(
+                executor, ", ".join(self.EXECUTORS)))
+        self._executor = self.EXECUTORS[executor](max_workers=max_workers)
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.retry_after = retry_after
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """
+        :returns: the number of QC jobs running or waiting for a worker
+        """
+        return self._pending
+
+    def submit(self, fn, *args):
+        """
+        Schedule `fn(*args)` to be run by a worker
+
+        :returns: a concurrent.futures.Future
+        :raises: QCQueueFullError if there already are as many jobs running and waiting as allowed
+        """
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise QCQueueFullError("There are already {} QC jobs running or waiting".format(self._pending))
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+class LoadedConfig(collections.namedtuple("LoadedConfig", ["config", "config_hash", "input_dirs"])):
+    """
+    A validated QC config, together with a hash of its content and the directories, relative to the runfolder,
+    with the files checkQC reads when using it.
+    """
+
+    @classmethod
+    def from_config_path(cls, config_path):
+        """
+        Load and validate a config file
+
+        :param config_path: path to the config file, or None for the default config
+        :returns: a LoadedConfig
+        """
+        config = ConfigFactory.from_config_path(config_path)
+        config_hash = hashlib.sha256(
+            json.dumps(config._config, sort_keys=True, default=str).encode()).hexdigest()
+        return cls(config, config_hash, cls._input_dirs(config))
+
+    @staticmethod
+    def _input_dirs(config):
+        parser_configurations = config.get("parser_configurations") or {}
+        input_dirs = [".", "InterOp"]
+        bcl2fastq_output_path = parser_configurations.get("StatsJsonParser", {}).get("bcl2fastq_output_path")
+        if bcl2fastq_output_path:
+            input_dirs.append(os.path.join(bcl2fastq_output_path, "Stats"))
+        reports_location = parser_configurations.get("from_bclconvert", {}).get("reports_location")
+        if reports_location:
+            input_dirs.append(reports_location)
+        return tuple(input_dirs)
+
+    def copy_config(self):
+        """
+        :returns: a copy of the Config, which the QC run is free to modify
+        """
+        return copy.deepcopy(self.config)
+
+
+class ConfigWatcher(object):
+    """
+    The ConfigWatcher loads and validates the QC config once, instead of on every request. If `poll` is called
+    periodically, the config file is reloaded when its modification time or size changes. The new config is
+    only swapped in if it is valid, otherwise the previous config is kept.
+    """
+
+    def __init__(self, config_file=None):
+        """
+        Load the config
+
+        :param config_file: path to the config file, or None for the default config
+        :raises: if the config cannot be loaded or is not valid
+        """
+        self.config_file = config_file
+        self._file_stat = self._stat()
+        self.current = LoadedConfig.from_config_path(config_file)
+
+    def _stat(self):
+        if not self.config_file:
+            return None
+        try:
+            stat = os.stat(self.config_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self):
+        """
+        Reload the config file if it has changed
+
+        :returns: True if a new config was loaded
+        """
+        file_stat = self._stat()
+        if file_stat is None or file_stat == self._file_stat:
+            return False
+        self._file_stat = file_stat
+
+        try:
+            loaded_config = LoadedConfig.from_config_path(self.config_file)
+        except (OSError, yaml.YAMLError, jsonschema.exceptions.ValidationError) as e:
+            log.error("Could not reload the config file {}, keeping the previous config: {}".format(
+                self.config_file, e))
+            return False
+
+        self.current = loaded_config
+        log.info("Reloaded the config file {}".format(self.config_file))
+        return True
+
+
+class ResultCache(object):
+    """
+    The ResultCache keeps the results of the most recent QC runs, so that a runfolder which is polled
+    repeatedly is only checked once. Results are keyed by a fingerprint of the runfolder, i.e. the size and
+    modification time of the files checkQC reads, together with a hash of the config and the query
+    parameters, so that a result is never reused once any of these changes.
+
+    At most `max_size` results are kept, the least recently used ones are evicted first, and results older
+    than `ttl` seconds are not used.
+    """
+
+    def __init__(self, max_size=128, ttl=3600):
+        """
+        Create a ResultCache
+
+        :param max_size: the number of results to keep, 0 disables the cache
+        :param ttl: the number of seconds a result is kept
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def key(self, monitor_path, loaded_config, runfolder, *query):
+        """
+        Compute the key of a QC run
+
+        :param monitor_path: the directory where the runfolders are
+        :param loaded_config: the LoadedConfig used
+        :param runfolder: the name of the runfolder
+        :param query: the query parameters that affect the result
+        :returns: a hashable key, or None if the runfolder could not be found
+        """
+        runfolder_fingerprint = self._runfolder_fingerprint(
+            Path(monitor_path) / runfolder, loaded_config.input_dirs)
+        if runfolder_fingerprint is None:
+            return None
+        return (runfolder, runfolder_fingerprint, loaded_config.config_hash) + tuple(query)
+
+    def get(self, key):
+        """
+        :returns: the result stored for the key, or None if there is no result or it has expired
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        """
+        Store a result, evicting the least recently used results if the cache is full
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._results[key] = (time.monotonic(), result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+    def invalidate(self, runfolder=None):
+        """
+        Remove the results of a runfolder, or all results if no runfolder is given
+
+        :returns: the number of results removed
+        """
+        with self._lock:
+            keys = [key for key in self._results if runfolder is None or key[0] == runfolder]
+            for key in keys:
+                del self._results[key]
+            return len(keys)
+
+    @staticmethod
+    def _runfolder_fingerprint(runfolder_path, input_dirs):
+        if not runfolder_path.is_dir():
+            return None
+
+        fingerprint = []
+        for input_dir in input_dirs:
+            try:
+                entries = list(os.scandir(runfolder_path / input_dir))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    fingerprint.append((input_dir, entry.name, stat.st_size, stat.st_mtime_ns))
+        return tuple(sorted(fingerprint))
+
+
+class InFlightRequests(object):
+    """
+    InFlightRequests keeps track of the QC jobs which are running, so that concurrent identical requests
+    wait for the same job instead of each starting their own. The number of jobs started and of requests
+    which were coalesced with an already running job are counted.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.started = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, key, start_job):
+        """
+        Get the job running for the key, or start a new one
+
+        :param key: the key of the request, requests with the same key share a job. If None the request is
+                    never coalesced.
+        :param start_job: function starting the job and returning a concurrent.futures.Future
+        :returns: the future of the job
+        """
+        with self._lock:
+            if key is not None and key in self._jobs:
+                self.coalesced += 1
+                return self._jobs[key]
+
+            future = start_job()
+            self.started += 1
+            if key is not None:
+                self._jobs[key] = future
+
+        if key is not None:
+            future.add_done_callback(lambda done_future: self._remove(key, done_future))
+        return future
+
+    def _remove(self, key, future):
+        with self._lock:
+            if self._jobs.get(key) is future:
+                del self._jobs[key]
+
+    def as_dict(self):
+        return {
+            "in_flight": len(self._jobs),
+            "started": self.started,
+            "coalesced": self.coalesced,
+        }
+
+
 class CheckQCHandler(tornado.web.RequestHandler):
 
     def initialize(self, **kwargs):
         self.monitor_path = kwargs["monitoring_path"]
-        self.qc_config_file = kwargs["qc_config_file"]
+        self.config_watcher = kwargs["config_watcher"]
+        self.qc_executor = kwargs["qc_executor"]
+        self.result_cache = kwargs["result_cache"]
+        self.in_flight_requests = kwargs["in_flight_requests"]
         self.downgrade_errors_for = ()
         self.use_closest_read_length = False
 
     @staticmethod
-    def _run_check_qc(monitor_path, qc_config_file, runfolder, downgrade_errors_for,
+    def _run_check_qc(monitor_path, qc_config, runfolder, downgrade_errors_for,
                       use_closest_read_length):
         path_to_runfolder = os.path.join(monitor_path, runfolder)
-        checkqc_app = App(config_file=qc_config_file, runfolder=path_to_runfolder,
+        checkqc_app = App(config=qc_config, runfolder=path_to_runfolder,
                           downgrade_errors_for=downgrade_errors_for,
                           use_closest_read_length=use_closest_read_length)
         reports = checkqc_app.configure_and_run()
         reports["version"] = checkqc_version
         return reports
 
+    @staticmethod
+    def _run_new_check_qc(monitor_path, qc_config, runfolder, downgrade_errors_for,
+                          use_closest_read_length, demultiplexer):
+        runfolder_path = Path(monitor_path) / runfolder
+        if not runfolder_path.is_dir():
+            raise RunfolderNotFoundError(
+                f"Could not find runfolder: {runfolder_path}. "
+                "Are you sure the path is correct?"
+            )
+
+        exit_status, reports = run_new_checkqc(
+            qc_config,
+            runfolder_path,
+            downgrade_errors_for,
+            use_closest_read_length,
+            demultiplexer,
+        )
+
+        output = {}
+        try:
+            output["qc_reports"] = json.loads(reports)
+        except json.decoder.JSONDecodeError:
+            output["qc_reports"] = reports
+
+        output["version"] = checkqc_version
+        output["exit_status"] = exit_status
+        return output
+
     def _write_error(self, status_code, reason):
         self.set_header("Content-Type", "application/json")
         self.set_status(status_code=status_code)
         self.finish({"reason": reason})
 
-    def get(self, runfolder):
+    def _submit_qc_job(self, loaded_config, runfolder):
+        if self.demultiplexer == "bcl2fastq":
+            return self.qc_executor.submit(
+                self._run_check_qc,
+                self.monitor_path,
+                loaded_config.copy_config(),
+                runfolder,
+                self.downgrade_errors_for,
+                self.use_closest_read_length,
+            )
+        return self.qc_executor.submit(
+            self._run_new_check_qc,
+            self.monitor_path,
+            loaded_config.copy_config(),
+            runfolder,
+            self.downgrade_errors_for,
+            self.use_closest_read_length,
+            self.demultiplexer,
+        )
+
+    async def get(self, runfolder):
         if "downgrade" in self.request.query_arguments:
             self.downgrade_errors_for = self.get_query_argument("downgrade")
         if "useClosestReadLength" in self.request.query_arguments:
@@ -57,57 +427,198 @@ class CheckQCHandler(tornado.web.RequestHandler):
         else:
             self.demultiplexer = "bcl2fastq"
 
+        loaded_config = self.config_watcher.current
         try:
-            if self.demultiplexer == "bcl2fastq":
-                output = self._run_check_qc(
-                    self.monitor_path,
-                    self.qc_config_file,
-                    runfolder,
-                    self.downgrade_errors_for,
-                    self.use_closest_read_length,
-                )
-            else:
-                runfolder_path = Path(self.monitor_path) / runfolder
-                if not runfolder_path.is_dir():
-                    raise RunfolderNotFoundError(
-                        f"Could not find runfolder: {runfolder_path}. "
-                        "Are you sure the path is correct?"
-                    )
-
-                exit_status, reports = run_new_checkqc(
-                    self.qc_config_file,
-                    runfolder_path,
-                    self.downgrade_errors_for,
-                    self.use_closest_read_length,
-                    self.demultiplexer,
-                )
-
-                output = {}
-                try:
-                    output["qc_reports"] = json.loads(reports)
-                except json.decoder.JSONDecodeError:
-                    output["qc_reports"] = reports
-
-                output["version"] = checkqc_version
-                output["exit_status"] = exit_status
+            request_key, output_future = await self._start_qc(loaded_config, runfolder)
+        except QCQueueFullError:
+            self.set_header("Retry-After", str(self.qc_executor.retry_after))
+            self._write_error(
+                status_code=503,
+                reason="Too many QC jobs are running, please try again later."
+            )
+            return
 
+        try:
+            output = await self._qc_output(request_key, output_future)
             self.set_header("Content-Type", "application/json")
             self.write(output)
+        except (RunfolderNotFoundError, ConfigurationError) as e:
+            self._write_error(*self._qc_error(e))
 
-        except RunfolderNotFoundError:
-            self._write_error(
-                status_code=404,
-                reason="Could not find requested runfolder."
-            )
-        except ConfigurationError:
-            self._write_error(
-                status_code=500,
-                reason=(
-                    "There is a problem with the qc config. Are you sure the "
-                    "type of instrument/run configuration on the run you want "
-                    "to analyze is available in the qc config?"
-                )
+    async def _start_qc(self, loaded_config, runfolder):
+        """
+        Start checking a runfolder, unless its result is cached or it is already being checked
+
+        :returns: a tuple of the key of the request and an asyncio future of the output
+        :raises: QCQueueFullError if no more QC jobs can be started
+        """
+        # The key is a fingerprint of the files in the runfolder, so computing it must not block the IOLoop
+        request_key = await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.result_cache.key,
+            self.monitor_path,
+            loaded_config,
+            runfolder,
+            self.demultiplexer,
+            self.downgrade_errors_for,
+            self.use_closest_read_length,
+        )
+        if request_key and self.result_cache.enabled:
+            cached_output = self.result_cache.get(request_key)
+            if cached_output is not None:
+                output_future = asyncio.get_running_loop().create_future()
+                output_future.set_result(cached_output)
+                return None, output_future
+
+        future = self.in_flight_requests.submit(
+            request_key, lambda: self._submit_qc_job(loaded_config, runfolder))
+        return request_key, asyncio.wrap_future(future)
+
+    async def _qc_output(self, request_key, output_future):
+        output = await output_future
+        if request_key:
+            self.result_cache.put(request_key, output)
+        return output
+
+    @staticmethod
+    def _qc_error(exception):
+        """
+        :returns: the status code and reason to respond with when a QC job failed with the exception
+        """
+        if isinstance(exception, RunfolderNotFoundError):
+            return 404, "Could not find requested runfolder."
+        if isinstance(exception, ConfigurationError):
+            return 500, (
+                "There is a problem with the qc config. Are you sure the "
+                "type of instrument/run configuration on the run you want "
+                "to analyze is available in the qc config?"
             )
+        return 500, "QC failed: {}".format(exception)
+
+
+class BatchCheckQCHandler(CheckQCHandler):
+    """
+    Check several runfolders with the same options, e.g.:
+
+    .. code-block :: console
+
+        $ curl -X POST localhost:9999/batch/qc -d '{"runfolders": ["run1", "run2"], "demultiplexer": "bclconvert"}'
+
+    The body can also contain "downgrade", as a comma separated string or a list, and "useClosestReadLength".
+    The runfolders are checked by the worker pool, at most as many at a time as there are workers, and the
+    result of each runfolder is streamed as a line of json (NDJSON) as soon as it is done.
+    """
+
+    SUPPORTED_METHODS = ("POST",)
+
+    # Seconds to wait before trying to start a QC job again if the queue is full
+    QUEUE_FULL_BACKOFF = 0.1
+
+    def _parse_body(self):
+        try:
+            body = json.loads(self.request.body)
+        except JSONDecodeError:
+            raise HTTPError(400, reason="The body must be json")
+
+        runfolders = body.get("runfolders") if isinstance(body, dict) else None
+        if not isinstance(runfolders, list) or not all(
+                isinstance(runfolder, str) and runfolder not in ("", ".", "..") and os.sep not in runfolder
+                for runfolder in runfolders):
+            raise HTTPError(400, reason="The body must contain 'runfolders', a list of runfolder names")
+
+        downgrade_errors_for = body.get("downgrade", ())
+        if isinstance(downgrade_errors_for, list):
+            downgrade_errors_for = tuple(downgrade_errors_for)
+        self.downgrade_errors_for = downgrade_errors_for
+        self.use_closest_read_length = bool(body.get("useClosestReadLength", False))
+        self.demultiplexer = body.get("demultiplexer", "bcl2fastq")
+        return runfolders
+
+    async def _write_line(self, line):
+        self.write(json.dumps(line) + "\n")
+        await self.flush()
+
+    async def post(self):
+        try:
+            runfolders = collections.deque(self._parse_body())
+        except HTTPError as e:
+            self._write_error(status_code=e.status_code, reason=e.reason)
+            return
+
+        loaded_config = self.config_watcher.current
+        running = {}
+        started = False
+
+        self.set_header("Content-Type", "application/x-ndjson")
+        try:
+            while runfolders or running:
+                while runfolders and len(running) < self.qc_executor.max_workers:
+                    try:
+                        request_key, output_future = await self._start_qc(loaded_config, runfolders[0])
+                    except QCQueueFullError:
+                        if not started:
+                            self.set_header("Retry-After", str(self.qc_executor.retry_after))
+                            self._write_error(
+                                status_code=503,
+                                reason="Too many QC jobs are running, please try again later."
+                            )
+                            return
+                        break
+                    started = True
+                    running[asyncio.ensure_future(self._qc_output(request_key, output_future))] = \
+                        runfolders.popleft()
+
+                if not running:
+                    # The queue is full with jobs of other requests
+                    await asyncio.sleep(self.QUEUE_FULL_BACKOFF)
+                    continue
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for output_future in done:
+                    runfolder = running.pop(output_future)
+                    try:
+                        line = {"runfolder": runfolder, "status": 200, "result": output_future.result()}
+                    except Exception as e:
+                        if not isinstance(e, (RunfolderNotFoundError, ConfigurationError)):
+                            log.exception("QC of {} failed".format(runfolder))
+                        status, reason = self._qc_error(e)
+                        line = {"runfolder": runfolder, "status": status, "reason": reason}
+                    await self._write_line(line)
+        except StreamClosedError:
+            log.info("Client closed the connection before the batch was done")
+            # The jobs can be shared with coalesced requests, so rather than being cancelled they are waited
+            # for, which also caches their results for when the client retries
+            await asyncio.gather(*running, return_exceptions=True)
+            return
+
+        self.finish()
+
+
+class CacheHandler(tornado.web.RequestHandler):
+    """
+    Invalidate the cached results of a runfolder, or of all runfolders if no runfolder is given
+    """
+
+    def initialize(self, **kwargs):
+        self.result_cache = kwargs["result_cache"]
+
+    def delete(self, runfolder=None):
+        invalidated = self.result_cache.invalidate(runfolder)
+        self.set_header("Content-Type", "application/json")
+        self.write({"invalidated": invalidated})
+
+
+class StatsHandler(tornado.web.RequestHandler):
+    """
+    Report how many QC jobs have been started and how many requests were coalesced with a running job
+    """
+
+    def initialize(self, **kwargs):
+        self.in_flight_requests = kwargs["in_flight_requests"]
+
+    def get(self):
+        self.set_header("Content-Type", "application/json")
+        self.write(self.in_flight_requests.as_dict())
 
 
 class WebApp(object):
@@ -117,13 +628,29 @@ class WebApp(object):
 
     @staticmethod
     def _routes(**kwargs):
-        return [url(r"/qc/([^/]+)", CheckQCHandler, name="checkqc", kwargs=kwargs)]
+        if "config_watcher" not in kwargs:
+            kwargs["config_watcher"] = ConfigWatcher(kwargs.pop("qc_config_file", None))
+        if "qc_executor" not in kwargs:
+            kwargs["qc_executor"] = QCExecutor()
+        if "result_cache" not in kwargs:
+            kwargs["result_cache"] = ResultCache()
+        if "in_flight_requests" not in kwargs:
+            kwargs["in_flight_requests"] = InFlightRequests()
+        cache_kwargs = {"result_cache": kwargs["result_cache"]}
+        stats_kwargs = {"in_flight_requests": kwargs["in_flight_requests"]}
+        return [url(r"/qc/([^/]+)", CheckQCHandler, name="checkqc", kwargs=kwargs),
+                url(r"/batch/qc", BatchCheckQCHandler, name="checkqc_batch", kwargs=kwargs),
+                url(r"/cache", CacheHandler, name="cache", kwargs=cache_kwargs),
+                url(r"/cache/([^/]+)", CacheHandler, name="cache_runfolder", kwargs=cache_kwargs),
+                url(r"/stats", StatsHandler, name="stats", kwargs=stats_kwargs)]
 
     @staticmethod
     def _make_app(debug=False, **kwargs):
         return tornado.web.Application(WebApp._routes(**kwargs), debug=debug)
 
-    def start_web_app(self, monitoring_path, port, config_file, log_config, debug):
+    def start_web_app(self, monitoring_path, port, config_file, log_config, debug,
+                      executor="thread", workers=4, max_queue=16, cache_size=128, cache_ttl=3600,
+                      config_poll_interval=5):
         logging_config_path = ConfigFactory.get_logging_config_dict(log_config)
         logging.config.dictConfig(logging_config_path)
 
@@ -133,9 +660,23 @@ class WebApp(object):
             log.error("{} is not a directory".format(monitoring_path))
             raise AssertionError("{} is not a directory".format(monitoring_path))
 
-        web_app = self._make_app(monitoring_path=monitoring_path, qc_config_file=config_file, debug=debug)
+        log.info("Running QC in {} {} workers, with at most {} queued requests".format(
+            workers, executor, max_queue))
+        qc_executor = QCExecutor(executor=executor, max_workers=workers, max_queue=max_queue)
+
+        result_cache = ResultCache(max_size=cache_size, ttl=cache_ttl)
+        config_watcher = ConfigWatcher(config_file)
+
+        web_app = self._make_app(monitoring_path=monitoring_path, config_watcher=config_watcher, debug=debug,
+                                 qc_executor=qc_executor, result_cache=result_cache)
         web_app.listen(port=port)
-        tornado.ioloop.IOLoop.instance().start()
+        if config_file and config_poll_interval:
+            log.info("Checking {} for changes every {} seconds".format(config_file, config_poll_interval))
+            tornado.ioloop.PeriodicCallback(config_watcher.poll, config_poll_interval * 1000).start()
+        try:
+            tornado.ioloop.IOLoop.instance().start()
+        finally:
+            qc_executor.shutdown(wait=False)
 
 
 @click.command("checkqc-ws")
@@ -144,6 +685,23 @@ class WebApp(object):
 @click.option("--config", help="Path to the checkQC configuration file (optional)", type=click.Path())
 @click.option("--log_config", help="Path to the checkQC logging configuration file (optional)", type=click.Path())
 @click.option('--debug', is_flag=True, default=False, help="Enable debug mode.")
-def start(monitor_path, port=9999, config=None, log_config=None, debug=False):
+@click.option("--executor", type=click.Choice(list(QCExecutor.EXECUTORS)), default="thread",
+              help="Run QC jobs in threads or processes (default: thread).")
+@click.option("--workers", type=click.IntRange(min=1), default=4,
+              help="Number of QC jobs to run at the same time (default: 4).")
+@click.option("--max-queue", type=click.IntRange(min=0), default=16,
+              help="Number of QC jobs that can wait for a worker, further requests get a 503 response "
+                   "(default: 16).")
+@click.option("--cache-size", type=click.IntRange(min=0), default=128,
+              help="Number of QC results to cache, 0 disables the cache (default: 128).")
+@click.option("--cache-ttl", type=click.IntRange(min=0), default=3600,
+              help="Number of seconds QC results are cached (default: 3600).")
+@click.option("--config-poll-interval", type=click.IntRange(min=0), default=5,
+              help="Number of seconds between checks for changes to the config file, 0 disables reloading "
+                   "(default: 5).")
+def start(monitor_path, port=9999, config=None, log_config=None, debug=False, executor="thread", workers=4,
+          max_queue=16, cache_size=128, cache_ttl=3600, config_poll_interval=5):
     webapp = WebApp()
-    webapp.start_web_app(monitor_path, port, config, log_config, debug)
+    webapp.start_web_app(monitor_path, port, config, log_config, debug,
+                         executor=executor, workers=workers, max_queue=max_queue,
+                         cache_size=cache_size, cache_ttl=cache_ttl, config_poll_interval=config_poll_interval)
@@ -41,5 +41,27 @@ class TestQCHandler(unittest.TestCase):
         with self.assertRaises(ConfigurationError):
             mock_handler.validate_configuration()
 
+    def test_subscribed_keys_defaults_to_all(self):
+        self.assertIsNone(self.qc_handler.subscribed_keys())
+
+    def test_send_batch_goes_through_subscribe(self):
+        class FilteringQCHandler(self.MockQCHandler):
+            def __init__(self, qc_config):
+                super().__init__(qc_config)
+                self.values = []
+
+            def subscribe(self):
+                while True:
+                    key, value = yield
+                    if value > 1:
+                        self.collect((key, value))
+
+            def collect(self, signal):
+                self.values.append(signal)
+
+        handler = FilteringQCHandler({})
+        handler.send_batch("key", [1, 2, 3])
+        self.assertListEqual(handler.values, [("key", 2), ("key", 3)])
+
 if __name__ == '__main__':
     unittest.main()
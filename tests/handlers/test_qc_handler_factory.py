@@ -0,0 +1,93 @@
+import os
+import pkgutil
+import tempfile
+import unittest
+from unittest import mock
+
+import yaml
+
+from checkQC.app import App
+from checkQC.config import ConfigFactory
+from checkQC.exceptions import QCHandlerNotFound
+from checkQC.handlers.cluster_pf_handler import ClusterPFHandler
+from checkQC.handlers.qc_handler import QCHandler, QCErrorWarning
+from checkQC.handlers.qc_handler_factory import QCHandlerFactory
+from checkQC.parsers.samplesheet_parser import SamplesheetParser
+
+
+class PluginHandler(QCHandler):
+
+    def parser(self):
+        return [SamplesheetParser]
+
+    def subscribed_keys(self):
+        return ["samplesheet"]
+
+    def collect(self, signal):
+        pass
+
+    def check_qc(self):
+        yield QCErrorWarning("Warning from plugin", data={})
+
+
+class TestQCHandlerFactory(unittest.TestCase):
+
+    def setUp(self):
+        QCHandlerFactory.clear_registry()
+        self.addCleanup(QCHandlerFactory.clear_registry)
+
+    def test_create_subclass_instance(self):
+        handler = QCHandlerFactory.create_subclass_instance("ClusterPFHandler", {"warning": 1, "error": 2})
+        self.assertIsInstance(handler, ClusterPFHandler)
+        self.assertEqual(handler.qc_config, {"warning": 1, "error": 2})
+
+    def test_modules_are_only_scanned_once(self):
+        with mock.patch("checkQC.handlers.qc_handler_factory.pkgutil.iter_modules",
+                        wraps=pkgutil.iter_modules) \
+                as iter_modules:
+            QCHandlerFactory.get_handler_class("ClusterPFHandler")
+            QCHandlerFactory.get_handler_class("Q30Handler")
+        self.assertEqual(iter_modules.call_count, 1)
+
+    def test_handler_from_entry_point(self):
+        entry_point = mock.MagicMock()
+        entry_point.load.return_value = PluginHandler
+        with mock.patch("checkQC.handlers.qc_handler_factory.importlib.metadata.entry_points",
+                        return_value=[entry_point]) as entry_points:
+            self.assertIs(QCHandlerFactory.get_handler_class("MyPluginHandler"), PluginHandler)
+            self.assertIs(QCHandlerFactory.get_handler_class("MyPluginHandler"), PluginHandler)
+        entry_points.assert_called_once_with(group="checkQC.handlers", name="MyPluginHandler")
+
+    def test_unknown_handler_is_only_looked_up_once(self):
+        with mock.patch("checkQC.handlers.qc_handler_factory.importlib.metadata.entry_points",
+                        return_value=[]) as entry_points:
+            for _ in range(2):
+                with self.assertRaises(QCHandlerNotFound):
+                    QCHandlerFactory.get_handler_class("NotAHandler")
+        entry_points.assert_called_once_with(group="checkQC.handlers", name="NotAHandler")
+
+    def test_plugin_handler_from_config(self):
+        with open(os.path.join("checkQC", "default_config", "config.yaml")) as f:
+            config = yaml.safe_load(f)
+        config["default_handlers"].append({"name": "my_plugin.PluginHandler", "warning": 1, "error": "unknown"})
+
+        entry_point = mock.MagicMock()
+        entry_point.load.return_value = PluginHandler
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml") as config_file, \
+                mock.patch("checkQC.handlers.qc_handler_factory.importlib.metadata.entry_points",
+                           return_value=[entry_point]):
+            yaml.safe_dump(config, config_file)
+            config_file.flush()
+
+            ConfigFactory.from_config_path(config_file.name)
+            reports = App(runfolder="tests/resources/monitored_dir/170726_D00118_0303_BCB1TVANXX",
+                          config_file=config_file.name).configure_and_run()
+
+        self.assertEqual(reports["PluginHandler"], [
+            {"type": "warning", "message": "Warning from plugin", "data": {}}
+        ])
+
+    def test_unknown_handler(self):
+        with mock.patch("checkQC.handlers.qc_handler_factory.importlib.metadata.entry_points", return_value=[]):
+            with self.assertRaises(QCHandlerNotFound):
+                QCHandlerFactory.create_subclass_instance("NotAHandler", {})
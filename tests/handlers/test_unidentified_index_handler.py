@@ -183,5 +183,11 @@ class TestUnidentifiedIndexHandler(HandlerTestBase):
         self.assertTrue('We found a possible match for the reverse complement of tag: TTTT, on: Lane: 1, for sample: '
                         '1823A-tissue. The tag we found in the samplesheet was: AAAA.')
 
+    def test_one_index_match_from_dual_index_in_samplesheet(self):
+        hits = list(self.samplesheet_searcher.one_index_match_from_dual_index_in_samplesheet('TTTT'))
+        self.assertEqual([(hit.found_lane, hit.found_sample) for hit in hits],
+                         [(2, '1823B-tissue'), (3, '1823C-tissue')])
+        self.assertEqual(list(self.samplesheet_searcher.one_index_match_from_dual_index_in_samplesheet('ACGT')), [])
+
 if __name__ == '__main__':
     unittest.main()
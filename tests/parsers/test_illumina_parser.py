@@ -1,10 +1,16 @@
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from checkQC.parsers.illumina import (
+    _first_row_per_lane_and_sample,
+    _interop_metric_groups,
     _read_interop_summary,
     _read_demultiplexing_metrics,
+    _read_demultiplexing_metrics_columns,
+    _read_top_unknown_barcodes,
+    _sum_per_lane,
     _read_run_metadata,
     _read_samplesheet,
 )
@@ -28,6 +34,24 @@ def test_read_interop_summary(runfolder_path):
     assert sample_id == "Sample_14574-Qiagen-IndexSet1-SP-Lane1"
 
 
+def test_read_interop_summary_only_loads_requested_metrics(runfolder_path):
+    run_summary, index_summary, _ = _read_interop_summary(
+        runfolder_path,
+        _interop_metric_groups(["cluster_pf"]),
+    )
+
+    assert run_summary.at(0).at(0).reads_pf() == 532464327
+    assert index_summary.size() == 0
+
+
+def test_interop_metric_groups():
+    assert _interop_metric_groups(None) is None
+    assert _interop_metric_groups(["cluster_pf", "undetermined_percentage"]) == []
+    assert sorted(_interop_metric_groups(["reads_per_sample", "error_rate"])) == [
+        "Error", "Index"]
+    assert _interop_metric_groups(["cluster_pf", "unknown_checker"]) is None
+
+
 def test_read_quality_metrics(runfolder_path):
     quality_metrics = _read_demultiplexing_metrics(
             runfolder_path / "Reports/Quality_Metrics.csv")
@@ -81,6 +105,78 @@ def test_read_to_unknown_barcodes(runfolder_path):
     ]
 
 
+def test_read_quality_metrics_columns(runfolder_path):
+    quality_metrics = _read_demultiplexing_metrics_columns(
+        runfolder_path / "Reports/Quality_Metrics.csv",
+        {"Lane": "int64", "SampleID": "str", "Yield": "int64", "% Q30": "float64"},
+    )
+
+    assert list(quality_metrics) == ["Lane", "SampleID", "Yield", "% Q30"]
+    assert quality_metrics["Lane"].tolist() == [1, 1, 1, 2, 2, 2]
+    assert quality_metrics["SampleID"][0] == "Sample_14574-Qiagen-IndexSet1-SP-Lane1"
+    assert quality_metrics["Yield"].dtype == np.int64
+    assert quality_metrics["Yield"][0] == 357120
+    assert quality_metrics["% Q30"][0] == 0.96
+
+
+def test_read_top_unknown_barcodes(runfolder_path):
+    metrics_path = runfolder_path / "Reports/Top_Unknown_Barcodes.csv"
+
+    top_unknown_barcodes = _read_top_unknown_barcodes(metrics_path)
+    assert sum(len(barcodes) for barcodes in top_unknown_barcodes.values()) == 2084
+    assert top_unknown_barcodes[1][0] == {
+        "index": "ATATCTGCTT",
+        "index2": "TAGACAATCT",
+        "count": 12857,
+    }
+
+    top_unknown_barcodes = _read_top_unknown_barcodes(
+        metrics_path, min_count_per_lane={1: 12177, 2: float("inf")})
+    assert [barcode["count"] for barcode in top_unknown_barcodes[1]] == [
+        12857, 12406, 12177]
+    assert 2 not in top_unknown_barcodes
+
+    top_unknown_barcodes = _read_top_unknown_barcodes(metrics_path, top_n=2)
+    assert [barcode["count"] for barcode in top_unknown_barcodes[1]] == [
+        12857, 12406]
+    assert len(top_unknown_barcodes[2]) == 2
+
+
+def test_read_demultiplexing_metrics_columns_with_missing_values(tmp_path):
+    metrics_path = tmp_path / "Demultiplex_Stats.csv"
+    metrics_path.write_text(
+        "Lane,SampleID,% Reads,% Perfect Index Reads\n"
+        "1,NA,0.5,NaN\n"
+        "1,Undetermined,0.5,\n"
+    )
+
+    metrics = _read_demultiplexing_metrics_columns(
+        metrics_path,
+        {"Lane": "int64", "SampleID": "str", "% Reads": "float64",
+         "% Perfect Index Reads": "float64"},
+    )
+
+    assert metrics["SampleID"].tolist() == ["NA", "Undetermined"]
+    assert metrics["% Reads"].tolist() == [0.5, 0.5]
+    assert np.isnan(metrics["% Perfect Index Reads"]).all()
+
+
+def test_sum_per_lane():
+    assert _sum_per_lane(
+        np.array([1, 2, 1, 2, 3]),
+        np.array([1, 10, 2, 20, 5]),
+    ) == {1: 3, 2: 30, 3: 5}
+
+
+def test_first_row_per_lane_and_sample():
+    metrics = {
+        "Lane": np.array([1, 1, 2]),
+        "SampleID": np.array(["A", "A", "A"]),
+    }
+
+    assert _first_row_per_lane_and_sample(metrics) == {(1, "A"): 0, (2, "A"): 2}
+
+
 # TODO add tests with paired end reads
 def test_read_run_metadata(runfolder_path):
     instrument, read_length = _read_run_metadata(runfolder_path)
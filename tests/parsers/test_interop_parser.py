@@ -2,6 +2,7 @@
 from pathlib import Path
 
 import unittest
+from unittest import mock
 
 import pandas as pd
 import numpy as np
@@ -126,3 +127,50 @@ class TestInteropParser(unittest.TestCase):
         for cycle in filtered_q30_per_cycle:
             self.assertTrue(np.isclose(
                 expected_out[cycle], filtered_q30_per_cycle[cycle]))
+
+    def test_percent_q30_per_cycle_not_computed_without_consumer(self):
+        class Q30Receiver(self.Receiver):
+            def subscribed_keys(self):
+                return ["percent_q30"]
+
+        interop_parser = InteropParser(runfolder=self.runfolder,
+                                       parser_configurations=None)
+        subscriber = Q30Receiver()
+        interop_parser.add_subscribers(subscriber)
+
+        with mock.patch("checkQC.parsers.interop_parser.imaging") as imaging_mock:
+            interop_parser.run()
+
+        imaging_mock.assert_not_called()
+        self.assertListEqual(subscriber.metrics['percent_q30_per_cycle'], [])
+        self.assertEqual(len(subscriber.metrics['percent_q30']), 4)
+
+    def test_get_percent_q30_per_cycle_for_all_reads(self):
+        q_metrics = pd.DataFrame({
+            "Lane": [1, 1, 1, 1, 2, 2, 2],
+            "Read": [1, 1, 1, 2, 1, 1, 1],
+            "Cycle Within Read": [1, 1, 2, 1, 1, 2, 10],
+            "%>= Q30": [90., 80., 70., 60., np.nan, 50., 40.],
+        })
+
+        percent_q30_per_cycle = InteropParser.get_percent_q30_per_cycle_for_all_reads(
+            q_metrics,
+            index_reads=[0, 1],
+        )
+
+        self.assertEqual(sorted(percent_q30_per_cycle), [(0, 0), (0, 1), (1, 0)])
+        self.assertDictEqual(percent_q30_per_cycle[(0, 0)], {1: 85., 2: 70.})
+        self.assertDictEqual(percent_q30_per_cycle[(0, 1)], {1: 60.})
+        lane_2 = percent_q30_per_cycle[(1, 0)]
+        self.assertEqual(list(lane_2), list(range(1, 11)))
+        self.assertTrue(np.isnan(lane_2[1]))
+        self.assertTrue(np.isnan(lane_2[5]))
+        self.assertEqual(lane_2[2], 50.)
+        self.assertEqual(lane_2[10], 40.)
+
+        percent_q30_per_cycle = InteropParser.get_percent_q30_per_cycle_for_all_reads(
+            q_metrics,
+            index_reads=[],
+        )
+        self.assertDictEqual(percent_q30_per_cycle[(0, 0)], {})
+        self.assertEqual(list(percent_q30_per_cycle[(1, 0)]), [6, 7, 8, 9])
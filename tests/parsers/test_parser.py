@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from checkQC.handlers.qc_handler import Subscriber
+from checkQC.parsers.parser import Parser
+
+
+class TestParser(TestCase):
+
+    class Receiver(Subscriber):
+
+        def __init__(self, keys):
+            super().__init__()
+            self.keys = keys
+            self.values = []
+
+        def collect(self, signal):
+            self.values.append(signal)
+
+        def subscribed_keys(self):
+            return self.keys
+
+    def setUp(self):
+        self.parser = Parser()
+        self.foo_receiver = self.Receiver(["foo"])
+        self.bar_receiver = self.Receiver(["bar"])
+        self.all_receiver = self.Receiver(None)
+        self.parser.add_subscribers([self.foo_receiver, self.bar_receiver, self.all_receiver])
+
+    def test_signals_are_routed_by_key(self):
+        self.parser._send_to_subscribers(("foo", 1))
+        self.parser._send_to_subscribers(("baz", 2))
+
+        self.assertListEqual(self.foo_receiver.values, [("foo", 1)])
+        self.assertListEqual(self.bar_receiver.values, [])
+        self.assertListEqual(self.all_receiver.values, [("foo", 1), ("baz", 2)])
+
+    def test_send_batch(self):
+        self.parser._send_batch_to_subscribers("bar", [1, 2])
+
+        self.assertListEqual(self.foo_receiver.values, [])
+        self.assertListEqual(self.bar_receiver.values, [("bar", 1), ("bar", 2)])
+        self.assertListEqual(self.all_receiver.values, [("bar", 1), ("bar", 2)])
+
+    def test_subscriptions(self):
+        self.assertDictEqual(
+            self.parser.subscriptions(["foo", "baz"]),
+            {"foo": [self.foo_receiver, self.all_receiver], "baz": [self.all_receiver]})
+        self.assertTrue(self.parser._has_subscribers_for("baz"))
+
+        new_receiver = self.Receiver(["baz"])
+        self.parser.add_subscribers(new_receiver)
+        self.assertListEqual(self.parser.subscribers_for("baz"), [self.all_receiver, new_receiver])
@@ -42,6 +42,24 @@ class TestStatsJsonParser(unittest.TestCase):
     def test_read_flowcell_name(self):
         self.assertListEqual(self.subscriber.values, ["CB1TVANXX"])
 
+    def test_only_sends_subscribed_keys(self):
+        class KeyReceiver(object):
+            def __init__(self):
+                self.keys = []
+
+            def subscribed_keys(self):
+                return ["ConversionResults", "Flowcell"]
+
+            def send(self, value):
+                key, _ = value
+                self.keys.append(key)
+
+        stats_json_parser = StatsJsonParser(runfolder=self.runfolder, parser_configurations=self.parser_configs)
+        receiver = KeyReceiver()
+        stats_json_parser.add_subscribers(receiver)
+        stats_json_parser.run()
+        self.assertListEqual(receiver.keys, ["Flowcell", "ConversionResults"])
+
     def test_init_stats_json_parser_without_valid_parser_config(self):
         with self.assertRaises(ConfigurationError):
             StatsJsonParser("", parser_configurations={"StatsJsonParser": ""})
@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+
+from checkQC.parsers.utils import JsonObjectStream, LazySections
+
+
+def test_lazy_sections():
+    loaded = []
+
+    def load_section(key):
+        loaded.append(key)
+        return key.upper()
+
+    sections = LazySections(["a", "b"], load_section)
+
+    assert len(sections) == 2
+    assert list(sections) == ["a", "b"]
+    assert loaded == []
+
+    assert sections["a"] == "A"
+    assert sections["a"] == "A"
+    assert loaded == ["a"]
+
+    assert sections == {"a": "A", "b": "B"}
+    assert loaded == ["a", "b"]
+
+    with pytest.raises(KeyError):
+        sections["c"]
+
+
+def test_lazy_sections_do_not_hide_load_errors():
+    def load_section(key):
+        raise KeyError("column")
+
+    sections = LazySections(["a"], load_section)
+
+    assert "a" in sections
+    assert "b" not in sections
+    assert sections.get("b") is None
+    with pytest.raises(KeyError, match="column"):
+        sections.get("a")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 2**20])
+def test_json_object_stream(chunk_size):
+    text = (
+        '{"Flowcell": "CB1TVANXX", "Tiles": [{"id": "]}\\"{"}, 1.5e3],'
+        ' "Esc\\"aped": "a\\\\", "Empty": {}, "Missing": null, "Flag": true,'
+        ' "Sample": "Ångström"}'
+    ).encode("utf-8")
+
+    items = JsonObjectStream(io.BytesIO(text), chunk_size=chunk_size).items()
+    assert dict(items) == json.loads(text)
+
+    items = JsonObjectStream(io.BytesIO(text), chunk_size=chunk_size).items(
+        {"Esc\"aped", "Flag"})
+    assert list(items) == [("Esc\"aped", "a\\"), ("Flag", True)]
+
+
+def test_json_object_stream_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonObjectStream(io.BytesIO(b'{"a": [1, 2}')).items({"b"}))
+
+    with pytest.raises(json.JSONDecodeError):
+        list(JsonObjectStream(io.BytesIO(b'{"a": 1 "b": 2}')).items())
@@ -1,6 +1,8 @@
 from collections import namedtuple
 
-from checkQC.qc_checkers.unidentified_index import unidentified_index, SamplesheetMatcher
+from checkQC.qc_checkers.unidentified_index import (
+    unidentified_index, SamplesheetMatcher, MismatchIndex,
+)
 
 import pytest
 
@@ -220,3 +222,70 @@ def test_whitelist_index(qc_data):
         "This barcode is white-listed."
     )
     assert reports[0].type() == "warning"
+
+
+def test_check_complement_and_reverse_cause_order():
+    samplesheet_matcher = SamplesheetMatcher([
+        {"index": "AACC", "index2": "", "Lane": 1, "Sample_ID": "reverse"},
+        {"index": "TTGG", "index2": "", "Lane": 1, "Sample_ID": "reverse complement"},
+        {"index": "CCAA", "index2": "", "Lane": 2, "Sample_ID": "reverse"},
+    ])
+    barcode_data = {
+        "barcode": {"index": "CCAA", "index2": ""},
+        "lane": 2,
+    }
+
+    causes = samplesheet_matcher.check_complement_and_reverse(barcode_data)
+
+    assert [data for _, data in causes] == [
+        ("reverse", {"index": "AACC", "index2": "", "Lane": 1, "Sample_ID": "reverse"}),
+        ("reverse complement",
+         {"index": "TTGG", "index2": "", "Lane": 1, "Sample_ID": "reverse complement"}),
+    ]
+
+
+def test_near_match():
+    samplesheet_matcher = SamplesheetMatcher(
+        [
+            {"index": "AAGGTT", "index2": "", "Lane": 1, "Sample_ID": "two"},
+            {"index": "ACGGTT", "index2": "", "Lane": 1, "Sample_ID": "three"},
+            {"index": "AAGGTA", "index2": "", "Lane": 2, "Sample_ID": "one"},
+            {"index": "AAGG", "index2": "CCTT", "Lane": 1, "Sample_ID": "dual"},
+        ],
+        max_mismatches=2,
+    )
+
+    causes = samplesheet_matcher.check_near_match(
+        {"barcode": {"index": "AAGGAA"}, "lane": 1})
+    assert [msg for msg, _ in causes] == [
+        "near match: index \"AAGGTA\" (1 mismatch) found in samplesheet for sample \"one\", lane 2",
+        "near match: index \"AAGGTT\" (2 mismatches) found in samplesheet for sample \"two\", lane 1",
+    ]
+    assert causes[0][1] == (
+        "near match",
+        {"index": "AAGGTA", "index2": "", "Lane": 2, "Sample_ID": "one"},
+    )
+
+    causes = samplesheet_matcher.check_near_match(
+        {"barcode": {"index": "AAGG", "index2": "CCTA"}, "lane": 1})
+    assert [data[1]["Sample_ID"] for _, data in causes] == ["dual"]
+
+
+def test_mismatch_index():
+    index = MismatchIndex(["ACGTACGT", "ACGTACGA", "TTTTTTTT", "ACGT"], 1)
+
+    assert index.search("ACGTACGT") == [("ACGTACGA", 1)]
+    assert index.search("ACCTTCGA") == []
+    assert index.search("ACTT") == [("ACGT", 1)]
+
+
+def test_unidentified_index_near_match(qc_data):
+    reports = unidentified_index(qc_data, 5., max_mismatches=2)
+
+    assert str(reports[0]).endswith(
+        "\n- near match: index \"TCCA\" (2 mismatches) found in samplesheet"
+        " for sample \"reverse\", lane 1"
+    )
+    assert [cause for cause, _ in reports[0].data["causes"]] == [
+        "reverse", "lane swap", "near match"]
+    assert reports[1].data["causes"] == []
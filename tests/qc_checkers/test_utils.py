@@ -1,4 +1,9 @@
-from checkQC.qc_checkers.utils import handler2checker
+import numpy as np
+
+from checkQC.qc_checkers.utils import (
+    ERROR, OK, WARNING, evaluate_thresholds, handler2checker,
+)
+
 
 def test_handler2checker():
     assert handler2checker("ErrorRateHandler") == "error_rate"
@@ -12,3 +17,23 @@ def test_handler2checker():
     ]:
         assert handler2checker(checker) == checker
 
+
+
+def test_evaluate_thresholds():
+    levels = evaluate_thresholds(
+        [10, 5, 1, np.nan], error_threshold=2, warning_threshold=6)
+    assert list(levels) == [OK, WARNING, ERROR, OK]
+
+
+def test_evaluate_thresholds_higher_is_worse():
+    levels = evaluate_thresholds(
+        [1, 5, 10], error_threshold=6, warning_threshold=2,
+        higher_is_worse=True)
+    assert list(levels) == [OK, WARNING, ERROR]
+
+
+def test_evaluate_thresholds_unknown_and_per_value_thresholds():
+    levels = evaluate_thresholds(
+        [1, 5, 10], error_threshold="unknown",
+        warning_threshold=np.array([0, 6, 20]))
+    assert list(levels) == [OK, WARNING, WARNING]
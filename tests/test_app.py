@@ -1,9 +1,13 @@
+import json
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
 from checkQC.app import App
 from checkQC.app import run_new_checkqc
+from checkQC.parsers.interop_parser import InteropParser
+from checkQC.profiler import Profiler
 
 
 @pytest.fixture
@@ -48,6 +52,21 @@ def test_run_downgrade_error(bcl2fastq_runfolder_path):
     assert app.run() == 0
 
 
+@pytest.mark.parametrize("parser_executor", ["thread", "process"])
+def test_run_parsers_concurrently(bcl2fastq_runfolder_path, parser_executor):
+    expected_reports = App(runfolder=bcl2fastq_runfolder_path).configure_and_run()
+
+    app = App(
+        runfolder=bcl2fastq_runfolder_path,
+        parser_workers=4,
+        parser_executor=parser_executor,
+    )
+    reports = app.configure_and_run()
+
+    assert reports == expected_reports
+    assert app.exit_status == 1
+
+
 def test_run_new_checkqc(bclconvert_runfolder_path):
     exit_status, reports = run_new_checkqc(
         None,
@@ -62,3 +81,58 @@ def test_run_new_checkqc(bclconvert_runfolder_path):
 
     assert exit_status == 1
     assert reports + '\n' == expected_data
+
+
+def test_run_fail_fast_skips_expensive_parsers(bcl2fastq_runfolder_path):
+    expected_reports = App(runfolder=bcl2fastq_runfolder_path).configure_and_run()
+
+    with mock.patch.object(InteropParser, "run") as interop_run:
+        app = App(runfolder=bcl2fastq_runfolder_path, fail_fast=True)
+        reports = app.configure_and_run()
+
+    # The reads per sample handler, which only needs Stats.json, fails
+    interop_run.assert_not_called()
+    assert app.exit_status == 1
+    assert reports["ReadsPerSampleHandler"] == expected_reports["ReadsPerSampleHandler"]
+
+
+def test_run_new_checkqc_fail_fast(bclconvert_runfolder_path):
+    with mock.patch(
+        "checkQC.parsers.illumina._read_top_unknown_barcodes",
+    ) as read_top_unknown_barcodes:
+        exit_status, reports = run_new_checkqc(
+            None,
+            bclconvert_runfolder_path,
+            downgrade_errors_for=[],
+            use_closest_read_length=True,
+            demultiplexer="bclconvert",
+            fail_fast=True,
+        )
+
+    # The error rate checker fails before the unknown barcodes are needed
+    read_top_unknown_barcodes.assert_not_called()
+    assert exit_status == 1
+    lane_reports = json.loads(reports)["lane_reports"]
+    assert {
+        checker
+        for checkers in lane_reports.values()
+        for checker in checkers
+    } == {"error_rate"}
+
+
+@pytest.mark.parametrize("parser_workers, parser_executor", [(None, "thread"), (2, "thread"), (2, "process")])
+def test_run_profile(bcl2fastq_runfolder_path, parser_workers, parser_executor):
+    profiler = Profiler()
+    app = App(
+        runfolder=bcl2fastq_runfolder_path,
+        profiler=profiler,
+        parser_workers=parser_workers,
+        parser_executor=parser_executor,
+    )
+    reports = app.configure_and_run()
+    profiler.stop()
+
+    stages = [stage["stage"] for stage in reports["profile"]["stages"]]
+    assert stages[:2] == ["config", "run_type_recognition"]
+    assert "parser:InteropParser" in stages
+    assert "handler:ReadsPerSampleHandler" in stages
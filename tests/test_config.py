@@ -2,8 +2,10 @@
 import unittest
 import tempfile
 import json
+import os
 
 import jsonschema
+import yaml
 
 from checkQC.config import Config, ConfigFactory
 
@@ -107,6 +109,19 @@ class TestConfigFactory(unittest.TestCase):
             with self.assertRaises(jsonschema.ValidationError):
                 ConfigFactory.from_config_path(f.name)
 
+    def test_config_validation_misspelled_handler(self):
+        with open(os.path.join("checkQC", "default_config", "config.yaml")) as f:
+            config = yaml.safe_load(f)
+
+        for name in ["ClustrPFHandler", "ClusterPfHandler"]:
+            config["default_handlers"] = [{"name": name, "warning": 1, "error": 2}]
+            with tempfile.NamedTemporaryFile(mode='w', suffix=".yaml") as f:
+                yaml.safe_dump(config, f)
+                f.flush()
+
+                with self.assertRaises(jsonschema.ValidationError):
+                    ConfigFactory.from_config_path(f.name)
+
     def test_get_logging_config_file_default(self):
         result = ConfigFactory.get_logging_config_dict(None)
         default_config = {'version': 1, 'disable_existing_loggers': False,
@@ -49,3 +49,34 @@ def test_checkqc_default_config(runfolder_data):
 
     assert result.exit_code == 1
     assert result.output == expected_data
+
+
+def test_checkqc_profile(runfolder_data, tmp_path):
+    runfolder_path, expected_data = runfolder_data
+    profile_path = tmp_path / "profile.json"
+    runner = CliRunner(mix_stderr=False)
+    result = runner.invoke(
+        start,
+        [
+            "--demultiplexer", "bclconvert",
+            "--use-closest-read-length",
+            "--profile", str(profile_path),
+            runfolder_path,
+        ],
+    )
+
+    assert result.exit_code == 1
+    output = json.loads(result.output)
+    expected_output = json.loads(expected_data)
+    assert output["lane_reports"] == expected_output["lane_reports"]
+
+    profile = json.loads(profile_path.read_text())
+    stages = [stage["stage"] for stage in profile["stages"]]
+    assert stages[:3] == ["config", "run_type_recognition", "qc_data"]
+    assert "checker:reads_per_sample" in stages
+    assert stages[-1] == "view"
+    assert [stage["stage"] for stage in output["profile"]["stages"]] == stages
+    for stage in profile["stages"]:
+        assert stage["wall_time"] >= 0
+        assert stage["cpu_time"] >= 0
+        assert stage["peak_memory"] >= 0
@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+import tracemalloc
+
+from checkQC.profiler import Profiler
+
+
+def test_profiler(tmp_path):
+    profiler = Profiler()
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            data = [0] * 100_000
+        del data
+    profiler.stop()
+
+    stages = profiler.as_dict()["stages"]
+    assert [stage["stage"] for stage in stages] == ["outer", "inner"]
+    outer, inner = stages
+    assert inner["peak_memory"] >= 700_000
+    assert outer["peak_memory"] >= inner["peak_memory"]
+    assert outer["wall_time"] >= inner["wall_time"]
+    assert not tracemalloc.is_tracing()
+
+    profiler.write(tmp_path / "profile.json")
+    assert json.loads((tmp_path / "profile.json").read_text()) == profiler.as_dict()
+
+
+def test_profiler_keeps_peak_of_parent_stage():
+    profiler = Profiler()
+    with profiler.stage("outer"):
+        data = [0] * 100_000
+        del data
+        with profiler.stage("inner"):
+            pass
+    profiler.stop()
+
+    outer, inner = profiler.as_dict()["stages"]
+    assert outer["peak_memory"] >= 700_000
+    assert inner["peak_memory"] < 700_000
+
+
+def test_profiler_stages_in_threads():
+    profiler = Profiler()
+    started = threading.Barrier(2)
+
+    def sleep():
+        with profiler.stage("sleep"):
+            started.wait()
+            time.sleep(0.2)
+
+    def allocate():
+        with profiler.stage("allocate"):
+            started.wait()
+            data = [0] * 100_000
+            del data
+
+    with profiler.stage("threads"):
+        threads = [threading.Thread(target=sleep), threading.Thread(target=allocate)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    profiler.stop()
+
+    stages = {stage["stage"]: stage for stage in profiler.as_dict()["stages"]}
+    assert stages.keys() == {"threads", "sleep", "allocate"}
+    assert stages["sleep"]["wall_time"] >= 0.2
+    assert stages["sleep"]["cpu_time"] < 0.1
+    assert stages["threads"]["cpu_time"] < 0.1
+    assert stages["allocate"]["peak_memory"] >= 700_000
+    assert stages["threads"]["peak_memory"] >= 700_000
+
+
+def test_disabled_profiler():
+    profiler = Profiler.disabled()
+    with profiler.stage("stage"):
+        pass
+    assert profiler.as_dict() == {"stages": []}
+    assert not tracemalloc.is_tracing()
@@ -1,8 +1,16 @@
 from pathlib import Path
+import shutil
+from unittest import mock
+import numpy
+import pandas
 import pytest
+from interop.py_interop_metrics import index_out_of_bounds_exception
+from interop.py_interop_run import xml_file_not_found_exception
 
+from checkQC.exceptions import ConfigurationError
 from checkQC.qc_data_utils import bclconvert_test_runfolder
 from checkQC.qc_data import QCData
+from checkQC.parsers.illumina import _read_demultiplexing_metrics_columns
 
 from tests.test_utils import float_eq
 
@@ -54,3 +62,197 @@ def test_qc_data(bclconvert_runfolder):
                                 assert expected_read_metric_value == read_metric_value
                 case _:
                     assert lane_data[lane_metric] == expected_lane_metric_value
+
+
+@pytest.mark.parametrize("loader_workers", [None, 2])
+def test_qc_data_only_loads_metrics_for_checkers(tmp_path, loader_workers):
+    runfolder_path = tmp_path / "200624_A00834_0183_BHMTFYTINY"
+    shutil.copytree(
+        Path(__file__).parent / "resources/bclconvert/200624_A00834_0183_BHMTFYTINY",
+        runfolder_path,
+    )
+    (runfolder_path / "InterOp/IndexMetricsOut.bin").unlink()
+    parser_config = {"reports_location": "Reports", "loader_workers": loader_workers}
+
+    # The index metrics are not needed, their absence goes unnoticed
+    qc_data = QCData.from_bclconvert(
+        runfolder_path,
+        parser_config,
+        checkers={"cluster_pf": {"error_threshold": 1, "warning_threshold": 2}},
+    )
+
+    assert qc_data.sequencing_metrics[1]["total_reads_pf"] == 532464327
+    assert qc_data.sequencing_metrics[1]["reads_per_sample"] == []
+    assert qc_data.sequencing_metrics[1]["top_unknown_barcodes"] == []
+
+    # The index metrics are needed, so they must not be missing
+    with pytest.raises(index_out_of_bounds_exception):
+        QCData.from_bclconvert(
+            runfolder_path,
+            parser_config,
+            checkers={"reads_per_sample": {"error_threshold": 90, "warning_threshold": 91}},
+        )
+
+
+def test_qc_data_only_keeps_significant_unknown_barcodes():
+    runfolder_path = Path(__file__).parent / f"resources/bclconvert/200624_A00834_0183_BHMTFYTINY"
+    qc_data = QCData.from_bclconvert(
+        runfolder_path,
+        {"reports_location": "Reports"},
+        checkers={"unidentified_index": {"significance_threshold": 0.0023}},
+    )
+
+    top_unknown_barcodes = qc_data.sequencing_metrics[1]["top_unknown_barcodes"]
+    assert [barcode["count"] for barcode in top_unknown_barcodes] == [12857, 12406]
+
+
+@pytest.mark.parametrize("top_n", [0, -1, 1.5, "10", True])
+def test_qc_data_invalid_top_unknown_barcodes_per_lane(top_n):
+    runfolder_path = Path(__file__).parent / f"resources/bclconvert/200624_A00834_0183_BHMTFYTINY"
+    with pytest.raises(ConfigurationError, match="top_unknown_barcodes_per_lane"):
+        QCData.from_bclconvert(
+            runfolder_path,
+            {"reports_location": "Reports", "top_unknown_barcodes_per_lane": top_n},
+        )
+
+
+def test_qc_data_top_unknown_barcodes_per_lane():
+    runfolder_path = Path(__file__).parent / f"resources/bclconvert/200624_A00834_0183_BHMTFYTINY"
+    qc_data = QCData.from_bclconvert(
+        runfolder_path,
+        {"reports_location": "Reports", "top_unknown_barcodes_per_lane": 1},
+    )
+
+    top_unknown_barcodes = qc_data.sequencing_metrics[1]["top_unknown_barcodes"]
+    assert [barcode["count"] for barcode in top_unknown_barcodes] == [12857]
+
+
+def test_qc_data_sections_are_computed_on_demand():
+    runfolder_path = Path(__file__).parent / f"resources/bclconvert/200624_A00834_0183_BHMTFYTINY"
+    with mock.patch(
+        "checkQC.parsers.illumina._read_demultiplexing_metrics_columns",
+        wraps=_read_demultiplexing_metrics_columns,
+    ) as read_metrics:
+        qc_data = QCData.from_bclconvert(
+            runfolder_path,
+            {"reports_location": "Reports"},
+        )
+        read_files = [call.args[0].name for call in read_metrics.call_args_list]
+        assert read_files == ["Quality_Metrics.csv", "Demultiplex_Stats.csv"]
+
+    assert repr(qc_data.sequencing_metrics[1]) == "LazySections(loaded=[])"
+    assert qc_data.sequencing_metrics[1]["yield"] == 122_605_416
+    assert qc_data.sequencing_metrics[2]["yield"] == 124_497_108
+    assert repr(qc_data.sequencing_metrics[1]) == "LazySections(loaded=['yield'])"
+
+
+def test_qc_data_load_on_demand():
+    runfolder_path = Path(__file__).parent / f"resources/bclconvert/200624_A00834_0183_BHMTFYTINY"
+    with mock.patch(
+        "checkQC.parsers.illumina._read_demultiplexing_metrics_columns",
+        wraps=_read_demultiplexing_metrics_columns,
+    ) as read_metrics:
+        qc_data = QCData.from_bclconvert(
+            runfolder_path,
+            {"reports_location": "Reports"},
+            load_on_demand=True,
+        )
+        assert read_metrics.call_count == 0
+
+        assert qc_data.sequencing_metrics[1]["yield"] == 122_605_416
+        read_files = [call.args[0].name for call in read_metrics.call_args_list]
+        assert read_files == ["Quality_Metrics.csv"]
+
+
+def test_qc_data_report_with_nan(tmp_path):
+    runfolder_path = tmp_path / "200624_A00834_0183_BHMTFYTINY"
+    shutil.copytree(
+        Path(__file__).parent / "resources/bclconvert/200624_A00834_0183_BHMTFYTINY",
+        runfolder_path,
+    )
+    demultiplex_stats_path = runfolder_path / "Reports/Demultiplex_Stats.csv"
+    demultiplex_stats = pandas.read_csv(demultiplex_stats_path, dtype=str)
+    demultiplex_stats.loc[
+        demultiplex_stats["SampleID"] == "Undetermined", "% Perfect Index Reads"
+    ] = "NaN"
+    demultiplex_stats.to_csv(demultiplex_stats_path, index=False)
+
+    qc_data = QCData.from_bclconvert(runfolder_path, {"reports_location": "Reports"})
+
+    reads_per_sample = qc_data.sequencing_metrics[1]["reads_per_sample"]
+    assert reads_per_sample[0]["percent_perfect_index_reads"] == 97.96
+
+
+@pytest.mark.parametrize("loader_workers", [None, 2])
+@pytest.mark.parametrize("column, value, error", [
+    ("% Q30", None, KeyError),
+    ("Yield", "many", ValueError),
+])
+def test_qc_data_invalid_report(tmp_path, loader_workers, column, value, error):
+    runfolder_path = tmp_path / "200624_A00834_0183_BHMTFYTINY"
+    shutil.copytree(
+        Path(__file__).parent / "resources/bclconvert/200624_A00834_0183_BHMTFYTINY",
+        runfolder_path,
+    )
+    quality_metrics_path = runfolder_path / "Reports/Quality_Metrics.csv"
+    quality_metrics = pandas.read_csv(quality_metrics_path, dtype=str)
+    if value is None:
+        quality_metrics = quality_metrics.drop(columns=column)
+    else:
+        quality_metrics[column] = value
+    quality_metrics.to_csv(quality_metrics_path, index=False)
+
+    # As when the reports were read up front, the error is raised when
+    # QCData is created rather than by the first checker using the report
+    with pytest.raises(error, match=column if error is KeyError else value):
+        QCData.from_bclconvert(
+            runfolder_path,
+            {"reports_location": "Reports", "loader_workers": loader_workers},
+        )
+
+
+def test_qc_data_loaded_concurrently(bclconvert_runfolder):
+    runfolder_path = Path(__file__).parent / f"resources/bclconvert/200624_A00834_0183_BHMTFYTINY"
+    qc_data = QCData.from_bclconvert(
+        runfolder_path,
+        {"reports_location": "Reports", "loader_workers": 4},
+    )
+    expected = bclconvert_runfolder["qc_data"]
+
+    assert qc_data.instrument == expected.instrument
+    assert qc_data.read_length == expected.read_length
+    assert qc_data.samplesheet == expected.samplesheet
+    for lane, lane_data in expected.sequencing_metrics.items():
+        for section in lane_data:
+            numpy.testing.assert_equal(
+                qc_data.sequencing_metrics[lane][section], lane_data[section])
+
+
+def test_qc_data_concurrent_loading_raises_errors(tmp_path):
+    with pytest.raises(xml_file_not_found_exception):
+        QCData.from_bclconvert(
+            tmp_path,
+            {"reports_location": "Reports", "loader_workers": 2},
+        )
+
+
+@pytest.mark.parametrize("loader_workers", [None, 2])
+@pytest.mark.parametrize("checkers", [
+    None, {"cluster_pf": {"error_threshold": 1, "warning_threshold": 2}}])
+def test_qc_data_missing_reports(tmp_path, loader_workers, checkers):
+    runfolder_path = tmp_path / "200624_A00834_0183_BHMTFYTINY"
+    shutil.copytree(
+        Path(__file__).parent / "resources/bclconvert/200624_A00834_0183_BHMTFYTINY",
+        runfolder_path,
+        ignore=shutil.ignore_patterns("Reports"),
+    )
+    # The reports are checked before the samplesheet is read, as they used to be
+    (runfolder_path / "SampleSheet.csv").write_text("[Header]\n")
+    with pytest.raises(
+            FileNotFoundError,
+            match="No such file or directory: .*Reports/Quality_Metrics.csv"):
+        QCData.from_bclconvert(
+            runfolder_path,
+            {"reports_location": "Reports", "loader_workers": loader_workers},
+            checkers=checkers,
+        )
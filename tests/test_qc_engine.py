@@ -1,6 +1,7 @@
 from unittest import TestCase
 from mock import create_autospec, MagicMock
 
+from checkQC.config import ConfigFactory
 from checkQC.qc_engine import QCEngine
 from checkQC.handlers.qc_handler_factory import QCHandlerFactory
 from checkQC.handlers.q30_handler import Q30Handler
@@ -100,6 +101,23 @@ class TestQCEngine(TestCase):
         for parser in self.qc_engine._parsers_and_handlers.keys():
             self.assertTrue(parser.has_been_run)
 
+    def test__run_parsers_concurrently(self):
+        self.qc_engine.parser_workers = 2
+        self.qc_engine._handlers = self.handlers
+        self.qc_engine._parsers_and_handlers = self.parsers_and_handlers
+
+        for parser, handlers in self.parsers_and_handlers.items():
+            parser.add_subscribers(handlers)
+
+        self.qc_engine._run_parsers()
+
+        for handler in self.handlers:
+            handler.send.assert_called_once_with("Fake value!")
+
+    def test_unknown_parser_executor(self):
+        with self.assertRaises(ConfigurationError):
+            QCEngine(runfolder="foo", handler_config=[], parser_configurations={}, parser_executor="foo")
+
     def test__compile_reports(self):
 
         self.qc_engine._handlers = self.handlers
@@ -142,3 +160,25 @@ class TestQCEngine(TestCase):
         self.mock_q30_handler.validate_configuration.side_effect = ConfigurationError
         self.qc_engine.run()
         self.assertEqual(self.qc_engine.exit_status, 1)
+
+
+def test_subscription_graph():
+    runfolder = "tests/resources/bcl2fastq/170726_D00118_0303_BCB1TVANXX"
+    config = ConfigFactory.from_config_path(None)
+    handler_config = config.get_handler_configs("hiseq2500_rapidhighoutput_v4", 126, (), False)
+    qc_engine = QCEngine(runfolder, config.get("parser_configurations"), handler_config)
+    qc_engine._create_handlers()
+    qc_engine._initiate_parsers()
+    qc_engine._subscribe_handlers_to_parsers()
+
+    graph = qc_engine.subscription_graph()
+
+    assert graph["InteropParser"] == {
+        "error_rate": ["ErrorRateHandler"],
+        "percent_q30": ["Q30Handler"],
+        "percent_phix": ["UndeterminedPercentageHandler"],
+        "percent_q30_per_cycle": [],
+    }
+    assert graph["SamplesheetParser"] == {"samplesheet": ["UnidentifiedIndexHandler"]}
+    assert graph["StatsJsonParser"]["ConversionResults"] == [
+        "ClusterPFHandler", "ReadsPerSampleHandler", "UndeterminedPercentageHandler", "UnidentifiedIndexHandler"]
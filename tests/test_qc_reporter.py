@@ -109,3 +109,18 @@ def test_report_use_closest_read_len(qc_reporter, qc_data):
     assert len(reports) == 2
     assert any("mock_checker=5" in str(report) for report in reports)
     assert any("mock_checker_bis=0" in str(report) for report in reports)
+
+
+def test_select_checkers(qc_reporter):
+    assert qc_reporter.select_checkers("novaseq_SP", 36) == {
+        "mock_checker": {"error_threshold": 5, "warning_threshold": 2},
+        "mock_checker_bis": {"error_threshold": 0, "warning_threshold": 1},
+    }
+
+    with pytest.raises(KeyError):
+        qc_reporter.select_checkers("novaseq_SP", 35)
+    assert list(qc_reporter.select_checkers(
+        "novaseq_SP", 35, use_closest_read_len=True)) == [
+        "mock_checker",
+        "mock_checker_bis",
+    ]
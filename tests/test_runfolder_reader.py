@@ -1,8 +1,13 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase, mock
 
+import xmltodict
 
-from unittest import TestCase
-
-from checkQC.runfolder_reader import RunfolderReader
+from checkQC.exceptions import RunInfoXMLNotFound
+from checkQC.run_type_recognizer import RunTypeRecognizer
+from checkQC.runfolder_reader import RunfolderReader, RunfolderMetadata, extract_xml_fields
 
 
 class TestRunfolderReader(TestCase):
@@ -10,3 +15,101 @@ class TestRunfolderReader(TestCase):
     def test_get_nbr_of_lanes(self):
         actual = RunfolderReader.get_nbr_of_lanes('./tests/resources/bcl2fastq/170726_D00118_0303_BCB1TVANXX')
         self.assertEqual(actual, 8)
+
+
+class TestExtractXmlFields(TestCase):
+
+    def test_extract_xml_fields(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".xml", delete=False) as f:
+            self.addCleanup(os.remove, f.name)
+            # The trailing garbage is never reached since parsing stops once all fields are found
+            f.write("""<?xml version="1.0"?>
+<RunParameters>
+  <Setup><RunMode>RapidRun</RunMode><Other>foo</Other></Setup>
+  <ConsumableInfo>
+    <ConsumableInfo><Type>Reagent</Type></ConsumableInfo>
+    <ConsumableInfo Version="2"><Type>FlowCell</Type><Name>10B</Name></ConsumableInfo>
+  </ConsumableInfo>
+<Unclosed>""")
+
+        actual = extract_xml_fields(f.name, ["RunParameters/Setup/RunMode", "RunParameters/ConsumableInfo"])
+        self.assertEqual(actual, {
+            "RunParameters": {
+                "Setup": {"RunMode": "RapidRun"},
+                "ConsumableInfo": {
+                    "ConsumableInfo": [
+                        {"Type": "Reagent"},
+                        {"@Version": "2", "Type": "FlowCell", "Name": "10B"},
+                    ],
+                },
+            },
+        })
+
+    def test_run_type_recognizer_only_reads_needed_fields(self):
+        runtype_recognizer = RunTypeRecognizer(runfolder='./tests/resources/Rapid')
+        self.assertEqual(runtype_recognizer.run_parameters,
+                         {"RunParameters": {"Setup": {"RunMode": "RapidRun", "Sbs": "HiSeq Rapid SBS Kit v2"}}})
+        self.assertEqual(runtype_recognizer.instrument_and_reagent_version(), "hiseq2500_rapidrun_v2")
+
+
+class TestRunfolderMetadata(TestCase):
+
+    def setUp(self):
+        self.runfolder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.runfolder)
+        shutil.copy('./tests/resources/bcl2fastq/170726_D00118_0303_BCB1TVANXX/RunInfo.xml', self.runfolder)
+
+    def test_metadata_is_shared(self):
+        metadata = RunfolderMetadata.for_runfolder(self.runfolder)
+        self.assertIs(metadata, RunfolderMetadata.for_runfolder(self.runfolder + os.sep))
+        self.assertEqual(metadata.run_info, RunfolderReader.read_run_info_xml(self.runfolder))
+        self.assertEqual(metadata.lane_count, 8)
+        self.assertEqual(metadata.instrument, "D00118")
+        self.assertEqual([read["@NumCycles"] for read in metadata.reads], ["126", "8", "8", "126"])
+
+    def test_run_info_is_parsed_once_and_copied(self):
+        metadata = RunfolderMetadata.for_runfolder(self.runfolder)
+        with mock.patch("checkQC.runfolder_reader.xmltodict.parse", wraps=xmltodict.parse) as parse:
+            run_info = metadata.run_info
+            run_info["RunInfo"]["Run"]["Instrument"] = "modified"
+            self.assertEqual(metadata.run_info["RunInfo"]["Run"]["Instrument"], "D00118")
+        self.assertEqual(parse.call_count, 1)
+
+    def test_least_recently_used_runfolders_are_evicted(self):
+        runfolders = [tempfile.mkdtemp() for _ in range(3)]
+        for runfolder in runfolders:
+            self.addCleanup(shutil.rmtree, runfolder)
+
+        RunfolderMetadata.clear_cache()
+        self.addCleanup(RunfolderMetadata.clear_cache)
+        with mock.patch.object(RunfolderMetadata, "MAX_RUNFOLDERS", 2):
+            first = RunfolderMetadata.for_runfolder(runfolders[0])
+            second = RunfolderMetadata.for_runfolder(runfolders[1])
+            self.assertIs(RunfolderMetadata.for_runfolder(runfolders[0]), first)
+            RunfolderMetadata.for_runfolder(runfolders[2])
+
+            self.assertEqual(
+                list(RunfolderMetadata._instances),
+                [os.path.realpath(runfolders[0]), os.path.realpath(runfolders[2])],
+            )
+            self.assertIs(RunfolderMetadata.for_runfolder(runfolders[0]), first)
+            self.assertIsNot(RunfolderMetadata.for_runfolder(runfolders[1]), second)
+
+    def test_metadata_is_reread_when_file_changes(self):
+        metadata = RunfolderMetadata.for_runfolder(self.runfolder)
+        self.assertEqual(metadata.lane_count, 8)
+
+        run_info_path = os.path.join(self.runfolder, "RunInfo.xml")
+        with open(run_info_path) as f:
+            run_info = f.read()
+        with open(run_info_path, "w") as f:
+            f.write(run_info.replace('LaneCount="8"', 'LaneCount="2"'))
+        stat = os.stat(run_info_path)
+        os.utime(run_info_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(metadata.lane_count, 2)
+
+    def test_missing_run_info(self):
+        os.remove(os.path.join(self.runfolder, "RunInfo.xml"))
+        with self.assertLogs(), self.assertRaises(RunInfoXMLNotFound):
+            RunfolderMetadata.for_runfolder(self.runfolder).run_info
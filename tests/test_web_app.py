@@ -1,10 +1,25 @@
+import asyncio
+import collections
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+import unittest
 from pathlib import Path
 
 import tornado.web
+from tornado.simple_httpclient import HTTPStreamClosedError
 from tornado.testing import *
 import json
 
-from checkQC.web_app import WebApp
+from unittest import mock
+
+from checkQC.config import ConfigFactory
+from checkQC.web_app import (
+    WebApp, BatchCheckQCHandler, QCExecutor, ResultCache, InFlightRequests, LoadedConfig, ConfigWatcher,
+)
+from checkQC.exceptions import ConfigurationError, QCQueueFullError
 from checkQC import __version__
 
 
@@ -90,3 +105,535 @@ class TestWebAppReadLengthNotInConfig(AsyncHTTPTestCase):
         self.assertEqual(result["exit_status"], 1)
         self.assertEqual(result["version"], __version__)
         self.assertEqual(list(result.keys()), expected_keys)
+
+
+class TestWebAppWithBusyExecutor(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = QCExecutor(max_workers=1, max_queue=0, retry_after=10)
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+        )
+        return tornado.web.Application(routes)
+
+    def test_queue_full(self):
+        release = threading.Event()
+        blocking_job = self.qc_executor.submit(release.wait)
+        try:
+            response = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+            self.assertEqual(response.code, 503)
+            self.assertEqual(response.headers["Retry-After"], "10")
+        finally:
+            release.set()
+            blocking_job.result()
+
+        response = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(response.code, 200)
+
+    def test_batch_queue_full(self):
+        release = threading.Event()
+        blocking_job = self.qc_executor.submit(release.wait)
+        try:
+            response = self.fetch(
+                '/batch/qc', method="POST", body=json.dumps({"runfolders": ["170726_D00118_0303_BCB1TVANXX"]}))
+            self.assertEqual(response.code, 503)
+            self.assertEqual(response.headers["Retry-After"], "10")
+        finally:
+            release.set()
+            blocking_job.result()
+
+
+class TestWebAppWithProcessExecutor(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = QCExecutor(executor="process", max_workers=1)
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+        )
+        return tornado.web.Application(routes)
+
+    def tearDown(self):
+        super().tearDown()
+        self.qc_executor.shutdown()
+
+    def test_qc_endpoint(self):
+        response = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(response.code, 200)
+        self.assertEqual(json.loads(response.body)["exit_status"], 1)
+
+    def test_qc_invalid_endpoint(self):
+        response = self.fetch('/qc/foo?demultiplexer=bclconvert')
+        self.assertEqual(response.code, 404)
+
+
+class TestQCExecutor(unittest.TestCase):
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ConfigurationError):
+            QCExecutor(executor="foo")
+
+    def test_bounded_queue(self):
+        qc_executor = QCExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        jobs = [qc_executor.submit(release.wait) for _ in range(2)]
+        with self.assertRaises(QCQueueFullError):
+            qc_executor.submit(release.wait)
+        release.set()
+        for job in jobs:
+            job.result()
+        qc_executor.shutdown()
+        self.assertEqual(qc_executor.pending, 0)
+
+
+class CountingQCExecutor(QCExecutor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        return super().submit(fn, *args)
+
+
+class TestWebAppResultCache(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = CountingQCExecutor()
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+        )
+        return tornado.web.Application(routes)
+
+    def test_repeated_requests_are_cached(self):
+        first = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        second = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(first.code, 200)
+        self.assertEqual(second.code, 200)
+        self.assertEqual(json.loads(first.body), json.loads(second.body))
+        self.assertEqual(self.qc_executor.submitted, 1)
+
+        self.fetch('/qc/170726_D00118_0303_BCB1TVANXX?downgrade=ReadsPerSampleHandler')
+        self.assertEqual(self.qc_executor.submitted, 2)
+
+    def test_invalidate_runfolder(self):
+        self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        response = self.fetch('/cache/170726_D00118_0303_BCB1TVANXX', method="DELETE")
+        self.assertEqual(response.code, 200)
+        self.assertEqual(json.loads(response.body), {"invalidated": 1})
+
+        self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(self.qc_executor.submitted, 2)
+
+    def test_invalidate_all(self):
+        self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.fetch('/qc/170726_D00118_0303_BCB1TVANXX?useClosestReadLength')
+        response = self.fetch('/cache', method="DELETE")
+        self.assertEqual(json.loads(response.body), {"invalidated": 2})
+
+    def test_errors_are_not_cached(self):
+        self.fetch('/qc/foo')
+        response = self.fetch('/qc/foo')
+        self.assertEqual(response.code, 404)
+        self.assertEqual(self.qc_executor.submitted, 2)
+
+    def test_key_is_not_computed_on_the_ioloop(self):
+        key_threads = []
+        key = ResultCache.key
+
+        def recording_key(*args):
+            key_threads.append(threading.current_thread())
+            return key(*args)
+
+        with mock.patch.object(ResultCache, "key", recording_key):
+            response = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(response.code, 200)
+        self.assertEqual(len(key_threads), 1)
+        self.assertIsNot(key_threads[0], threading.current_thread())
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_ttl(self):
+        cache = ResultCache(ttl=0)
+        cache.put("a", 1)
+        time.sleep(0.01)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self):
+        cache = ResultCache(max_size=0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+
+    def test_key_changes_with_runfolder_content(self):
+        cache = ResultCache()
+        loaded_config = LoadedConfig.from_config_path(None)
+        with tempfile.TemporaryDirectory() as monitor_path:
+            runfolder = os.path.join(monitor_path, "runfolder")
+            os.makedirs(os.path.join(runfolder, "Reports"))
+            with open(os.path.join(runfolder, "Reports", "Demultiplex_Stats.csv"), "w") as f:
+                f.write("Lane\n")
+
+            key = cache.key(monitor_path, loaded_config, "runfolder", "bclconvert")
+            self.assertEqual(key, cache.key(monitor_path, loaded_config, "runfolder", "bclconvert"))
+            self.assertNotEqual(key, cache.key(monitor_path, loaded_config, "runfolder", "bcl2fastq"))
+
+            with open(os.path.join(runfolder, "Reports", "Demultiplex_Stats.csv"), "a") as f:
+                f.write("1\n")
+            self.assertNotEqual(key, cache.key(monitor_path, loaded_config, "runfolder", "bclconvert"))
+
+            self.assertIsNone(cache.key(monitor_path, loaded_config, "foo", "bclconvert"))
+
+    def test_key_changes_with_config(self):
+        cache = ResultCache()
+        monitor_path = "tests/resources/monitored_dir"
+        runfolder = "170726_D00118_0303_BCB1TVANXX"
+        self.assertNotEqual(
+            cache.key(monitor_path, LoadedConfig.from_config_path(None), runfolder),
+            cache.key(
+                monitor_path,
+                LoadedConfig.from_config_path("tests/resources/read_length_not_in_config.yaml"),
+                runfolder,
+            ),
+        )
+
+
+class TestWebAppCoalescing(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = CountingQCExecutor(max_workers=1)
+        self.in_flight_requests = InFlightRequests()
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+            result_cache=ResultCache(max_size=0),
+            in_flight_requests=self.in_flight_requests,
+        )
+        return tornado.web.Application(routes)
+
+    @gen_test
+    async def test_concurrent_requests_are_coalesced(self):
+        release = threading.Event()
+        self.qc_executor.submit(release.wait)
+
+        requests = [
+            self.http_client.fetch(self.get_url('/qc/170726_D00118_0303_BCB1TVANXX'))
+            for _ in range(3)
+        ]
+        while self.in_flight_requests.coalesced < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+        self.assertEqual([response.code for response in responses], [200] * 3)
+        self.assertEqual(len({response.body for response in responses}), 1)
+        # The blocking job and a single QC job
+        self.assertEqual(self.qc_executor.submitted, 2)
+
+        response = await self.http_client.fetch(self.get_url('/stats'))
+        self.assertEqual(json.loads(response.body), {"in_flight": 0, "started": 1, "coalesced": 2})
+
+        # Once the job is done, new requests start a new job
+        await self.http_client.fetch(self.get_url('/qc/170726_D00118_0303_BCB1TVANXX'))
+        self.assertEqual(self.in_flight_requests.started, 2)
+
+
+class TestInFlightRequests(unittest.TestCase):
+
+    def test_requests_without_key_are_not_coalesced(self):
+        in_flight_requests = InFlightRequests()
+        futures = [
+            in_flight_requests.submit(None, concurrent.futures.Future)
+            for _ in range(2)
+        ]
+        self.assertIsNot(futures[0], futures[1])
+        self.assertEqual(in_flight_requests.as_dict(), {"in_flight": 0, "started": 2, "coalesced": 0})
+
+    def test_finished_jobs_are_removed(self):
+        in_flight_requests = InFlightRequests()
+        future = in_flight_requests.submit("key", concurrent.futures.Future)
+        self.assertIs(in_flight_requests.submit("key", concurrent.futures.Future), future)
+        self.assertEqual(len(in_flight_requests), 1)
+        future.set_result(None)
+        self.assertEqual(len(in_flight_requests), 0)
+
+
+class TestWebAppLoadsConfigOnce(AsyncHTTPTestCase):
+
+    def get_app(self):
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            result_cache=ResultCache(max_size=0),
+        )
+        return tornado.web.Application(routes)
+
+    def test_config_is_not_reloaded_per_request(self):
+        with mock.patch.object(
+                ConfigFactory, "from_config_path", wraps=ConfigFactory.from_config_path) as from_config_path:
+            for _ in range(2):
+                response = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX?downgrade=ReadsPerSampleHandler')
+                self.assertEqual(json.loads(response.body)["exit_status"], 0)
+            from_config_path.assert_not_called()
+
+        # Downgrading errors must not have changed the loaded config
+        response = self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(json.loads(response.body)["exit_status"], 1)
+
+
+class TestConfigWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp_dir.name, "config.yaml")
+        with open("tests/resources/read_length_not_in_config.yaml") as f:
+            self.config_content = f.read()
+        self._write_config(self.config_content)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_config(self, content):
+        with open(self.config_file, "w") as f:
+            f.write(content)
+        # Make sure the modification time changes, whatever the file system resolution
+        stat = os.stat(self.config_file)
+        os.utime(self.config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_unchanged_config_is_not_reloaded(self):
+        config_watcher = ConfigWatcher(self.config_file)
+        loaded_config = config_watcher.current
+        self.assertFalse(config_watcher.poll())
+        self.assertIs(config_watcher.current, loaded_config)
+
+    def test_changed_config_is_reloaded(self):
+        config_watcher = ConfigWatcher(self.config_file)
+        loaded_config = config_watcher.current
+        self._write_config(self.config_content.replace("error: 9 ", "error: 12 ", 1))
+        self.assertTrue(config_watcher.poll())
+        self.assertNotEqual(config_watcher.current.config_hash, loaded_config.config_hash)
+        self.assertEqual(config_watcher.current.config["default_handlers"][0]["error"], 12)
+
+    def test_invalid_config_is_not_swapped_in(self):
+        config_watcher = ConfigWatcher(self.config_file)
+        loaded_config = config_watcher.current
+        self._write_config("parser_configurations: [")
+        self.assertFalse(config_watcher.poll())
+        self.assertIs(config_watcher.current, loaded_config)
+
+        self._write_config("default_view: 1\n")
+        self.assertFalse(config_watcher.poll())
+        self.assertIs(config_watcher.current, loaded_config)
+
+    def test_copies_are_independent(self):
+        loaded_config = LoadedConfig.from_config_path(None)
+        config = loaded_config.copy_config()
+        config["default_handlers"].clear()
+        self.assertTrue(loaded_config.config["default_handlers"])
+
+
+class TestWebAppBatch(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = CountingQCExecutor(max_workers=2)
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+        )
+        return tornado.web.Application(routes)
+
+    def _post_batch(self, body):
+        response = self.fetch('/batch/qc', method="POST", body=json.dumps(body))
+        lines = [json.loads(line) for line in response.body.decode().splitlines()]
+        return response, lines
+
+    def test_batch(self):
+        response, lines = self._post_batch({
+            "runfolders": ["170726_D00118_0303_BCB1TVANXX", "foo"],
+            "downgrade": ["ReadsPerSampleHandler", "UndeterminedPercentageHandler"],
+        })
+        self.assertEqual(response.code, 200)
+        self.assertEqual(response.headers["Content-Type"], "application/x-ndjson")
+        lines = {line["runfolder"]: line for line in lines}
+        self.assertEqual(sorted(lines), ["170726_D00118_0303_BCB1TVANXX", "foo"])
+        self.assertEqual(lines["170726_D00118_0303_BCB1TVANXX"]["status"], 200)
+        self.assertEqual(lines["170726_D00118_0303_BCB1TVANXX"]["result"]["exit_status"], 0)
+        self.assertEqual(lines["foo"]["status"], 404)
+
+    def test_batch_bclconvert(self):
+        response, lines = self._post_batch({
+            "runfolders": ["200624_A00834_0183_BHMTFYTINY"],
+            "demultiplexer": "bclconvert",
+            "useClosestReadLength": True,
+        })
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["status"], 200)
+        self.assertEqual(lines[0]["result"]["exit_status"], 1)
+
+    def test_batch_uses_cache(self):
+        body = {"runfolders": ["170726_D00118_0303_BCB1TVANXX"]}
+        self._post_batch(body)
+        self.fetch('/qc/170726_D00118_0303_BCB1TVANXX')
+        self.assertEqual(self.qc_executor.submitted, 1)
+
+    def test_invalid_batch(self):
+        for body in [b"foo", b"[]", b'{"runfolders": "foo"}', b'{"runfolders": ["../foo"]}']:
+            response = self.fetch('/batch/qc', method="POST", body=body)
+            self.assertEqual(response.code, 400)
+
+    def test_batch_get_not_allowed(self):
+        self.assertEqual(self.fetch('/batch/qc').code, 405)
+
+    def test_runfolder_named_batch(self):
+        self.assertEqual(self.fetch('/qc/batch').code, 404)
+
+
+class BlockingQCExecutor(QCExecutor):
+    """
+    Holds the QC job of a runfolder until it is released
+    """
+
+    def __init__(self, blocked_runfolder, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.blocked_runfolder = blocked_runfolder
+        self.released = threading.Event()
+        self.released_in_time = []
+
+    def submit(self, fn, *args):
+        if args[2] != self.blocked_runfolder:
+            return super().submit(fn, *args)
+
+        def blocked_fn(*args):
+            self.released_in_time.append(self.released.wait(timeout=10))
+            return fn(*args)
+        return super().submit(blocked_fn, *args)
+
+
+class TestWebAppBatchStreaming(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = BlockingQCExecutor("170726_D00118_0303_BCB1TVANXX", max_workers=2)
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+        )
+        return tornado.web.Application(routes)
+
+    def test_results_are_streamed(self):
+        chunks = []
+
+        def streaming_callback(chunk):
+            chunks.append(chunk)
+            self.qc_executor.released.set()
+
+        response = self.fetch(
+            '/batch/qc',
+            method="POST",
+            body=json.dumps({"runfolders": ["170726_D00118_0303_BCB1TVANXX", "foo"]}),
+            streaming_callback=streaming_callback,
+        )
+        self.assertEqual(response.code, 200)
+        lines = [json.loads(line) for line in b"".join(chunks).decode().splitlines()]
+        self.assertEqual([line["runfolder"] for line in lines], ["foo", "170726_D00118_0303_BCB1TVANXX"])
+        # The result of "foo" was received while the other runfolder was still being checked
+        self.assertEqual(self.qc_executor.released_in_time, [True])
+
+
+class GatedQCExecutor(QCExecutor):
+    """
+    Holds the QC job of each runfolder until the runfolder is released
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gates = collections.defaultdict(threading.Event)
+
+    def release(self, runfolder):
+        self.gates[runfolder].set()
+
+    def submit(self, fn, *args):
+        gate = self.gates[args[2]]
+
+        def gated_fn(*args):
+            gate.wait(timeout=10)
+            return fn(*args)
+        return super().submit(gated_fn, *args)
+
+
+class TestWebAppBatchClientGone(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.qc_executor = GatedQCExecutor(max_workers=2)
+        self.result_cache = ResultCache()
+        routes = WebApp._routes(
+            monitoring_path="tests/resources/monitored_dir",
+            qc_config_file=None,
+            qc_executor=self.qc_executor,
+            result_cache=self.result_cache,
+        )
+        return tornado.web.Application(routes)
+
+    @gen_test(timeout=20)
+    async def test_running_jobs_are_waited_for(self):
+        connection_closed = asyncio.Event()
+        post_returned = asyncio.Event()
+        on_connection_close = BatchCheckQCHandler.on_connection_close
+        post = BatchCheckQCHandler.post
+
+        def recording_on_connection_close(handler):
+            connection_closed.set()
+            on_connection_close(handler)
+
+        async def recording_post(handler):
+            try:
+                await post(handler)
+            finally:
+                post_returned.set()
+
+        def streaming_callback(chunk):
+            raise RuntimeError("Closing the connection")
+
+        with mock.patch.object(BatchCheckQCHandler, "on_connection_close", recording_on_connection_close), \
+                mock.patch.object(BatchCheckQCHandler, "post", recording_post), \
+                self.assertLogs("checkQC.web_app", level="INFO") as logs:
+            response = self.http_client.fetch(
+                self.get_url('/batch/qc'),
+                method="POST",
+                body=json.dumps({"runfolders": ["foo", "170726_D00118_0303_BCB1TVANXX", "bar"]}),
+                streaming_callback=streaming_callback,
+            )
+            # The client closes the connection when it gets the first result
+            self.qc_executor.release("foo")
+            with self.assertRaises(HTTPStreamClosedError):
+                await response
+            await connection_closed.wait()
+
+            # Writing the result of "bar" fails while "170726_D00118_0303_BCB1TVANXX" is still being checked
+            self.qc_executor.release("bar")
+            while not any("Client closed the connection" in line for line in logs.output):
+                await asyncio.sleep(0.01)
+            self.assertFalse(post_returned.is_set())
+
+            self.qc_executor.release("170726_D00118_0303_BCB1TVANXX")
+            await post_returned.wait()
+        self.assertEqual(len(self.result_cache), 1)